@@ -11,8 +11,11 @@ class OPTION_PRICING_MODEL(Enum):
     BSM = 'BSM'
     BSM_FT_NUM = 'BSM via Furier Transform (Lewis)'
     BSM_FFT = 'BSM via FFT (Lewis)'
+    MERTON = 'Merton (series)'
     MERTON_FT_NUM = 'Merton via Fourier Transform (Lewis)'
     MERTON_FFT = 'Merton via FFT (Carr-Madan)'
+    BSM_COS = 'BSM via COS method (Fang-Oosterlee)'
+    MERTON_COS = 'Merton via COS method (Fang-Oosterlee)'
 
 
 @st.cache
@@ -43,7 +46,7 @@ sigma = st.slider('Sigma (%)', 0, 100, 20)
 exercise_date = st.date_input('Exercise date', min_value=datetime.today() + timedelta(days=1), value=datetime.today() + timedelta(days=365))  # noqa
 
 # Additional parameters for jump-diffusion model (Merton model)
-if pricing_method == OPTION_PRICING_MODEL.MERTON_FFT.value or pricing_method == OPTION_PRICING_MODEL.MERTON_FT_NUM.value:
+if pricing_method in (OPTION_PRICING_MODEL.MERTON.value, OPTION_PRICING_MODEL.MERTON_FFT.value, OPTION_PRICING_MODEL.MERTON_FT_NUM.value, OPTION_PRICING_MODEL.MERTON_COS.value):  # noqa
     st.text("Parameters for jump-diffusion Merton model:")
     lamb = st.number_input('Jump frequency', 1.)
     mu = st.number_input('Expected jump size', -0.1)
@@ -77,10 +80,16 @@ if st.button(f'Calculate option price for {ticker}'):
         call_price = option.price('call', 'BSM_FFT')
     elif pricing_method == OPTION_PRICING_MODEL.BSM_FT_NUM.value:
         call_price = option.price('call', 'BSM_FT_NUM')
+    elif pricing_method == OPTION_PRICING_MODEL.MERTON.value:
+        call_price = option.price('call', 'MERTON', lamb, mu, delta)
     elif pricing_method == OPTION_PRICING_MODEL.MERTON_FT_NUM.value:
         call_price = option.price('call', 'MERTON_FT_NUM', lamb, mu, delta)
     elif pricing_method == OPTION_PRICING_MODEL.MERTON_FFT.value:
         call_price = option.price('call', 'MERTON_FFT', lamb, mu, delta)
+    elif pricing_method == OPTION_PRICING_MODEL.BSM_COS.value:
+        call_price = option.price('call', 'BSM_COS')
+    elif pricing_method == OPTION_PRICING_MODEL.MERTON_COS.value:
+        call_price = option.price('call', 'MERTON_COS', lamb, mu, delta)
 
     # Displaying call/put option price
     st.subheader(f'Call option price: {round(call_price, 2)} $')
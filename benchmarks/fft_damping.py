@@ -0,0 +1,66 @@
+"""Accuracy and wall time of the FFT models with the optimal damping factor against the ITM/OTM branch.
+
+damping='branch' prices strikes with S >= 0.95 * K with the damped call transform
+(alpha = 1.5) and the rest with the OTM time value transform (alpha = 1.1, two
+characteristic function evaluations), damping='optimal' prices the whole chain with
+one damped transform and the Lord-Kahl damping factor.
+
+Prices a chain of 101 strikes (60-160, S = 100) and single strikes of the chain for
+several maturities and volatilities. BSM prices are compared with the closed form,
+Merton prices with the Merton (1976) series. Characteristic function cache is
+disabled, so timings include the full pricing cost.
+
+Usage: python benchmarks/fft_damping.py
+"""
+import timeit
+
+import numpy as np
+
+from options.models import BSM, BSM_FFT, MERTON, MERTON_FFT
+
+
+S = 100.
+r = 0.05
+strikes = np.linspace(60., 160., 101)
+single_strikes = (70., 95., 100., 105., 140.)
+jumps = (1.0, -0.2, 0.1)
+maturities = (0.02, 0.25, 1., 3.)
+volatilities = (0.1, 0.2, 0.5)
+
+
+def chain_time(model, *args, repeat=20):
+    timer = timeit.Timer(lambda: model.price_chain('call', S, strikes, *args))
+    return min(timer.repeat(repeat=5, number=repeat)) / repeat
+
+
+def main():
+    merton_reference = MERTON(tol=1e-16)
+    cases = [
+        ('BSM', BSM_FFT, lambda K, T, sigma: BSM().price('call', S, K, T, r, sigma), ()),
+        ('MERTON', MERTON_FFT, lambda K, T, sigma: merton_reference.price_chain('call', S, K, T, r, sigma, *jumps),
+         jumps),
+    ]
+
+    print(f"{'model':8} {'T':>5} {'sigma':>5} | {'branch':>8} {'single':>8} {'time':>9} | "
+          f"{'optimal':>8} {'single':>8} {'time':>9} {'alpha':>5}")
+    for name, model_class, reference, params in cases:
+        models = [model_class(damping='branch'), model_class(damping='optimal')]
+        for model in models:
+            model.cf_cache = None
+        for T in maturities:
+            for sigma in volatilities:
+                expected = reference(strikes, T, sigma)
+                expected_single = reference(np.array(single_strikes), T, sigma)
+                row = []
+                for model in models:
+                    chain_error = np.abs(model.price_chain('call', S, strikes, T, r, sigma, *params) - expected).max()
+                    single = [model.price('call', S, K, T, r, sigma, *params) for K in single_strikes]
+                    single_error = np.abs(np.array(single) - expected_single).max()
+                    elapsed = chain_time(model, T, r, sigma, *params)
+                    row.append(f'{chain_error:8.1e} {single_error:8.1e} {elapsed * 1e6:7.0f}us')
+                plan = models[1]._optimal_damping_plan(np.log(strikes[0] / S), T, r, sigma, params)
+                print(f'{name:8} {T:5.2f} {sigma:5.2f} | ' + ' | '.join(row) + f' {plan.alpha:5.2f}')
+
+
+if __name__ == '__main__':
+    main()
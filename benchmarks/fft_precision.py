@@ -0,0 +1,107 @@
+"""Throughput, memory and accuracy of the FFT models in single against double precision.
+
+Bulk surface job: strike chains of 201 strikes (log-moneyness -1 to 1, S = 100) for 12
+maturities of n_underlyings parameter sets drawn at random (sigma 0.05-0.8, Merton jumps
+lamb 0-1.5, mu -0.3-0.1, delta 0.05-0.4), every chain priced with price_chain, on the
+model's default grid and on a grid of 65536 points with 16 times finer strike spacing.
+
+Columns:
+    chains/s    strike chains priced per second, characteristic function cache disabled
+                (parameter sets of different underlyings don't repeat)
+    grids/s     transforms per second of a surface priced again (cached transform)
+    peak        peak memory allocated while pricing one chain, cache disabled (tracemalloc)
+    cache       bytes the characteristic function cache holds per cached grid
+    max diff    largest |single - double| / S over all chains
+    covered     share of strikes where the single precision error estimate covers the difference
+
+Usage: python benchmarks/fft_precision.py [--underlyings 100]
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from options.models import BSM_FFT, MERTON_FFT
+from options.models.cache import CharacteristicFunctionCache
+
+
+S = 100.
+r = 0.05
+strikes = S * np.exp(np.linspace(-1., 1., 201))
+maturities = (1 / 52, 1 / 12, 0.25, 0.5, 0.75, 1., 1.5, 2., 3., 4., 5., 7.)
+
+
+def parameter_sets(name, n, seed=0):
+    rng = np.random.default_rng(seed)
+    sigma = rng.uniform(0.05, 0.8, n)
+    if name == 'BSM':
+        return [(s,) for s in sigma]
+    return list(zip(sigma, rng.uniform(0., 1.5, n), rng.uniform(-0.3, 0.1, n), rng.uniform(0.05, 0.4, n)))
+
+
+def price_surfaces(model, parameters):
+    return [model.price_chain('call', S, strikes, T, r, *p, return_error=True)
+            for p in parameters for T in maturities]
+
+
+def grid_rate(model, parameters):
+    """Transforms per second with the transformed characteristic function taken from the cache."""
+    model.cf_cache = CharacteristicFunctionCache(max_bytes=2 ** 30)
+    plan = model.itm_plan
+    for T in maturities:
+        model._fft_call_value_grid(T, r, parameters[0], parameters[1:], False, plan)
+    best = np.inf
+    for _ in range(5):
+        start = time.perf_counter()
+        for T in maturities:
+            model._fft_call_value_grid(T, r, parameters[0], parameters[1:], False, plan)
+        best = min(best, time.perf_counter() - start)
+    cached = model.cf_cache.nbytes / len(maturities)
+    model.cf_cache = None
+    return len(maturities) / best, cached
+
+
+def peak_memory(model, parameters):
+    model.price_chain('call', S, strikes, maturities[0], r, *parameters)  # work buffers, imports
+    tracemalloc.start()
+    model.price_chain('call', S, strikes, maturities[-1], r, *parameters)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--underlyings', type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'model':8} {'N':>6} {'precision':9} | {'chains/s':>8} {'grids/s':>8} {'peak':>8} {'cache':>8} | "
+          f"{'max diff':>8} {'covered':>7}")
+    for name, model_class in (('BSM', BSM_FFT), ('MERTON', MERTON_FFT)):
+        parameters = parameter_sets(name, args.underlyings)
+        for grid in ({}, {'N': 65536, 'eps': model_class.eps / 16}):
+            n_underlyings = len(parameters) if not grid else max(len(parameters) // 10, 2)
+            results = {}
+            for precision in ('double', 'single'):
+                model = model_class(precision=precision, **grid)
+                model.cf_cache = None
+                price_surfaces(model, parameters[:1])
+                start = time.perf_counter()
+                results[precision] = price_surfaces(model, parameters[:n_underlyings])
+                throughput = len(results[precision]) / (time.perf_counter() - start)
+                peak = peak_memory(model, parameters[0])
+                grids, cached = grid_rate(model, parameters[0])
+
+                accuracy = ''
+                if precision == 'single':
+                    pairs = list(zip(results['single'], results['double']))
+                    diff = np.concatenate([np.abs(single[0] - double[0]) for single, double in pairs])
+                    estimate = np.concatenate([single[1] + double[1] for single, double in pairs])
+                    accuracy = f'{diff.max() / S:8.1e} {np.mean(diff <= estimate):7.1%}'
+                print(f'{name:8} {model.itm_plan.N:6} {precision:9} | {throughput:8.0f} {grids:8.0f} '
+                      f'{peak / 2 ** 10:6.0f}kB {cached / 2 ** 10:6.0f}kB | {accuracy}')
+
+
+if __name__ == '__main__':
+    main()
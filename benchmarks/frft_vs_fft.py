@@ -0,0 +1,55 @@
+"""Accuracy and wall time of the fractional FFT models against the FFT models.
+
+Prices a chain of 101 strikes (60-160, S = 100) for several maturities and volatilities.
+BSM prices are compared with the closed form, Merton prices with the Merton (1976) series. Characteristic function cache
+is disabled, so timings include the full pricing cost.
+
+Usage: python benchmarks/frft_vs_fft.py
+"""
+import timeit
+
+import numpy as np
+
+from options.models import BSM, BSM_FFT, BSM_FRFT, MERTON, MERTON_FFT, MERTON_FRFT
+
+
+S = 100.
+r = 0.05
+strikes = np.linspace(60., 160., 101)
+jumps = (1.0, -0.2, 0.1)
+maturities = (0.05, 0.25, 1., 3.)
+volatilities = (0.1, 0.2, 0.5)
+
+
+def chain_time(model, *args, repeat=20):
+    timer = timeit.Timer(lambda: model.price_chain('call', S, strikes, *args))
+    return min(timer.repeat(repeat=5, number=repeat)) / repeat
+
+
+def main():
+    merton_reference = MERTON(tol=1e-16)
+    cases = [
+        ('BSM', BSM_FFT(), BSM_FRFT(), lambda T, sigma: BSM().price('call', S, strikes, T, r, sigma), ()),
+        ('MERTON', MERTON_FFT(), MERTON_FRFT(),
+         lambda T, sigma: merton_reference.price_chain('call', S, strikes, T, r, sigma, *jumps), jumps),
+    ]
+
+    print(f"{'model':8} {'T':>5} {'sigma':>5} | {'FFT N':>6} {'error':>8} {'time':>9} | "
+          f"{'FrFT N':>6} {'error':>8} {'time':>9}")
+    for name, fft_model, frft_model, reference, params in cases:
+        fft_model.cf_cache = None
+        frft_model.cf_cache = None
+        for T in maturities:
+            for sigma in volatilities:
+                expected = reference(T, sigma)
+                row = []
+                for model, N in ((fft_model, fft_model.N), (frft_model, frft_model.plan.N)):
+                    prices = model.price_chain('call', S, strikes, T, r, sigma, *params)
+                    error = np.abs(prices - expected).max()
+                    elapsed = chain_time(model, T, r, sigma, *params)
+                    row.append(f'{N:>6} {error:8.1e} {elapsed * 1e6:7.0f}us')
+                print(f'{name:8} {T:5.2f} {sigma:5.2f} | ' + ' | '.join(row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""Accuracy and latency benchmark of all pricing models, with regression tracking.
+
+Every model of the model registry is swept over moneyness, maturity, volatility
+and (for Merton models) jump parameters. For every model the suite records:
+
+- per-option latency of Option-style scalar pricing (median over the sweep)
+- chain throughput: options per second of price_chain on 201 strikes
+- peak memory allocated while pricing a chain (tracemalloc)
+- maximum absolute error over the sweep against the BSM closed form (BSM models)
+  or the MERTON series model with a 1e-16 tail tolerance (Merton models)
+
+Characteristic function cache is disabled, so timings include the full pricing cost.
+Results are written as JSON together with the commit and library versions, and two
+result files can be compared to flag latency and accuracy regressions.
+
+Usage:
+    python benchmarks/harness.py [--output results.json] [--models BSM_FFT MERTON_COS] [--quick]
+    python benchmarks/harness.py --compare baseline.json results.json [--tolerance 0.2]
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import scipy
+
+from options.models import registry, BSM, MERTON, MERTON_MC
+from options.models.merton_fourier import MertonFourierTransformPricing
+
+
+S = 100.
+r = 0.05
+moneyness = (0.8, 0.9, 1.0, 1.1, 1.25)
+maturities = (0.1, 0.5, 1., 2.)
+volatilities = (0.1, 0.25, 0.5)
+jump_parameters = ((0.5, -0.1, 0.1), (1.0, -0.2, 0.1), (2.0, 0.05, 0.2))
+chain_strikes = np.linspace(60., 160., 201)
+
+
+def reference_prices(S, K, T, r, sigma, *params):
+    """BSM closed form, or Merton series (truncated at Poisson tail weight 1e-16) with jump parameters."""
+    if params:
+        return MERTON(tol=1e-16).price_batch('call', S, K, T, r, sigma, *params)
+    return BSM().price_batch('call', S, K, T, r, sigma)
+
+
+def is_merton(model):
+    return isinstance(model, (MERTON, MertonFourierTransformPricing, MERTON_MC))
+
+
+def sweep(model, quick=False):
+    """Parameter cases (T, sigma, jump parameters) of the sweep for the model."""
+    jumps = jump_parameters if is_merton(model) else ((),)
+    cases = [(T, sigma, params) for T in maturities for sigma in volatilities for params in jumps]
+    return cases[::4] if quick else cases
+
+
+def benchmark_model(name, quick=False):
+    model = registry.create(name)
+    model.cf_cache = None
+    strikes = S * np.asarray(moneyness)
+    cases = sweep(model, quick)
+
+    latencies = []
+    max_error = 0.
+    for T, sigma, params in cases:
+        reference = reference_prices(S, strikes, T, r, sigma, *params)
+        for K, expected in zip(strikes, reference):
+            start = time.perf_counter()
+            price = model.price('call', S, K, T, r, sigma, *params)
+            latencies.append(time.perf_counter() - start)
+            max_error = max(max_error, abs(float(price) - expected))
+
+    T, sigma, params = 0.5, 0.25, (1.0, -0.2, 0.1) if is_merton(model) else ()
+    model.price_chain('call', S, chain_strikes, T, r, sigma, *params)  # warm up
+    repeat = 2 if quick else 5
+    start = time.perf_counter()
+    for _ in range(repeat):
+        model.price_chain('call', S, chain_strikes, T, r, sigma, *params)
+    chain_time = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    model.price_chain('call', S, chain_strikes, T, r, sigma, *params)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'cases': len(latencies),
+        'latency_us': float(np.median(latencies) * 1e6),
+        'chain_options_per_s': float(len(chain_strikes) / chain_time),
+        'peak_memory_bytes': int(peak_memory),
+        'max_abs_error': float(max_error),
+        'reference': 'merton_series' if is_merton(model) else 'bsm_closed_form',
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'machine': platform.machine(),
+    }
+
+
+def run(models, quick=False):
+    results = {}
+    for name in models:
+        results[name] = benchmark_model(name, quick)
+        row = results[name]
+        print(f"{name:15} {row['latency_us']:10.1f}us {row['chain_options_per_s']:12.0f}/s "
+              f"{row['peak_memory_bytes'] / 2 ** 20:8.2f}MB {row['max_abs_error']:9.1e}", flush=True)
+    return {'environment': environment(), 'results': results}
+
+
+def compare(baseline, current, tolerance=0.2, error_factor=10.):
+    """Compares two result files, returns list of regressions.
+
+    Latency and memory regress if they grow by more than tolerance (relative),
+    throughput if it drops by more than tolerance, error if it grows error_factor times
+    (and exceeds 1e-12, below which errors are round-off).
+    """
+    regressions = []
+    print(f"{'model':15} {'latency':>9} {'throughput':>11} {'memory':>9} {'error':>9}")
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        changes = {
+            'latency_us': new['latency_us'] / old['latency_us'] - 1,
+            'chain_options_per_s': new['chain_options_per_s'] / old['chain_options_per_s'] - 1,
+            'peak_memory_bytes': new['peak_memory_bytes'] / max(old['peak_memory_bytes'], 1) - 1,
+        }
+        print(f"{name:15} {changes['latency_us']:+9.1%} {changes['chain_options_per_s']:+11.1%} "
+              f"{changes['peak_memory_bytes']:+9.1%} {old['max_abs_error']:.1e}->{new['max_abs_error']:.1e}")
+        if changes['latency_us'] > tolerance:
+            regressions.append((name, 'latency_us'))
+        if changes['chain_options_per_s'] < -tolerance:
+            regressions.append((name, 'chain_options_per_s'))
+        if changes['peak_memory_bytes'] > tolerance:
+            regressions.append((name, 'peak_memory_bytes'))
+        if new['max_abs_error'] > max(error_factor * old['max_abs_error'], 1e-12):
+            regressions.append((name, 'max_abs_error'))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='JSON file the results are written to')
+    parser.add_argument('--models', nargs='+', default=list(registry), help='models to benchmark (default: all registered)')
+    parser.add_argument('--quick', action='store_true', help='run a reduced sweep')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='compare two result files instead of running the benchmark')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='relative tolerance for regressions')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as baseline, open(args.compare[1]) as current:
+            regressions = compare(json.load(baseline), json.load(current), args.tolerance)
+        for name, metric in regressions:
+            print(f'REGRESSION {name}: {metric}')
+        return 1 if regressions else 0
+
+    print(f"{'model':15} {'latency':>12} {'chain':>14} {'memory':>10} {'error':>9}")
+    results = run(args.models, args.quick)
+    output = args.output or f"benchmark-{results['environment']['commit'] or 'results'}.json"
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'results written to {output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
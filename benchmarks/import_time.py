@@ -0,0 +1,68 @@
+"""Import time and memory of the options package.
+
+Imports the package in fresh interpreters and reports the median wall time of the
+import, the peak resident memory and which heavy optional modules got loaded
+(plotting, HTTP, data and the SciPy submodules the models import on first use).
+Exits with status 1 if the median import time exceeds --max-seconds or any of the
+heavy modules is loaded, so it can guard startup time in CI.
+
+Usage: python benchmarks/import_time.py [--statement "import options"] [--repeat 7] [--max-seconds 0.5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+
+HEAVY_MODULES = ('matplotlib', 'pandas', 'pandas_datareader', 'requests_cache', 'requests',
+                 'scipy.stats', 'scipy.integrate', 'scipy.interpolate', 'scipy.optimize', 'numba')
+
+PROBE = '''
+import json, resource, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'heavy': [name for name in {heavy!r} if name in sys.modules],
+}}))
+'''
+
+
+def measure(statement, repeat):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, env=env)
+        runs.append(json.loads(output.stdout))
+    return {
+        'seconds': float(np.median([run['seconds'] for run in runs])),
+        'max_rss_mb': float(np.median([run['max_rss_mb'] for run in runs])),
+        'heavy': runs[-1]['heavy'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--statement', default='import options', help='statement to time')
+    parser.add_argument('--repeat', type=int, default=7, help='number of fresh interpreters')
+    parser.add_argument('--max-seconds', type=float, default=0.5, help='maximum median import time')
+    args = parser.parse_args(argv)
+
+    result = measure(args.statement, args.repeat)
+    print(f"{args.statement}: {result['seconds'] * 1e3:.0f}ms, {result['max_rss_mb']:.0f}MB RSS, "
+          f"heavy modules: {', '.join(result['heavy']) or 'none'}")
+    if result['seconds'] > args.max_seconds or result['heavy']:
+        print('REGRESSION: import is slower than --max-seconds or loads heavy modules')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Speedup of the compiled (numba) kernels over the NumPy implementation.
+
+Per-option latency of the adaptive quadrature models (BSM_FT_NUM, MERTON_FT_NUM), where
+the integrand is called from quad through scipy.LowLevelCallable, and throughput of
+the batched characteristic function evaluation on a 4096 point grid.
+Compiled kernels are built (or loaded from numba's cache) before timing.
+
+Usage: python benchmarks/jit_kernels.py
+"""
+import timeit
+
+import numpy as np
+
+from options.models import _jit, BSM_FT_NUM, MERTON_FT_NUM
+
+
+S = 100.
+K = 105.
+T = 0.5
+r = 0.05
+sigma = 0.2
+jumps = (1.0, -0.2, 0.1)
+grid = np.linspace(0., 400., 4096) - 1.5j
+
+
+def best_time(statement, number):
+    return min(timeit.Timer(statement).repeat(repeat=5, number=number)) / number
+
+
+def main():
+    if not _jit.NUMBA_AVAILABLE:
+        print('numba is not installed, only the NumPy implementation is available')
+
+    cases = [
+        ('BSM_FT_NUM price', lambda: BSM_FT_NUM().price('call', S, K, T, r, sigma), 200),
+        ('MERTON_FT_NUM price', lambda: MERTON_FT_NUM().price('call', S, K, T, r, sigma, *jumps), 200),
+        ('BSM cf (4096 points)', lambda: BSM_FT_NUM()._characteristic_function(grid, T, r, sigma), 2000),
+        ('MERTON cf (4096 points)',
+         lambda: MERTON_FT_NUM()._characteristic_function(grid, T, r, sigma, *jumps), 2000),
+    ]
+    backends = [False, True] if _jit.NUMBA_AVAILABLE else [False]
+
+    print(f"{'case':24} {'numpy':>10} {'numba':>10} {'speedup':>8}")
+    enabled = _jit.ENABLED
+    try:
+        for name, statement, number in cases:
+            timings = []
+            for backend in backends:
+                _jit.ENABLED = backend
+                statement()  # warm up
+                timings.append(best_time(statement, number))
+            row = f'{name:24} {timings[0] * 1e6:8.1f}us'
+            if len(timings) > 1:
+                row += f' {timings[1] * 1e6:8.1f}us {timings[0] / timings[1]:7.1f}x'
+            print(row)
+    finally:
+        _jit.ENABLED = enabled
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,39 @@
+"""Option pricing via Fourier transform methods.
+
+Pricing core is imported eagerly and needs only NumPy (SciPy modules are imported by
+the models on first use). Market data, plotting and streaming are module attributes
+loaded on first access, so `import options` doesn't load pandas, matplotlib,
+pandas_datareader or requests_cache.
+"""
+import importlib
+
 from .option import Option
-from .ticker import Ticker
+from .models import price_batch
+from .portfolio import PortfolioPricer
+from .implied_vol import implied_volatility, IV_STATUS
+from .calibration import MertonCalibrator
+from .book import OptionBook
+from .surface import PriceSurface
+
+# attribute -> module it is imported from on first access
+_lazy_attributes = {
+    'Ticker': '.ticker',
+    'MarketDataLoader': '.market_data',
+    'StreamingPricer': '.streaming',
+}
+
+__all__ = ['Option', 'price_batch', 'PortfolioPricer', 'implied_volatility', 'IV_STATUS', 'MertonCalibrator',
+           'OptionBook', 'PriceSurface', *_lazy_attributes]
+
+
+def __getattr__(name):
+    module = _lazy_attributes.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
@@ -0,0 +1,263 @@
+import numpy as np
+
+from .models import registry
+from .models.base import OPTION_TYPE
+
+
+class OptionBook:
+    """Columnar book of option contracts (struct of arrays).
+
+    Numeric columns (S, K, T, r, sigma and Merton lamb, mu, delta, NaN for other models)
+    are float arrays, string columns (underlying, option_type, model) are stored as
+    integer codes into small arrays of categories, so a book of millions of contracts
+    holds no per-contract Python objects.
+
+    Contracts are kept sorted by (underlying, T): every underlying and every
+    (underlying, expiry) slice is a contiguous range, returned as a book of array views
+    (zero-copy). index holds the position of every contract in the input, columns are in
+    book order and prices are returned in input order.
+
+    Book implements the mapping interface used by PortfolioPricer (book['K'], 'lamb' in book).
+    """
+
+    __slots__ = ('_numeric', '_codes', '_categories', 'index')
+
+    numeric_columns = ('S', 'K', 'T', 'r', 'sigma', 'lamb', 'mu', 'delta')
+    categorical_columns = ('underlying', 'option_type', 'model')
+
+    def __init__(self, S, K, T, r, sigma, option_type='call', model='BSM', underlying='',
+                 lamb=np.nan, mu=np.nan, delta=np.nan):
+        """Creates book from columns, all parameters are broadcast against each other
+
+        Parameters
+        ==========
+        S: array_like
+            initial stock/index level
+        K: array_like
+            strike prices
+        T: array_like
+            time-to-maturity (for t=0)
+        r: array_like
+            constant risk-free short rate
+        sigma: array_like
+            volatility factor in diffusion term
+        option_type: array_like
+            'call' or 'put'
+        model: array_like
+            name of the pricing model of every contract
+        underlying: array_like
+            underlying symbol
+        lamb, mu, delta: array_like
+            jump parameters (Merton models)
+        """
+        numeric = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T, r, sigma, lamb, mu, delta)))
+        codes, categories = {}, {}
+        for name, values in zip(self.categorical_columns, (underlying, option_type, model)):
+            values = np.broadcast_to(np.asarray(values).astype(str), numeric[0].shape).ravel()
+            categories[name], codes[name] = np.unique(values, return_inverse=True)
+        numeric = dict(zip(self.numeric_columns, (a.ravel() for a in numeric)))
+        self._init_sorted(numeric, codes, categories)
+
+    @classmethod
+    def from_columns(cls, numeric, codes, categories):
+        """Creates book from numeric columns and integer codes of the string columns.
+
+        Parameters
+        ==========
+        numeric: mapping
+            numeric columns (missing Merton parameters are set to NaN)
+        codes: mapping
+            integer codes of the string columns
+        categories: mapping
+            values of the string columns the codes refer to
+        """
+        book = cls.__new__(cls)
+        n = len(numeric['K'])
+        numeric = {name: np.asarray(numeric[name], dtype=float) if name in numeric else np.full(n, np.nan)
+                   for name in cls.numeric_columns}
+        codes = {name: np.asarray(codes[name]).ravel() if name in codes else np.zeros(n, dtype=np.intp)
+                 for name in cls.categorical_columns}
+        default = {'underlying': '', 'option_type': OPTION_TYPE.CALL_OPTION.value, 'model': 'BSM'}
+        categories = {name: np.asarray(categories[name]).astype(str) if name in categories
+                      else np.array([default[name]]) for name in cls.categorical_columns}
+        # sorted categories, so the book order doesn't depend on the source of the codes
+        for name in cls.categorical_columns:
+            order = np.argsort(categories[name])
+            remap = np.empty_like(order)
+            remap[order] = np.arange(len(order))
+            codes[name], categories[name] = remap[codes[name]], categories[name][order]
+        book._init_sorted(numeric, codes, categories)
+        return book
+
+    def _init_sorted(self, numeric, codes, categories):
+        option_types = categories['option_type'][np.unique(codes['option_type'])]
+        if not np.isin(option_types, (OPTION_TYPE.CALL_OPTION.value, OPTION_TYPE.PUT_OPTION.value)).all():
+            raise Exception("Wrong option type")
+        order = np.lexsort((numeric['T'], codes['underlying']))
+        self._numeric = {name: np.ascontiguousarray(column[order]) for name, column in numeric.items()}
+        self._codes = {name: np.ascontiguousarray(column[order].astype(np.int32))
+                       for name, column in codes.items()}
+        self._categories = categories
+        self.index = order
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Creates book from a table of columns (pandas DataFrame, dict of arrays, ...).
+
+        Pandas categorical columns are taken over as codes without decoding them.
+        """
+        numeric = {name: np.asarray(frame[name], dtype=float) for name in cls.numeric_columns if name in frame}
+        codes, categories = {}, {}
+        for name in cls.categorical_columns:
+            if name not in frame:
+                continue
+            column = frame[name]
+            if hasattr(column, 'cat'):
+                codes[name], categories[name] = column.cat.codes.to_numpy(), column.cat.categories.to_numpy()
+            else:
+                categories[name], codes[name] = np.unique(np.asarray(column).astype(str), return_inverse=True)
+        return cls.from_columns(numeric, codes, categories)
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        """Loads book from CSV file with columns named as the book columns.
+
+        String columns are parsed directly into categoricals (pandas C parser), kwargs are
+        passed to pandas.read_csv.
+        """
+        import pandas as pd
+
+        dtype = {name: float for name in cls.numeric_columns}
+        dtype.update({name: 'category' for name in cls.categorical_columns})
+        return cls.from_frame(pd.read_csv(path, dtype=dtype, **kwargs))
+
+    @classmethod
+    def from_parquet(cls, path, **kwargs):
+        """Loads book from Parquet file with columns named as the book columns (requires pyarrow).
+
+        String columns are dictionary encoded by Arrow, numeric columns are converted
+        to NumPy without copying where possible. kwargs are passed to pyarrow.parquet.read_table.
+        """
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path, **kwargs).combine_chunks()
+        numeric = {name: table.column(name).to_numpy() for name in cls.numeric_columns
+                   if name in table.column_names}
+        codes, categories = {}, {}
+        for name in cls.categorical_columns:
+            if name in table.column_names:
+                # combine_chunks, as an empty table has no chunks
+                column = table.column(name).combine_chunks()
+                if not hasattr(column, 'indices'):
+                    column = column.dictionary_encode()
+                codes[name] = column.indices.to_numpy()
+                categories[name] = column.dictionary.to_numpy(zero_copy_only=False)
+        return cls.from_columns(numeric, codes, categories)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self._numeric or name in self._codes
+
+    def __getitem__(self, name):
+        """Column of the book (string columns are decoded)."""
+        if name in self._numeric:
+            return self._numeric[name]
+        return self._categories[name][self._codes[name]]
+
+    def __repr__(self):
+        return f'OptionBook({len(self)} contracts, {len(self._categories["underlying"])} underlyings)'
+
+    def codes(self, name):
+        """Integer codes of a string column."""
+        return self._codes[name]
+
+    def categories(self, name):
+        """Values of a string column the codes refer to."""
+        return self._categories[name]
+
+    def _slice(self, start, stop):
+        book = OptionBook.__new__(OptionBook)
+        book._numeric = {name: column[start:stop] for name, column in self._numeric.items()}
+        book._codes = {name: column[start:stop] for name, column in self._codes.items()}
+        book._categories = self._categories
+        book.index = self.index[start:stop]
+        return book
+
+    def _range(self, code, T=None):
+        """Range of contracts of the underlying with given code (and expiry T)."""
+        underlying = self._codes['underlying']
+        start, stop = np.searchsorted(underlying, code, 'left'), np.searchsorted(underlying, code, 'right')
+        if T is not None:
+            maturities = self._numeric['T'][start:stop]
+            start, stop = start + np.searchsorted(maturities, T, 'left'), start + np.searchsorted(maturities, T, 'right')  # noqa
+        return start, stop
+
+    def by_underlying(self, underlying, T=None):
+        """Contracts on the underlying (and with expiry T), as a book of array views."""
+        matches = np.flatnonzero(self._categories['underlying'] == underlying)
+        if not len(matches):
+            return self._slice(0, 0)
+        return self._slice(*self._range(matches[0], T))
+
+    def by_expiry(self, T):
+        """Contracts with expiry T on all underlyings.
+
+        Array views for books with a single underlying, otherwise the (underlying, T)
+        ranges are gathered into a new book.
+        """
+        ranges = [self._range(code, T) for code in np.unique(self._codes['underlying'])]
+        if len(ranges) == 1:
+            return self._slice(*ranges[0])
+        rows = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+        book = OptionBook.__new__(OptionBook)
+        book._numeric = {name: column[rows] for name, column in self._numeric.items()}
+        book._codes = {name: column[rows] for name, column in self._codes.items()}
+        book._categories = self._categories
+        book.index = self.index[rows]
+        return book
+
+    def groups(self):
+        """Yields ((underlying, T), book of array views) for every strike chain of the book."""
+        underlying, T = self._codes['underlying'], self._numeric['T']
+        bounds = np.flatnonzero((underlying[1:] != underlying[:-1]) | (T[1:] != T[:-1])) + 1
+        for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(self)]):
+            if stop > start:
+                yield (self._categories['underlying'][underlying[start]], T[start]), self._slice(start, stop)
+
+    def price(self, pricer=None):
+        """Calculates prices of all contracts of the book.
+
+        Contracts of every model are priced with one vectorized price_batch call
+        (grouped into strike chains by the model), or by the PortfolioPricer if given.
+
+        Returns
+        =======
+        prices: ndarray
+            option present values in input order (ascending index for slices of a book)
+        """
+        if pricer is not None:
+            return self._input_order(pricer.price(self))
+
+        prices = np.empty(len(self))
+        puts = self._categories['option_type'] == OPTION_TYPE.PUT_OPTION.value
+        is_put = puts[self._codes['option_type']]
+        model_codes = self._codes['model']
+        for code, model_name in enumerate(self._categories['model']):
+            rows = np.flatnonzero(model_codes == code)
+            if not len(rows):
+                continue
+            rows = slice(None) if len(rows) == len(self) else rows
+            S, K, T, r, sigma = (self._numeric[name][rows] for name in ('S', 'K', 'T', 'r', 'sigma'))
+            jumps = [self._numeric[name][rows] for name in ('lamb', 'mu', 'delta')]
+            if np.isnan(jumps[0]).all():
+                jumps = []
+            model = registry.get(model_name)
+            call_value = model.price_batch('call', S, K, T, r, sigma, *jumps)
+            prices[rows] = np.where(is_put[rows], model._put_from_call(call_value, S, K, T, r), call_value)
+        return self._input_order(prices)
+
+    def _input_order(self, values):
+        """Values of the contracts in book order rearranged into the input order (by index)."""
+        return values[np.argsort(self.index, kind='stable')]
@@ -0,0 +1,118 @@
+import numpy as np
+
+from .models import registry
+from .models.base import OPTION_TYPE
+
+
+class MertonCalibrator:
+    """Fits Merton jump diffusion parameters (sigma, lamb, mu, delta) to option quotes.
+
+    Parameters are found by (weighted) least squares on prices. Quotes are split into
+    slices sharing (S, T, r) once per fit, and every objective evaluation prices each
+    slice as one strike chain, i.e. with a single transform (COS, FFT) or one vectorized
+    quadrature pass. Characteristic function caching is disabled for the calibration model,
+    since parameters change on every evaluation.
+
+    Calibrator remembers the last fitted parameters and uses them as the starting point
+    of the next fit (warm start), so periodic recalibration to slowly moving quotes
+    needs only a few iterations.
+    """
+
+    parameter_names = ('sigma', 'lamb', 'mu', 'delta')
+    initial_params = (0.2, 1.0, -0.1, 0.1)
+    bounds = ((1e-3, 0., -2., 1e-3), (3., 10., 2., 2.))
+
+    def __init__(self, model='MERTON_FT_QUAD', initial_params=None, bounds=None):
+        """Creates calibrator
+
+        Parameters
+        ==========
+        model: str
+            name of the Merton pricing model ('MERTON_FT_QUAD', 'MERTON_COS', 'MERTON_FFT', ...)
+        initial_params: tuple
+            (sigma, lamb, mu, delta) used as the starting point of the first fit
+        bounds: tuple
+            lower and upper bounds of (sigma, lamb, mu, delta)
+        """
+        if not model.startswith('MERTON'):
+            raise Exception("Wrong option pricing model. Calibration requires a Merton model")
+        self.model = registry.create(model)
+        self.model.cf_cache = None
+        if initial_params is not None:
+            self.initial_params = tuple(initial_params)
+        if bounds is not None:
+            self.bounds = bounds
+        self.params = None
+
+    def reset(self):
+        """Forgets the last fit, next calibration starts from initial_params."""
+        self.params = None
+
+    def calibrate(self, prices, S, K, T, r, option_type='call', weights=None, x0=None, **kwargs):
+        """Fits model parameters to the option quotes.
+
+        Parameters
+        ==========
+        prices: array_like
+            market prices of the options
+        S: array_like
+            initial stock/index level
+        K: array_like
+            strike prices
+        T: array_like
+            time-to-maturity (for t=0)
+        r: array_like
+            constant risk-free short rate
+        option_type: str or array_like
+            'call' or 'put', for all quotes or per quote
+        weights: array_like
+            weights of the price residuals (e.g. inverse bid-ask spreads), defaults to 1
+        x0: tuple
+            starting point (sigma, lamb, mu, delta), defaults to the last fit (warm start)
+        kwargs:
+            additional arguments of scipy.optimize.least_squares
+
+        Returns
+        =======
+        result: dict
+            fitted sigma, lamb, mu and delta, together with rmse (root mean squared price error),
+            nfev (number of objective evaluations) and success flag
+        """
+        from scipy.optimize import least_squares
+
+        prices, S, K, T, r = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (prices, S, K, T, r)))
+        shape = prices.shape
+        option_type = np.broadcast_to(np.asarray(option_type).astype(str), shape).ravel()
+        prices, S, K, T, r = (a.ravel() for a in (prices, S, K, T, r))
+        if not np.isin(option_type, (OPTION_TYPE.CALL_OPTION.value, OPTION_TYPE.PUT_OPTION.value)).all():
+            raise Exception("Wrong option type")
+        is_put = option_type == OPTION_TYPE.PUT_OPTION.value
+        weights = np.ones_like(prices) if weights is None else np.broadcast_to(np.asarray(weights, dtype=float), shape).ravel()  # noqa
+
+        # calibrate to call prices (Put-Call parity), one chain per (S, T, r) slice
+        call_prices = np.where(is_put, prices + S - K * np.exp(-r * T), prices)
+        _, slice_of = np.unique(np.column_stack([S, T, r]), axis=0, return_inverse=True)
+        slices = [np.flatnonzero(slice_of.ravel() == i) for i in range(slice_of.max() + 1)]
+
+        def price_errors(x):
+            model_prices = np.empty_like(call_prices)
+            for index in slices:
+                i = index[0]
+                model_prices[index] = self.model.price_chain('call', S[i], K[index], T[i], r[i], *x)
+            return model_prices - call_prices
+
+        def residuals(x):
+            return weights * price_errors(x)
+
+        if x0 is None:
+            x0 = self.params if self.params is not None else self.initial_params
+        x0 = np.clip(x0, *self.bounds)
+        fit = least_squares(residuals, x0, bounds=self.bounds, **kwargs)
+
+        self.params = tuple(float(x) for x in fit.x)
+        result = dict(zip(self.parameter_names, self.params))
+        # unweighted price errors, so quotes with zero weight count too
+        result['rmse'] = float(np.sqrt(np.mean(price_errors(fit.x) ** 2)))
+        result['nfev'] = fit.nfev
+        result['success'] = bool(fit.success)
+        return result
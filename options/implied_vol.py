@@ -0,0 +1,146 @@
+from enum import IntEnum
+
+import numpy as np
+
+from .models.base import OPTION_TYPE
+from .models.bsm import BSM, _norm_pdf
+
+
+class IV_STATUS(IntEnum):
+    CONVERGED = 0
+    NOT_CONVERGED = 1  # maximum number of iterations reached
+    OUT_OF_BOUNDS = 2  # price violates no-arbitrage bounds (or invalid inputs)
+
+
+def implied_volatility(price, S, K, T, r, option_type='call', tol=1e-10, max_iter=100, return_status=False):
+    """Calculates Black-Scholes-Merton implied volatilities for arrays of option quotes.
+
+    All quotes are solved at once with vectorized safeguarded Newton iterations:
+    Newton steps use the analytic vega, starting from the Corrado-Miller (1996)
+    extension of the Brenner-Subrahmanyam (1988) approximation. Every option keeps
+    a bracket [lo, hi] of its implied volatility, steps leaving the bracket are replaced
+    by bisection (or by doubling while no upper bound is known). Converged options drop
+    out of the iteration, so the cost is driven by the number of hard quotes.
+
+    Every quote is inverted through its out-of-the-money option (Put-Call parity), whose
+    price is the time value and doesn't lose precision to the intrinsic value.
+    OTM puts are priced as calls by put-call symmetry:
+    P(S, K, T, r) = exp(-r * T) * C(K, S * exp(r * T), T, 0).
+    Newton steps are taken on the log price, which is close to linear in sigma for OTM options.
+
+    Parameters
+    ==========
+    price: array_like
+        option market prices
+    S: array_like
+        initial stock/index level
+    K: array_like
+        strike prices
+    T: array_like
+        time-to-maturity (for t=0)
+    r: array_like
+        constant risk-free short rate
+    option_type: str
+        'call' or 'put' (puts are converted to calls via Put-Call parity)
+    tol: float
+        absolute tolerance on volatility
+    max_iter: int
+        maximum number of iterations
+    return_status: bool
+        if True, per option IV_STATUS codes are returned as well
+
+    Returns
+    =======
+    sigma: ndarray
+        implied volatilities (NaN for quotes out of no-arbitrage bounds)
+    status: ndarray
+        IV_STATUS code of every option (only if return_status is True)
+    """
+    price, S, K, T, r = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (price, S, K, T, r)))
+    shape = price.shape
+    price, S, K, T, r = (a.ravel() for a in (price, S, K, T, r))
+
+    discounted_K = K * np.exp(-r * T)
+    if option_type == OPTION_TYPE.CALL_OPTION.value:
+        put_value = price - S + discounted_K
+        call_value = price
+    elif option_type == OPTION_TYPE.PUT_OPTION.value:
+        put_value = price
+        call_value = price + S - discounted_K
+    else:
+        raise Exception("Wrong option type")
+
+    # OTM option as a call on spot S_ with strike K_ and rate r_, measured in units of scale
+    otm_call = S < discounted_K
+    S_ = np.where(otm_call, S, K)
+    K_ = np.where(otm_call, K, S * np.exp(r * T))
+    r_ = np.where(otm_call, r, 0.)
+    target = np.where(otm_call, call_value, put_value * np.exp(r * T))
+
+    sigma = np.full(price.shape, np.nan)
+    status = np.full(price.shape, IV_STATUS.OUT_OF_BOUNDS, dtype=np.int8)
+    # time value must be positive and the call cheaper than the underlying
+    valid = np.flatnonzero((target > 0) & (target < S_) & (T > 0))
+    sigma[valid], status[valid] = _newton_bisection(target[valid], S_[valid], K_[valid], T[valid], r_[valid],
+                                                    tol, max_iter)
+
+    sigma, status = sigma.reshape(shape), status.reshape(shape)
+    if return_status:
+        return sigma, status
+    return sigma
+
+
+def _initial_guess(call_value, S, K, T, r):
+    """Corrado-Miller approximation, Brenner-Subrahmanyam where it isn't defined."""
+    discounted_K = K * np.exp(-r * T)
+    half_intrinsic = 0.5 * (S - discounted_K)
+    m = call_value - half_intrinsic
+    root = np.sqrt(np.maximum(m ** 2 - 4 * half_intrinsic ** 2 / np.pi, 0))
+    sigma = np.sqrt(2 * np.pi / T) / (S + discounted_K) * (m + root)
+    brenner = np.sqrt(2 * np.pi / T) * call_value / S
+    return np.where(sigma > 0, sigma, brenner)
+
+
+def _newton_bisection(call_value, S, K, T, r, tol, max_iter):
+    """Safeguarded Newton iterations for OTM calls inside the no-arbitrage bounds."""
+    model = BSM()
+    n = len(call_value)
+    sigma_out = np.empty(n)
+    status_out = np.full(n, IV_STATUS.NOT_CONVERGED, dtype=np.int8)
+
+    active = np.arange(n)
+    sigma = _initial_guess(call_value, S, K, T, r)
+    lo = np.zeros(n)
+    hi = np.full(n, np.inf)
+    for _ in range(max_iter):
+        if not len(active):
+            break
+        sqrt_T = np.sqrt(T)
+        value = model._calculate_call_option_price(S, K, T, r, sigma)
+        diff = value - call_value
+        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+        vega = S * _norm_pdf(d1) * sqrt_T
+
+        # call price is increasing in sigma
+        above = diff > 0
+        hi = np.where(above, sigma, hi)
+        lo = np.where(above, lo, sigma)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            step = np.log(value / call_value) * value / vega
+        new_sigma = sigma - step
+        outside = ~((new_sigma > lo) & (new_sigma < hi))
+        fallback = np.where(np.isfinite(hi), 0.5 * (lo + hi), 2 * sigma)
+        new_sigma = np.where(outside, fallback, new_sigma)
+
+        done = (np.abs(new_sigma - sigma) <= tol) | (hi - lo <= tol) | (diff == 0)
+        sigma_out[active[done]] = np.where(diff[done] == 0, sigma[done], new_sigma[done])
+        status_out[active[done]] = IV_STATUS.CONVERGED
+
+        keep = ~done
+        active = active[keep]
+        call_value, S, K, T, r = call_value[keep], S[keep], K[keep], T[keep], r[keep]
+        sigma, lo, hi = new_sigma[keep], lo[keep], hi[keep]
+
+    sigma_out[active] = sigma
+    return sigma_out, status_out
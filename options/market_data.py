@@ -0,0 +1,243 @@
+# Standard library imports
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import json
+import os
+import threading
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import requests
+
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:89.0) Gecko/20100101 Firefox/89.0', 'Accept': 'application/json;charset=utf-8'}  # noqa
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def shared_session(cache_days=1, cache_name='cache', pool_size=32):
+    """
+    Returns HTTP session shared by the whole process for the cache settings. Requests are
+    cached in sqlite db for cache_days (not cached if cache_days is None), connections
+    are kept alive in a pool of pool_size connections per host, so concurrent requests
+    don't open a new connection each.
+
+    Parameters
+    ==========
+    cache_days: float
+        number of days responses stay in cache, None disables caching
+    cache_name: str
+        name of the sqlite cache db
+    pool_size: int
+        maximum number of pooled connections per host
+    """
+    key = (cache_days, cache_name)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            if cache_days is None:
+                session = requests.Session()
+            else:
+                import requests_cache
+
+                session = requests_cache.CachedSession(
+                    cache_name=cache_name, backend='sqlite', expire_after=datetime.timedelta(days=cache_days))
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(HEADERS)
+            _sessions[key] = session
+    return session
+
+
+def _day(date):
+    return pd.Timestamp(date).normalize()
+
+
+class YahooSource:
+    """Daily price history from yahoo finance (pandas_datareader) over a shared session."""
+
+    def __init__(self, session=None, cache_days=1):
+        self.session = session if session is not None else shared_session(cache_days)
+
+    def __call__(self, ticker, start, end):
+        from pandas_datareader import data as wb
+
+        return wb.DataReader(ticker, data_source='yahoo', start=start, end=end, session=self.session)
+
+
+class LocalFileSource:
+    """Daily price history read from local files (CSV or Parquet, date in the first column), works offline."""
+
+    def __init__(self, directory, pattern='{ticker}.csv'):
+        """
+        Parameters
+        ==========
+        directory: str
+            directory with the files
+        pattern: str
+            file name of a ticker, extension selects the format (.csv or .parquet)
+        """
+        self.directory = directory
+        self.pattern = pattern
+
+    def __call__(self, ticker, start, end):
+        path = os.path.join(self.directory, self.pattern.format(ticker=ticker))
+        if path.endswith('.parquet'):
+            data = pd.read_parquet(path)
+        else:
+            data = pd.read_csv(path, index_col=0, parse_dates=True)
+        data.index = pd.DatetimeIndex(data.index)
+        return data.sort_index().loc[start:end]
+
+
+class MarketDataStore:
+    """Columnar on-disk store of daily price history, one directory per ticker.
+
+    Dates and the numeric columns are stored as .npy arrays (dates.npy, values.npy with
+    one column per field) and read memory-mapped, meta.json holds the column names and
+    the date range which was fetched from the source (dates without data inside it,
+    e.g. holidays, are not fetched again).
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ticker, name):
+        return os.path.join(self.directory, ticker, name)
+
+    def read(self, ticker):
+        """
+        Returns
+        =======
+        data: DataFrame
+            stored history (None if the ticker isn't stored)
+        covered: tuple
+            (start, end) range fetched from the source
+        """
+        try:
+            with open(self._path(ticker, 'meta.json')) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None, None
+        dates = np.load(self._path(ticker, 'dates.npy'), mmap_mode='r')
+        values = np.load(self._path(ticker, 'values.npy'), mmap_mode='r')
+        data = pd.DataFrame(values, index=pd.DatetimeIndex(dates, name='Date'), columns=meta['columns'])
+        return data, (pd.Timestamp(meta['start']), pd.Timestamp(meta['end']))
+
+    def write(self, ticker, data, covered):
+        """Replaces stored history of the ticker (files are written aside and renamed into place)."""
+        os.makedirs(os.path.join(self.directory, ticker), exist_ok=True)
+        arrays = {'dates.npy': data.index.values.astype('datetime64[ns]'),
+                  'values.npy': np.ascontiguousarray(data.to_numpy(dtype=float))}
+        for name, array in arrays.items():
+            with open(self._path(ticker, name + '.tmp'), 'wb') as f:
+                np.save(f, array)
+            os.replace(self._path(ticker, name + '.tmp'), self._path(ticker, name))
+        meta = {'columns': [str(column) for column in data.columns],
+                'start': covered[0].isoformat(), 'end': covered[1].isoformat()}
+        with open(self._path(ticker, 'meta.json.tmp'), 'w') as f:
+            json.dump(meta, f)
+        os.replace(self._path(ticker, 'meta.json.tmp'), self._path(ticker, 'meta.json'))
+
+
+class MarketDataLoader:
+    """Loads daily price history of many tickers concurrently.
+
+    Tickers are fetched from the source in a thread pool, the default yahoo source shares
+    one pooled (and cached) HTTP session between the threads. With a store, history is
+    kept on disk and only the date ranges outside of the stored range are fetched.
+    Source is any callable source(ticker, start, end) returning a DataFrame indexed by
+    date (YahooSource, LocalFileSource for offline use, ...).
+    """
+
+    def __init__(self, store=None, source=None, max_workers=16, cache_days=1):
+        """
+        Parameters
+        ==========
+        store: str or MarketDataStore
+            on-disk store (or its directory), None to always fetch from the source
+        source: callable
+            source(ticker, start, end) returning DataFrame indexed by date (defaults to YahooSource)
+        max_workers: int
+            number of tickers fetched concurrently
+        cache_days: float
+            number of days responses of the default yahoo source stay in cache
+        """
+        self.store = MarketDataStore(store) if isinstance(store, (str, os.PathLike)) else store
+        self.source = source if source is not None else YahooSource(shared_session(cache_days, pool_size=max_workers))  # noqa
+        self.max_workers = max_workers
+        self.errors = {}  # ticker -> exception of the last failed load
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _fetch(self, ticker, start, end):
+        data = self.source(ticker, start, end)
+        if data is None or not len(data):
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='Date'))
+        return data
+
+    def load(self, ticker, start, end=None):
+        """Daily history of the ticker between start and end (defaults to today).
+
+        Returns
+        =======
+        data: DataFrame
+            history indexed by date
+        """
+        start, end = _day(start), _day(end if end is not None else datetime.date.today())
+        if self.store is None:
+            return self._fetch(ticker, start, end).loc[start:end]
+
+        with self._locks_lock:
+            lock = self._locks.setdefault(ticker, threading.Lock())
+        with lock:
+            data, covered = self.store.read(ticker)
+            # today's prices are not final, so the covered range ends yesterday at the latest
+            last_final = _day(datetime.date.today()) - pd.Timedelta(days=1)
+            if covered is None:
+                fetched = [self._fetch(ticker, start, end)]
+                covered = (start, min(end, last_final))
+            else:
+                # missing ranges extend the covered range, so it stays contiguous
+                fetched = []
+                if start < covered[0]:
+                    fetched.append(self._fetch(ticker, start, covered[0] - pd.Timedelta(days=1)))
+                if end > covered[1]:
+                    fetched.append(self._fetch(ticker, covered[1] + pd.Timedelta(days=1), end))
+                covered = (min(start, covered[0]), max(min(end, last_final), covered[1]))
+            if fetched:
+                data = pd.concat(([data] if data is not None else []) + fetched)
+                data = data[~data.index.duplicated(keep='last')].sort_index()
+                self.store.write(ticker, data, covered)
+        return data.loc[start:end]
+
+    def _load_or_none(self, ticker, start, end):
+        try:
+            data = self.load(ticker, start, end)
+        except Exception as e:
+            self.errors[ticker] = e
+            return None
+        self.errors.pop(ticker, None)
+        return data
+
+    def load_many(self, tickers, start, end=None):
+        """Loads history of all tickers concurrently.
+
+        Returns
+        =======
+        data: dict
+            ticker -> DataFrame (None if loading failed, the exception is kept in errors)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            frames = pool.map(lambda ticker: self._load_or_none(ticker, start, end), tickers)
+            return dict(zip(tickers, frames))
+
+    async def aload_many(self, tickers, start, end=None):
+        """load_many for asyncio applications, loading runs in a thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.load_many, tickers, start, end)
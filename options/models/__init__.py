@@ -1,21 +1,42 @@
 from .bsm import BSM
-from .bsm_fourier import BSM_FT_NUM, BSM_FFT
-from .merton_fourier import MERTON_FT_NUM, MERTON_FFT
+from .bsm_fourier import BSM_FT_NUM, BSM_FT_QUAD, BSM_FFT, BSM_FRFT, BSM_COS
+from .merton import MERTON
+from .merton_fourier import MERTON_FT_NUM, MERTON_FT_QUAD, MERTON_FFT, MERTON_FRFT, MERTON_COS
+from .monte_carlo import BSM_MC, MERTON_MC, MonteCarloResult
+from .quadrature import QuadratureRule
+from .plan import FFTPlan, FrFTPlan
+from .cache import CharacteristicFunctionCache, cf_cache
+from .registry import ModelRegistry, registry
 
 
 def option_model_factory(model):
-    """Returns instance of selected option pricing model"""
-    if model == BSM.__name__:
-        return BSM()
-    elif model == BSM_FFT.__name__:
-        return BSM_FFT()
-    elif model == BSM_FT_NUM.__name__:
-        return BSM_FT_NUM()
-    elif model == MERTON_FT_NUM.__name__:
-        return MERTON_FT_NUM()
-    elif model == MERTON_FFT.__name__:
-        return MERTON_FFT()
+    """Returns shared instance of selected option pricing model (see ModelRegistry)"""
+    return registry.get(model)
+
+
+def price_batch(option_type, model, S, K, T, r, sigma, lamb=None, mu=None, delta=None):
+    """Calculates call/put option prices for arrays of contracts with the selected pricing model.
+
+    Parameters
+    ==========
+    option_type: str
+        'call' or 'put'
+    model: str
+        name of the option pricing model
+    S, K, T, r, sigma: array_like
+        option parameters, broadcast against each other
+    lamb, mu, delta: array_like
+        jump parameters (Merton model)
+
+    Returns
+    =======
+    prices: ndarray
+        option present values with the broadcast shape of the inputs
+    """
+    pricing_model = option_model_factory(model=model)
+
+    if lamb is not None and mu is not None and delta is not None:
+        # Merton jump diffusion model
+        return pricing_model.price_batch(option_type, S, K, T, r, sigma, lamb, mu, delta)
     else:
-        raise Exception(
-            "Wrong option pricing model. Specified model doesn't exist"
-        )
+        return pricing_model.price_batch(option_type, S, K, T, r, sigma)
@@ -0,0 +1,46 @@
+"""Optional compiled kernels for the Fourier pricing models.
+
+If numba is installed, characteristic functions are compiled into NumPy ufuncs
+(any input shape, no temporary arrays) and the Lewis (2001) integrands into C callbacks,
+which scipy.integrate.quad calls through scipy.LowLevelCallable without entering
+the Python interpreter. Without numba (or with OPTIONS_DISABLE_JIT=1 in the environment)
+ENABLED is False and the models keep using their NumPy implementations.
+Kernels are compiled (or loaded from numba's cache) on first use, so importing the
+models doesn't import numba. If numba is installed but can't be imported (e.g. built
+against another NumPy version), the kernels are None and ENABLED is switched off.
+
+Integrands take (u, x, T, r, sigma[, lamb, mu, delta]) with x = log(S / K), pass
+everything after u through the args of quad.
+"""
+import importlib.util
+import os
+import threading
+import warnings
+
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+# models check this flag on every call, so the compiled path can be switched off at runtime
+ENABLED = NUMBA_AVAILABLE and not os.environ.get('OPTIONS_DISABLE_JIT')
+
+KERNELS = ('bsm_characteristic_function', 'merton_characteristic_function', 'bsm_lewis_integrand',
+           'merton_lewis_integrand')
+_compile_lock = threading.Lock()
+
+
+def __getattr__(name):
+    if name not in KERNELS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    global ENABLED
+    with _compile_lock:
+        if name not in globals():
+            kernels = dict.fromkeys(KERNELS)
+            if NUMBA_AVAILABLE:
+                try:
+                    from . import _jit_kernels
+                except ImportError as e:
+                    ENABLED = False
+                    warnings.warn(f"numba kernels unavailable, using NumPy implementations: {e}", RuntimeWarning)
+                else:
+                    kernels = {kernel: getattr(_jit_kernels, kernel) for kernel in KERNELS}
+            globals().update(kernels)
+    return globals()[name]
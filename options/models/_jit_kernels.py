@@ -0,0 +1,50 @@
+"""Compiled kernels of _jit, imported on first use of a kernel (requires numba).
+
+Kernels are defined at module level, so numba can cache them on disk.
+"""
+import cmath
+import math
+
+from numba import cfunc, njit, vectorize
+from numba.types import CPointer, complex128, float64, intc
+from scipy import LowLevelCallable
+
+
+@njit(cache=True)
+def _bsm_cf(u, T, r, sigma):
+    return cmath.exp(((r - 0.5 * sigma ** 2) * 1j * u - 0.5 * sigma ** 2 * u ** 2) * T)
+
+
+@njit(cache=True)
+def _merton_cf(u, T, r, sigma, lamb, mu, delta):
+    omega = r - 0.5 * sigma ** 2 - lamb * (math.exp(mu + 0.5 * delta ** 2) - 1)
+    return cmath.exp((1j * u * omega - 0.5 * u ** 2 * sigma ** 2
+                      + lamb * (cmath.exp(1j * u * mu - u ** 2 * delta ** 2 * 0.5) - 1)) * T)
+
+
+@vectorize([complex128(complex128, float64, float64, float64)], cache=True)
+def bsm_characteristic_function(u, T, r, sigma):
+    return _bsm_cf(u, T, r, sigma)
+
+
+@vectorize([complex128(complex128, float64, float64, float64, float64, float64, float64)], cache=True)
+def merton_characteristic_function(u, T, r, sigma, lamb, mu, delta):
+    return _merton_cf(u, T, r, sigma, lamb, mu, delta)
+
+
+@cfunc(float64(intc, CPointer(float64)), cache=True)
+def _bsm_lewis_integrand(n, xx):
+    u = xx[0]
+    cf_value = _bsm_cf(u - 0.5j, xx[2], xx[3], xx[4])
+    return (cmath.exp(1j * u * xx[1]) * cf_value).real / (u ** 2 + 0.25)
+
+
+@cfunc(float64(intc, CPointer(float64)), cache=True)
+def _merton_lewis_integrand(n, xx):
+    u = xx[0]
+    cf_value = _merton_cf(u - 0.5j, xx[2], xx[3], xx[4], xx[5], xx[6], xx[7])
+    return (cmath.exp(1j * u * xx[1]) * cf_value).real / (u ** 2 + 0.25)
+
+
+bsm_lewis_integrand = LowLevelCallable(_bsm_lewis_integrand.ctypes)
+merton_lewis_integrand = LowLevelCallable(_merton_lewis_integrand.ctypes)
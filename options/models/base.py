@@ -4,6 +4,8 @@ from abc import abstractclassmethod
 
 import numpy as np
 
+from . import instrumentation
+
 
 class OPTION_TYPE(Enum):
     CALL_OPTION = 'call'
@@ -13,6 +15,9 @@ class OPTION_TYPE(Enum):
 class OptionPricingModel(ABC):
     """Abstract class defining interface for option pricing models."""
 
+    name = None  # name the shared instance is registered under (set by ModelRegistry.register)
+
+    @instrumentation.instrumented
     def price(self, option_type, *args, **kwargs):
         """Calculates call/put option price according to the specified parameter."""
         if option_type == OPTION_TYPE.CALL_OPTION.value:
@@ -22,12 +27,120 @@ class OptionPricingModel(ABC):
         else:
             raise Exception("Wrong option type")
 
+    @instrumentation.instrumented
+    def price_chain(self, option_type, S, K, T, r, sigma, *args, return_error=False):
+        """Calculates call/put option prices for a chain of strikes sharing S, T and model parameters.
+
+        Parameters
+        ==========
+        option_type: str
+            'call' or 'put'
+        S: float
+            initial stock/index level
+        K: array_like
+            strike prices of the chain
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+        args:
+            additional model parameters (e.g. lamb, mu, delta for Merton model)
+        return_error: bool
+            if True, estimated numerical (interpolation) error is returned as well
+
+        Returns
+        =======
+        prices: ndarray
+            option present values, one per strike
+        error: ndarray
+            estimated absolute error of each price (only if return_error is True)
+        """
+        K = np.atleast_1d(np.asarray(K, dtype=float))
+        if option_type not in (OPTION_TYPE.CALL_OPTION.value, OPTION_TYPE.PUT_OPTION.value):
+            raise Exception("Wrong option type")
+
+        prices, error = self._calculate_call_chain(S, K, T, r, sigma, *args)
+        if option_type == OPTION_TYPE.PUT_OPTION.value:
+            prices = self._put_from_call(prices, S, K, T, r)
+
+        if return_error:
+            return prices, error
+        return prices
+
+    @instrumentation.instrumented
+    def price_batch(self, option_type, S, K, T, r, sigma, *args):
+        """Calculates call/put option prices for arrays of contracts.
+
+        All parameters are broadcast against each other following NumPy broadcasting rules,
+        so e.g. a vector of strikes can be priced for a scalar spot and maturity.
+
+        Parameters
+        ==========
+        option_type: str
+            'call' or 'put'
+        S: array_like
+            initial stock/index level
+        K: array_like
+            strike price
+        T: array_like
+            time-to-maturity (for t=0)
+        r: array_like
+            constant risk-free short rate
+        sigma: array_like
+            volatility factor in diffusion term
+        args:
+            additional model parameters (e.g. lamb, mu, delta for Merton model)
+
+        Returns
+        =======
+        prices: ndarray
+            option present values with the broadcast shape of the inputs
+        """
+        if option_type not in (OPTION_TYPE.CALL_OPTION.value, OPTION_TYPE.PUT_OPTION.value):
+            raise Exception("Wrong option type")
+        S, K, T, r, sigma, *args = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T, r, sigma, *args)))  # noqa
+
+        prices = np.asarray(self._calculate_call_batch(S, K, T, r, sigma, *args), dtype=float)
+        if option_type == OPTION_TYPE.PUT_OPTION.value:
+            prices = self._put_from_call(prices, S, K, T, r)
+        return prices
+
+    @instrumentation.instrumented
+    def price_and_greeks(self, option_type, S, K, T, r, sigma, *args):
+        """Calculates call/put option prices together with their Greeks for arrays of contracts.
+
+        Parameters are broadcast against each other as in price_batch.
+
+        Returns
+        =======
+        greeks: dict
+            ndarrays with the broadcast shape of the inputs:
+            price   option present value
+            delta   dV/dS
+            gamma   d2V/dS2
+            vega    dV/dsigma (per unit of volatility)
+            theta   -dV/dT (per year)
+        """
+        if option_type not in (OPTION_TYPE.CALL_OPTION.value, OPTION_TYPE.PUT_OPTION.value):
+            raise Exception("Wrong option type")
+        S, K, T, r, sigma, *args = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T, r, sigma, *args)))  # noqa
+
+        greeks = self._calculate_call_greeks(S, K, T, r, sigma, *args)
+        if option_type == OPTION_TYPE.PUT_OPTION.value:
+            # Put-Call parity: P = C + K * exp(-r * T) - S
+            greeks['price'] = self._put_from_call(greeks['price'], S, K, T, r)
+            greeks['delta'] = greeks['delta'] - 1
+            greeks['theta'] = greeks['theta'] + r * K * np.exp(-r * T)
+        return greeks
+
     @abstractclassmethod
     def _calculate_call_option_price(self, S, K, T, r, sigma):
         """Calculates option price for call option."""
         raise NotImplementedError()
 
-    def _calculate_put_option_price(self, S, K, T, r, sigma):
+    def _calculate_put_option_price(self, S, K, T, r, sigma, *args):
         """
         Calculates option price for put option.
         Put option price is calculated from call price based on the Put-Call property.
@@ -41,7 +154,48 @@ class OptionPricingModel(ABC):
         P           price of the European put
         S           spot price or the current market value of the underlying asset
         """
-        c = self._calculate_call_option_price(S, K, T, r, sigma)
+        c = self._calculate_call_option_price(S, K, T, r, sigma, *args)
+        return self._put_from_call(c, S, K, T, r)
+
+    def _calculate_call_chain(self, S, K, T, r, sigma, *args):
+        """
+        Calculates call option prices for an array of strikes.
+        Default implementation prices every strike separately, so the error estimate is zero.
+        Models able to price a whole chain at once override this method.
+        """
+        prices = np.array([self._calculate_call_option_price(S, k, T, r, sigma, *args) for k in K], dtype=float)  # noqa
+        return prices, np.zeros_like(prices)
+
+    def _calculate_call_batch(self, S, K, T, r, sigma, *args):
+        """
+        Calculates call option prices for broadcast arrays of parameters.
+        Default implementation evaluates the scalar pricing function element-wise.
+        """
+        return np.vectorize(self._calculate_call_option_price, otypes=[float])(S, K, T, r, sigma, *args)
+
+    def _calculate_call_greeks(self, S, K, T, r, sigma, *args):
+        """
+        Calculates call option price and Greeks for broadcast arrays of parameters.
+        Default implementation uses central finite differences of the batch prices.
+        """
+        h_S, h_sigma = 1e-4 * S, 1e-4
+        h_T = np.minimum(1e-4, 0.5 * T)
+        price = self._calculate_call_batch(S, K, T, r, sigma, *args)
+        up = self._calculate_call_batch(S + h_S, K, T, r, sigma, *args)
+        down = self._calculate_call_batch(S - h_S, K, T, r, sigma, *args)
+        return {
+            'price': price,
+            'delta': (up - down) / (2 * h_S),
+            'gamma': (up - 2 * price + down) / h_S ** 2,
+            'vega': (self._calculate_call_batch(S, K, T, r, sigma + h_sigma, *args)
+                     - self._calculate_call_batch(S, K, T, r, sigma - h_sigma, *args)) / (2 * h_sigma),
+            'theta': -(self._calculate_call_batch(S, K, T + h_T, r, sigma, *args)
+                       - self._calculate_call_batch(S, K, T - h_T, r, sigma, *args)) / (2 * h_T),
+        }
+
+    @staticmethod
+    def _put_from_call(c, S, K, T, r):
+        """Put option price from call option price via Put-Call parity."""
         pv_strike = np.exp(-r * T) * K
         put_price = c + pv_strike - S
 
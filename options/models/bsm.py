@@ -1,9 +1,18 @@
 import numpy as np
-from scipy import stats
 
 from .base import OptionPricingModel
 
 
+def _norm_cdf(x):
+    # scipy.special is imported on first use, so importing the models doesn't load scipy
+    from scipy.special import ndtr
+    return ndtr(x)
+
+
+def _norm_pdf(x):
+    return np.exp(-x ** 2 / 2.0) / np.sqrt(2 * np.pi)
+
+
 class BSM(OptionPricingModel):
     """Black-Scholes-Merton Model(1973)
 
@@ -34,5 +43,32 @@ class BSM(OptionPricingModel):
         """
         d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))  # noqa
         d2 = (np.log(S / K) + (r - 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))  # noqa
-        BS_C = (S * stats.norm.cdf(d1, 0.0, 1.0) - K * np.exp(-r * T) * stats.norm.cdf(d2, 0.0, 1.0))    # noqa
+        BS_C = (S * _norm_cdf(d1) - K * np.exp(-r * T) * _norm_cdf(d2))    # noqa
         return BS_C
+
+    def _calculate_call_batch(self, S, K, T, r, sigma):
+        # closed form formula is already vectorized
+        return self._calculate_call_option_price(S, K, T, r, sigma)
+
+    def _calculate_call_greeks(self, S, K, T, r, sigma):
+        """ Closed form price and Greeks of European call option in BSM Model.
+
+        Returns
+        =======
+        greeks: dict
+            price, delta, gamma, vega and theta (-dV/dT) of the call option
+        """
+        sqrt_T = np.sqrt(T)
+        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+        d2 = d1 - sigma * sqrt_T
+        pdf_d1 = _norm_pdf(d1)
+        discounted_K = K * np.exp(-r * T)
+        cdf_d2 = _norm_cdf(d2)
+        delta = _norm_cdf(d1)
+        return {
+            'price': S * delta - discounted_K * cdf_d2,
+            'delta': delta,
+            'gamma': pdf_d1 / (S * sigma * sqrt_T),
+            'vega': S * pdf_d1 * sqrt_T,
+            'theta': -S * pdf_d1 * sigma / (2 * sqrt_T) - r * discounted_K * cdf_d2,
+        }
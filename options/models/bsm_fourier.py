@@ -1,11 +1,10 @@
-from numpy.fft import fft
-from scipy.integrate import quad
 import numpy as np
 
-from .base import OptionPricingModel
+from . import _jit, instrumentation
+from .fourier import FourierTransformPricing, CarrMadanFFTPricing, FractionalFFTPricing, LewisQuadraturePricing, COSPricing
 
 
-class BSMForierTransformPricing(OptionPricingModel):
+class BSMForierTransformPricing(FourierTransformPricing):
 
     @staticmethod
     def bsm_integral_function(u, S0, K, T, r, sigma):
@@ -26,6 +25,19 @@ class BSMForierTransformPricing(OptionPricingModel):
         cf_value = np.exp(((x0 / T + r - 0.5 * sigma ** 2) * 1j * v - 0.5 * sigma ** 2 * v ** 2) * T)  # noqa
         return cf_value
 
+    def _characteristic_function(self, u, T, r, sigma):
+        if _jit.ENABLED and _jit.bsm_characteristic_function is not None:
+            return _jit.bsm_characteristic_function(u, T, r, sigma)
+        return self.bsm_characteristic_function(u, 0.0, T, r, sigma)
+
+    def _cumulants(self, T, r, sigma):
+        return (r - 0.5 * sigma ** 2) * T, sigma ** 2 * T, 0.
+
+    def _log_cf_derivatives(self, u, T, r, sigma):
+        d_sigma = -sigma * (1j * u + u ** 2) * T
+        d_T = (r - 0.5 * sigma ** 2) * 1j * u - 0.5 * sigma ** 2 * u ** 2
+        return d_sigma, d_T
+
 
 class BSM_FT_NUM(BSMForierTransformPricing):
     """Fourier option pricing - Lewis Approach (2001)
@@ -57,12 +69,49 @@ class BSM_FT_NUM(BSMForierTransformPricing):
         call_value: float
             European call option present value
         """
-        int_value = quad(lambda u: self.bsm_integral_function(u, S, K, T, r, sigma), 0, 100)[0]  # noqa
-        call_value = max(0, S - np.exp(-r * T) * np.sqrt(S * K) / np.pi * int_value)  # noqa
+        if _jit.ENABLED and _jit.bsm_lewis_integrand is not None:
+            int_value = instrumentation.quad(self, _jit.bsm_lewis_integrand, 0, self.upper,
+                                             args=(np.log(S / K), T, r, sigma), limit=self.limit)[0]
+        else:
+            int_value = instrumentation.quad(self, lambda u: self.bsm_integral_function(u, S, K, T, r, sigma), 0, self.upper, limit=self.limit)[0]  # noqa
+        call_value = np.maximum(0, S - np.exp(-r * T) * np.sqrt(S * K) / np.pi * int_value)  # noqa
         return call_value
 
 
-class BSM_FFT(BSMForierTransformPricing):
+class BSM_FT_QUAD(LewisQuadraturePricing, BSMForierTransformPricing):
+    """Fourier option pricing - Lewis Approach (2001)
+
+    Class implementing calculation for European option price using Forier Transform
+    via Lewis Approach (fixed Gauss quadrature, vectorized over strikes).
+
+    Reference: Dr. Yves J. Hilpisch, Derivatives Analytics with Python
+    """
+
+    def _calculate_call_option_price(self, S, K, T, r, sigma):
+        """ Valuation of European call option in BSM model via Lewis (2001)
+
+        Parameters
+        ==========
+        S: float
+            initial stock/index level
+        K: float
+            strike price
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+
+        Returns
+        =======
+        call_value: float
+            European call option present value
+        """
+        return self._lewis_call_price(S, K, T, r, sigma)
+
+
+class BSM_FFT(CarrMadanFFTPricing, BSMForierTransformPricing):
     """Fourier option pricing - Lewis Approach (2001)
 
     Class implementing calculation for European option price using Forier Transform
@@ -71,6 +120,10 @@ class BSM_FFT(BSMForierTransformPricing):
     Reference: Dr. Yves J. Hilpisch, Derivatives Analytics with Python
     """
 
+    g = 1  # factor to increase accuracy of the fixed grid (tol selects an error-targeted grid)
+    N = g * 4096
+    eps = (g * 150.) ** -1
+
     def _calculate_call_option_price(self, S, K, T, r, sigma):
         """Valuation of European call option in BSM model via Lewis (2001)
         Fourier-based approach (integral).
@@ -94,57 +147,72 @@ class BSM_FFT(BSMForierTransformPricing):
             European call option present value
 
         """
-        k = np.log(K / S)
-        x0 = np.log(S / S)
-        g = 1  # factor to increase accuracy
-        N = g * 4096
-        eps = (g * 150.) ** -1
-        eta = 2 * np.pi / (N * eps)
-        b = 0.5 * N * eps - k
-        u = np.arange(1, N + 1, 1)
-        vo = eta * (u - 1)
-        # Modificatons to Ensure int_valueegrability
-        if S >= 0.95 * K:  # ITM case
-            alpha = 1.5
-            v = vo - (alpha + 1) * 1j
-            modcharFunc = np.exp(-r * T) * (self.bsm_characteristic_function(
-                v, x0, T, r, sigma) /
-                (alpha ** 2 + alpha
-                 - vo ** 2 + 1j * (2 * alpha + 1) * vo))
-        else:        # OTM case
-            alpha = 1.1
-            v = (vo - 1j * alpha) - 1j
-            modcharFunc1 = np.exp(-r * T) * (1 / (1 + 1j * (vo - 1j * alpha))
-                                             - np.exp(r * T) /
-                                             (1j * (vo - 1j * alpha))
-                                             - self.bsm_characteristic_function(
-                v, x0, T, r, sigma) /
-                ((vo - 1j * alpha) ** 2
-                 - 1j * (vo - 1j * alpha)))
-            v = (vo + 1j * alpha) - 1j
-            modcharFunc2 = np.exp(-r * T) * (1 / (1 + 1j * (vo + 1j * alpha))
-                                             - np.exp(r * T) /
-                                             (1j * (vo + 1j * alpha))
-                                             - self.bsm_characteristic_function(
-                v, x0, T, r, sigma) /
-                ((vo + 1j * alpha) ** 2
-                 - 1j * (vo + 1j * alpha)))
-        # Numerical FFT Routine
-        delt = np.zeros(N, dtype=np.float)
-        delt[0] = 1
-        j = np.arange(1, N + 1, 1)
-        SimpsonW = (3 + (-1) ** j - delt) / 3
-        if S >= 0.95 * K:
-            FFTFunc = np.exp(1j * b * vo) * modcharFunc * eta * SimpsonW
-            payoff = (fft(FFTFunc)).real
-            CallValueM = np.exp(-alpha * k) / np.pi * payoff
-        else:
-            FFTFunc = (np.exp(1j * b * vo)
-                       * (modcharFunc1 - modcharFunc2)
-                       * 0.5 * eta * SimpsonW)
-            payoff = (fft(FFTFunc)).real
-            CallValueM = payoff / (np.sinh(alpha * k) * np.pi)
-        pos = int((k + b) / eps)
-        CallValue = CallValueM[pos] * S
-        # klist = np.exp((np.arange(0, N, 1) - 1) * eps - b) * S0
-        return CallValue  # , klist[pos - 50:pos + 50]
+        return self._fft_call_price(S, K, T, r, sigma)
+
+
+class BSM_FRFT(FractionalFFTPricing, BSMForierTransformPricing):
+    """Fourier option pricing - Carr-Madan approach (1999) with fractional FFT
+
+    Class implementing calculation for European option price using Forier Transform
+    via Carr-Madan approach (FrFT - Fractional Fast Fourier Transform).
+
+    Reference: Chourdakis, K. (2004) Option pricing using the fractional FFT
+    """
+
+    def _calculate_call_option_price(self, S, K, T, r, sigma):
+        """ Valuation of European call option in BSM model via Carr-Madan (1999)
+        Fourier-based approach.
+
+        Parameters
+        ==========
+        S: float
+            initial stock/index level
+        K: float
+            strike price
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+
+        Returns
+        =======
+        call_value: float
+            European call option present value
+        """
+        return self._frft_call_price(S, K, T, r, sigma)
+
+
+class BSM_COS(COSPricing, BSMForierTransformPricing):
+    """Fourier option pricing - COS method (Fang and Oosterlee, 2008)
+
+    Class implementing calculation for European option price using Fourier-cosine
+    series expansion of the density (vectorized over strikes).
+
+    Reference: Fang, F., Oosterlee, C. W. (2008) A novel pricing method for European
+    options based on Fourier-cosine series expansions
+    """
+
+    def _calculate_call_option_price(self, S, K, T, r, sigma):
+        """ Valuation of European call option in BSM model via COS method
+
+        Parameters
+        ==========
+        S: float
+            initial stock/index level
+        K: float
+            strike price
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+
+        Returns
+        =======
+        call_value: float
+            European call option present value
+        """
+        return self._cos_call_price(S, K, T, r, sigma)
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+import threading
+
+
+class CharacteristicFunctionCache:
+    """Bounded LRU cache of characteristic function values evaluated on a pricing grid.
+
+    Transformed characteristic function vectors depend only on the grid and on
+    (T, r, sigma[, lamb, mu, delta]), not on spot or strike, so repricing after a spot
+    move reuses them. Least recently used entries are evicted once either the number
+    of entries or their total size exceeds the configured limits.
+    Cached arrays are read-only and the cache can be shared between threads.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 2 ** 20):
+        """Creates cache instance
+
+        Parameters
+        ==========
+        max_entries: int
+            maximum number of cached vectors
+        max_bytes: int
+            memory cap for the cached vectors (in bytes)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, compute):
+        """Returns cached value for key, calling compute() and storing its result on a miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = compute()
+        value.setflags(write=False)
+        if value.nbytes > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = value
+                self.nbytes += value.nbytes
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return value
+
+    def clear(self):
+        """Removes all cached values and resets hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Returns cache statistics."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'nbytes': self.nbytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+        }
+
+
+# cache shared by all Fourier pricing models
+cf_cache = CharacteristicFunctionCache()
@@ -0,0 +1,440 @@
+"""Opt-in instrumentation of the pricing models.
+
+Instrumentation is off by default: sink is None and the instrumented code paths check
+that single module attribute, so disabled instrumentation costs one attribute lookup per
+call. enable() starts recording into a sink (MetricsRegistry in memory by default,
+PrometheusTextFile for the node_exporter textfile collector, or any object with the
+increment/observe methods of MetricsRegistry), disable() stops.
+
+Recorded metrics (labels in braces):
+
+    pricing_calls_total{model, method}                           public pricing calls
+    pricing_latency_seconds{model, method, maturity, moneyness}  latency of the calls
+    pricing_contracts_total{model, method}                       contracts priced by the calls
+    quad_evaluations{model}                                      integrand evaluations of adaptive quadratures
+    quad_warnings_total{model}                                   quadratures which didn't reach the tolerance
+    fft_size{model, transform}                                   lengths of FFT / FrFT / COS transforms
+    cf_evaluation_seconds{model}                                 characteristic function evaluations (cache misses)
+    grid_selection_seconds{model}                                damping and error-targeted FFT grid selection
+    plan_build_seconds{plan}                                     construction of FFT / FrFT plans
+
+Models are labelled with their registry name. Latencies of scalar prices are labelled with
+the maturity and moneyness regime of the option, so e.g. short dated OTM options show up
+as their own series.
+"""
+from bisect import bisect_left
+import functools
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+sink = None
+
+LATENCY_BUCKETS = tuple(m * 10. ** e for e in range(-6, 1) for m in (1., 2.5, 5.))
+QUAD_BUCKETS = tuple(21. * (2 ** e - 1) for e in range(1, 12))  # QUADPACK QAGS evaluates 21 nodes per interval
+SIZE_BUCKETS = tuple(2. ** e for e in range(4, 23))
+MATURITY_REGIMES = ((1. / 12, '<1m'), (0.25, '<3m'), (1., '<1y'), (np.inf, '>=1y'))
+MONEYNESS_REGIMES = ((-0.05, 'itm'), (0.05, 'atm'), (0.25, 'otm'), (np.inf, 'deep_otm'))  # bounds of log(K / S) of calls  # noqa
+
+
+def enable(new_sink=None):
+    """Starts recording into new_sink (a new MetricsRegistry if None), returns the sink."""
+    global sink
+    sink = new_sink if new_sink is not None else MetricsRegistry()
+    return sink
+
+
+def disable():
+    """Stops recording, returns the sink that was recording (flushed if it can be)."""
+    global sink
+    previous, sink = sink, None
+    if hasattr(previous, 'flush'):
+        previous.flush()
+    return previous
+
+
+def increment(name, value=1., **labels):
+    if sink is not None:
+        sink.increment(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    if sink is not None:
+        sink.observe(name, value, **labels)
+
+
+class _Timer:
+    __slots__ = ('sink', 'name', 'labels', 'start')
+
+    def __init__(self, sink, name, labels):
+        self.sink = sink
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.sink.observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_null_timer = _NullTimer()
+
+
+def timer(name, **labels):
+    """Context manager observing the duration of its block (no-op while disabled)."""
+    if sink is None:
+        return _null_timer
+    return _Timer(sink, name, labels)
+
+
+def _regime(regimes, value):
+    for bound, label in regimes:
+        if value < bound:
+            return label
+    return 'nan'
+
+
+def model_name(model):
+    """Registry name of the model (class name for instances which aren't registered)."""
+    return model.name or type(model).__name__
+
+
+def _size(value):
+    return 1 if isinstance(value, (float, int)) else np.size(value)
+
+
+def _labels(model, method, args):
+    """Labels of a pricing call with arguments (option_type, S, K, T, ...)."""
+    maturity = moneyness = 'mixed'
+    if len(args) >= 4:
+        option_type, S, K, T = args[:4]
+        if _size(T) == 1:
+            maturity = _regime(MATURITY_REGIMES, float(T))
+        if _size(S) == 1 and _size(K) == 1:
+            try:
+                x = math.log(float(K) / float(S))
+            except (ValueError, ZeroDivisionError):
+                x = math.nan
+            moneyness = _regime(MONEYNESS_REGIMES, x if option_type == 'call' else -x)
+    return {'model': model_name(model), 'method': method, 'maturity': maturity, 'moneyness': moneyness}
+
+
+def instrumented(method):
+    """Decorator recording calls, latency and number of contracts of a public pricing method."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        current = sink
+        if current is None:
+            return method(self, *args, **kwargs)
+        start = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+        labels = _labels(self, name, args)
+        current.observe('pricing_latency_seconds', elapsed, **labels)
+        current.increment('pricing_calls_total', 1., model=labels['model'], method=name)
+        size = max(map(_size, args[1:]), default=1)
+        current.increment('pricing_contracts_total', size, model=labels['model'], method=name)
+        return result
+
+    return wrapper
+
+
+def timed(name):
+    """Decorator observing the duration of a model method as metric name labelled with the model."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            current = sink
+            if current is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            result = method(self, *args, **kwargs)
+            current.observe(name, time.perf_counter() - start, model=model_name(self))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def quad(model, func, a, b, **kwargs):
+    """scipy.integrate.quad recording the number of integrand evaluations of the model's integral."""
+    from scipy.integrate import quad as _quad
+
+    current = sink
+    if current is None:
+        return _quad(func, a, b, **kwargs)
+    result = _quad(func, a, b, full_output=1, **kwargs)
+    current.observe('quad_evaluations', result[2]['neval'], model=model_name(model))
+    if len(result) > 3:
+        current.increment('quad_warnings_total', 1., model=model_name(model))
+    return result[:2]
+
+
+def quad_vec(model, func, a, b, **kwargs):
+    """scipy.integrate.quad_vec recording the number of integrand evaluations of the model's integral."""
+    from scipy.integrate import quad_vec as _quad_vec
+
+    current = sink
+    if current is None:
+        return _quad_vec(func, a, b, **kwargs)
+    value, error, info = _quad_vec(func, a, b, full_output=True, **kwargs)
+    current.observe('quad_evaluations', info.neval, model=model_name(model))
+    if not info.success:
+        current.increment('quad_warnings_total', 1., model=model_name(model))
+    return value, error
+
+
+class Histogram:
+    """Bucket counts, sum and count of observed values (exported as a cumulative Prometheus histogram)."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.
+        self.count = 0
+
+    def observe(self, value):
+        i = bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.sum += other.sum
+        self.count += other.count
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else math.nan
+
+    def quantile(self, q):
+        """Quantile estimated by linear interpolation inside its bucket (upper bucket bound above the last bucket)."""
+        if not self.count:
+            return math.nan
+        rank, seen, lower = q * self.count, 0, 0.
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.buckets[-1]
+
+    def cumulative(self):
+        """(upper bound, number of values <= bound) pairs, ending with +Inf."""
+        total, pairs = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs + [(math.inf, self.count)]
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+class MetricsRegistry:
+    """In-memory sink: counters and histograms keyed by metric name and labels.
+
+    Histogram buckets are chosen by the metric name (buckets, falling back to latency
+    buckets for names ending with _seconds and to size buckets otherwise).
+    """
+
+    buckets = {'quad_evaluations': QUAD_BUCKETS, 'fft_size': SIZE_BUCKETS}
+
+    def __init__(self, prefix='options_'):
+        """
+        Parameters
+        ==========
+        prefix: str
+            prefix of the metric names in the Prometheus export
+        """
+        self.prefix = prefix
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> Histogram
+        self._lock = threading.Lock()
+
+    def increment(self, name, value=1., **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                buckets = self.buckets.get(name, LATENCY_BUCKETS if name.endswith('_seconds') else SIZE_BUCKETS)
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def _matching(self, metrics, name, labels):
+        return [(dict(key[1]), value) for key, value in metrics.items()
+                if key[0] == name and all(dict(key[1]).get(k) == v for k, v in labels.items())]
+
+    def counter(self, name, **labels):
+        """Sum of the counter over all label sets matching labels."""
+        with self._lock:
+            return sum(value for _, value in self._matching(self.counters, name, labels))
+
+    def histogram(self, name, **labels):
+        """Histogram merged over all label sets matching labels (None if nothing was observed)."""
+        with self._lock:
+            matches = self._matching(self.histograms, name, labels)
+            if not matches:
+                return None
+            merged = Histogram(matches[0][1].buckets)
+            for _, histogram in matches:
+                merged.merge(histogram)
+            return merged
+
+    def summary(self, name='pricing_latency_seconds', by=('model', 'maturity', 'moneyness')):
+        """
+        Count, mean and quantiles of a histogram per combination of the by labels, slowest (by mean) first.
+
+        Returns
+        =======
+        rows: list
+            dicts with the by labels, count, mean, p50 and p99
+        """
+        groups = {}
+        with self._lock:
+            for (metric, labels), histogram in self.histograms.items():
+                if metric != name:
+                    continue
+                labels = dict(labels)
+                key = tuple(labels.get(label) for label in by)
+                if key not in groups:
+                    groups[key] = Histogram(histogram.buckets)
+                groups[key].merge(histogram)
+        rows = [{**dict(zip(by, key)), 'count': h.count, 'mean': h.mean, 'p50': h.quantile(0.5),
+                 'p99': h.quantile(0.99)} for key, h in groups.items()]
+        return sorted(rows, key=lambda row: row['mean'], reverse=True)
+
+    def to_prometheus(self):
+        """Metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for metrics, kind in ((self.counters, 'counter'), (self.histograms, 'histogram')):
+                for name in sorted({key[0] for key in metrics}):
+                    lines.append(f'# TYPE {self.prefix}{name} {kind}')
+                    for (metric, labels), value in sorted(metrics.items()):
+                        if metric != name:
+                            continue
+                        if kind == 'counter':
+                            lines.append(f'{self.prefix}{name}{_format_labels(labels)} {value:g}')
+                            continue
+                        for bound, count in value.cumulative():
+                            le = '+Inf' if bound == math.inf else f'{bound:g}'
+                            lines.append(f'{self.prefix}{name}_bucket{_format_labels(labels, (("le", le),))} {count}')
+                        lines.append(f'{self.prefix}{name}_sum{_format_labels(labels)} {value.sum:.9g}')
+                        lines.append(f'{self.prefix}{name}_count{_format_labels(labels)} {value.count}')
+        return '\n'.join(lines) + '\n'
+
+
+class PrometheusTextFile(MetricsRegistry):
+    """Sink keeping metrics in memory and writing them to a Prometheus text file.
+
+    File is rewritten (written aside and renamed into place) by flush(), and by recording
+    calls once interval seconds passed since the last write, so a node_exporter textfile
+    collector always reads a complete file. Writes are serialized, each one uses its own
+    temporary file. Errors of the writes made by recording calls are logged and not raised,
+    so they never fail a pricing call.
+    """
+
+    def __init__(self, path, interval=10., prefix='options_'):
+        """
+        Parameters
+        ==========
+        path: str
+            path of the .prom file
+        interval: float
+            minimum number of seconds between automatic writes (None writes only on flush)
+        prefix: str
+            prefix of the metric names
+        """
+        super().__init__(prefix)
+        self.path = path
+        self.interval = interval
+        self._written = time.monotonic()
+        self._flush_lock = threading.Lock()
+
+    def _maybe_flush(self):
+        if self.interval is None or time.monotonic() - self._written < self.interval:
+            return
+        with self._flush_lock:
+            # another thread may have written the file while this one waited for the lock
+            if time.monotonic() - self._written < self.interval:
+                return
+            try:
+                self._write()
+            except OSError:
+                logger.exception("Writing metrics to %s failed", self.path)
+
+    def increment(self, name, value=1., **labels):
+        super().increment(name, value, **labels)
+        self._maybe_flush()
+
+    def observe(self, name, value, **labels):
+        super().observe(name, value, **labels)
+        self._maybe_flush()
+
+    def flush(self):
+        """Writes the metrics to the file now."""
+        with self._flush_lock:
+            self._write()
+
+    def _write(self):
+        self._written = time.monotonic()
+        text = self.to_prometheus()
+        directory, name = os.path.split(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+            os.chmod(tmp, 0o644)  # mkstemp creates the file readable by the owner only
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
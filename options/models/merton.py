@@ -0,0 +1,112 @@
+import numpy as np
+
+from .base import OptionPricingModel
+from .bsm import BSM
+
+
+class MERTON(OptionPricingModel):
+    """Merton Jump Diffusion Model (1976)
+
+    Class implementing calculation for European option price using Merton's series:
+    conditional on n jumps up to maturity, log return is normal, so the call price is
+    the Poisson weighted sum of BSM prices
+
+        C = sum_n exp(-lamb' * T) * (lamb' * T)^n / n! * BSM(S, K, T, r_n, sigma_n)
+
+    with lamb' = lamb * (1 + k), k = exp(mu + delta^2 / 2) - 1,
+    r_n = r - lamb * k + n * log(1 + k) / T and sigma_n^2 = sigma^2 + n * delta^2 / T.
+
+    Series is evaluated vectorized over contracts and truncated separately for every
+    contract once the remaining Poisson weight falls below tol. Every BSM price is
+    bounded by S, so S times the remaining weight bounds the truncation error.
+
+    Reference: Merton, R. C. (1976) Option pricing when underlying stock returns are discontinuous
+    """
+
+    tol = 1e-14  # Poisson tail weight at which the series is truncated
+    max_terms = 1000
+
+    def __init__(self, tol=None):
+        """
+        Parameters
+        ==========
+        tol: float
+            Poisson tail weight at which the series is truncated
+        """
+        if tol is not None:
+            self.tol = tol
+        self._bsm = BSM()
+
+    def _calculate_call_option_price(self, S, K, T, r, sigma, lamb, mu, delta):
+        """ Valuation of European call option in Merton model via Merton's series
+
+        Parameters
+        ==========
+        S: float
+            initial stock/index level
+        K: float
+            strike price
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+        lamb: float
+            jump intensity
+        mu: float
+            expected jump size
+        delta: float
+            standard deviation of jump
+
+        Returns
+        =======
+        call_value: float
+            European call option present value
+        """
+        call_value = self._merton_series(S, K, T, r, sigma, lamb, mu, delta)[0]
+        return float(call_value) if call_value.ndim == 0 else call_value
+
+    def _calculate_call_chain(self, S, K, T, r, sigma, lamb, mu, delta):
+        return self._merton_series(S, K, T, r, sigma, lamb, mu, delta)
+
+    def _calculate_call_batch(self, S, K, T, r, sigma, lamb, mu, delta):
+        return self._merton_series(S, K, T, r, sigma, lamb, mu, delta)[0]
+
+    def _merton_series(self, S, K, T, r, sigma, lamb, mu, delta):
+        """Call values and truncation error bounds, for arrays of contracts (intrinsic value at T <= 0)."""
+        S, K, T, r, sigma, lamb, mu, delta = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (S, K, T, r, sigma, lamb, mu, delta)))
+        shape = S.shape
+        S, K, T, r, sigma, lamb, mu, delta = (a.ravel() for a in (S, K, T, r, sigma, lamb, mu, delta))
+        # expired contracts are summed with a single term at T = 1 and replaced by the intrinsic value
+        expired = T <= 0
+        T = np.where(expired, 1., T)
+
+        log_jump = mu + 0.5 * delta ** 2  # log(1 + k)
+        k = np.expm1(log_jump)
+        lamb_T = np.where(expired, 0., lamb * (1 + k) * T)
+
+        # Poisson weights of every contract until its remaining weight falls below tol
+        weights, active = [], []
+        weight = np.exp(-lamb_T)
+        tail = np.ones_like(S)
+        for n in range(self.max_terms):
+            summing = tail > self.tol
+            if not summing.any():
+                break
+            weights.append(weight)
+            active.append(summing)
+            tail = np.where(summing, tail - weight, tail)
+            weight = weight * lamb_T / (n + 1)
+
+        # all (term, contract) pairs of the truncated series priced with one BSM evaluation
+        n, contract = np.nonzero(np.array(active))
+        sigma_n = np.sqrt(sigma[contract] ** 2 + n * delta[contract] ** 2 / T[contract])
+        r_n = r[contract] - lamb[contract] * k[contract] + n * log_jump[contract] / T[contract]
+        terms = np.array(weights)[n, contract] * self._bsm._calculate_call_option_price(
+            S[contract], K[contract], T[contract], r_n, sigma_n)
+        call_value = np.bincount(contract, weights=terms, minlength=len(S))
+        call_value = np.where(expired, np.maximum(S - K, 0.), call_value)
+
+        return call_value.reshape(shape), (np.maximum(tail, 0) * S).reshape(shape)
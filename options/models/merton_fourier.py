@@ -1,12 +1,11 @@
 import math
 import numpy as np
-from scipy.integrate import quad
-from numpy.fft import fft
 
-from .base import OptionPricingModel
+from . import _jit, instrumentation
+from .fourier import FourierTransformPricing, CarrMadanFFTPricing, FractionalFFTPricing, LewisQuadraturePricing, COSPricing
 
 
-class MertonFourierTransformPricing(OptionPricingModel):
+class MertonFourierTransformPricing(FourierTransformPricing):
 
     @staticmethod
     def merton_integration_function(u, S, K, T, r, sigma, lamb, mu, delta):
@@ -28,6 +27,24 @@ class MertonFourierTransformPricing(OptionPricingModel):
         value = np.exp((1j * u * omega - 0.5 * u ** 2 * sigma ** 2 + lamb * (np.exp(1j * u * mu - u ** 2 * delta ** 2 * 0.5) - 1)) * T)  # noqa
         return value
 
+    def _characteristic_function(self, u, T, r, sigma, lamb, mu, delta):
+        if _jit.ENABLED and _jit.merton_characteristic_function is not None:
+            return _jit.merton_characteristic_function(u, T, r, sigma, lamb, mu, delta)
+        return self.merton_characteristic_function(u, T, r, sigma, lamb, mu, delta)
+
+    def _cumulants(self, T, r, sigma, lamb, mu, delta):
+        omega = r - 0.5 * sigma ** 2 - lamb * (np.exp(mu + 0.5 * delta ** 2) - 1)
+        c1 = (omega + lamb * mu) * T
+        c2 = (sigma ** 2 + lamb * (mu ** 2 + delta ** 2)) * T
+        c4 = lamb * (mu ** 4 + 6 * mu ** 2 * delta ** 2 + 3 * delta ** 4) * T
+        return c1, c2, c4
+
+    def _log_cf_derivatives(self, u, T, r, sigma, lamb, mu, delta):
+        omega = r - 0.5 * sigma ** 2 - lamb * (np.exp(mu + 0.5 * delta ** 2) - 1)
+        d_sigma = -sigma * (1j * u + u ** 2) * T
+        d_T = 1j * u * omega - 0.5 * u ** 2 * sigma ** 2 + lamb * (np.exp(1j * u * mu - u ** 2 * delta ** 2 * 0.5) - 1)  # noqa
+        return d_sigma, d_T
+
 
 class MERTON_FT_NUM(MertonFourierTransformPricing):
     """Fourier option pricing - Lewis Approach (2001)
@@ -38,6 +55,9 @@ class MERTON_FT_NUM(MertonFourierTransformPricing):
     Reference: Dr. Yves J. Hilpisch, Derivatives Analytics with Python
     """
 
+    upper = 50.
+    limit = 250
+
     def _calculate_call_option_price(self, S, K, T, r, sigma, lamb, mu, delta):
         """ Valuation of European call option in Merton model via Lewis (2001)
 
@@ -65,13 +85,55 @@ class MERTON_FT_NUM(MertonFourierTransformPricing):
         call_value: float
             European call option present value
         """
-
-        int_value = quad(lambda u: self.merton_integration_function(u, S, K, T, r, sigma, lamb, mu, delta), 0, 50, limit=250)[0]  # noqa
+        if _jit.ENABLED and _jit.merton_lewis_integrand is not None:
+            int_value = instrumentation.quad(self, _jit.merton_lewis_integrand, 0, self.upper,
+                                             args=(math.log(S / K), T, r, sigma, lamb, mu, delta), limit=self.limit)[0]
+        else:
+            int_value = instrumentation.quad(self, lambda u: self.merton_integration_function(u, S, K, T, r, sigma, lamb, mu, delta), 0, self.upper, limit=self.limit)[0]  # noqa
         call_value = S - np.exp(-r * T) * math.sqrt(S * K) / math.pi * int_value  # noqa
         return call_value
 
 
-class MERTON_FFT(MertonFourierTransformPricing):
+class MERTON_FT_QUAD(LewisQuadraturePricing, MertonFourierTransformPricing):
+    """Fourier option pricing - Lewis Approach (2001)
+
+    Class implementing calculation for European option price using Forier Transform
+    via Lewis Approach (fixed Gauss quadrature, vectorized over strikes).
+
+    Reference: Dr. Yves J. Hilpisch, Derivatives Analytics with Python
+    """
+
+    def _calculate_call_option_price(self, S, K, T, r, sigma, lamb, mu, delta):
+        """ Valuation of European call option in Merton model via Lewis (2001)
+
+        Parameters
+        ==========
+        S: float
+            initial stock/index level
+        K: float
+            strike price
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+        lamb: float
+            jump intensity
+        mu: float
+            expected jump size
+        delta: float
+            standard deviation of jump
+
+        Returns
+        =======
+        call_value: float
+            European call option present value
+        """
+        return self._lewis_call_price(S, K, T, r, sigma, lamb, mu, delta)
+
+
+class MERTON_FFT(CarrMadanFFTPricing, MertonFourierTransformPricing):
     """Fourier option pricing - Carr-Madan approach (1999)
 
     Class implementing calculation for European option price using Forier Transform
@@ -80,6 +142,10 @@ class MERTON_FFT(MertonFourierTransformPricing):
     Reference: Dr. Yves J. Hilpisch, Derivatives Analytics with Python
     """
 
+    g = 2  # factor to increase accuracy of the fixed grid (tol selects an error-targeted grid)
+    N = g * 4096
+    eps = (g * 150.) ** -1
+
     def _calculate_call_option_price(self, S, K, T, r, sigma, lamb, mu, delta):
         """ Valuation of European call option in Merton model via Carr-Madan (1999)
         Fourier-based approach.
@@ -108,54 +174,84 @@ class MERTON_FFT(MertonFourierTransformPricing):
         call_value: float
             European call option present value
         """
-        k = math.log(K / S)
-        x0 = math.log(S / S)
-        g = 2  # factor to increase accuracy
-        N = g * 4096
-        eps = (g * 150.) ** -1
-        eta = 2 * math.pi / (N * eps)
-        b = 0.5 * N * eps - k
-        u = np.arange(1, N + 1, 1)
-        vo = eta * (u - 1)
-        # Modificatons to Ensure Integrability
-        if S >= 0.95 * K:  # ITM case
-            alpha = 1.5
-            v = vo - (alpha + 1) * 1j
-            mod_char_fun = math.exp(-r * T) * self.merton_characteristic_function(
-                v, T, r, sigma, lamb, mu, delta, x0) \
-                / (alpha ** 2 + alpha - vo ** 2 + 1j * (2 * alpha + 1) * vo)
-        else:  # OTM case
-            alpha = 1.1
-            v = (vo - 1j * alpha) - 1j
-            mod_char_fun_1 = math.exp(-r * T) * (1 / (1 + 1j * (vo - 1j * alpha))
-                                                 - math.exp(r * T) /
-                                                 (1j * (vo - 1j * alpha))
-                                                 - self.merton_characteristic_function(
-                v, T, r, sigma, lamb, mu, delta, x0)
-                / ((vo - 1j * alpha) ** 2 - 1j * (vo - 1j * alpha)))
-            v = (vo + 1j * alpha) - 1j
-            mod_char_fun_2 = math.exp(-r * T) * (1 / (1 + 1j * (vo + 1j * alpha))
-                                                 - math.exp(r * T) /
-                                                 (1j * (vo + 1j * alpha))
-                                                 - self.merton_characteristic_function(
-                v, T, r, sigma, lamb, mu, delta, x0)
-                / ((vo + 1j * alpha) ** 2 - 1j * (vo + 1j * alpha)))
-
-        # Numerical FFT Routine
-        delt = np.zeros(N, dtype=float)
-        delt[0] = 1
-        j = np.arange(1, N + 1, 1)
-        SimpsonW = (3 + (-1) ** j - delt) / 3
-        if S >= 0.95 * K:
-            fft_func = np.exp(1j * b * vo) * mod_char_fun * eta * SimpsonW
-            payoff = (fft(fft_func)).real
-            call_value_m = np.exp(-alpha * k) / math.pi * payoff
-        else:
-            fft_func = (np.exp(1j * b * vo)
-                        * (mod_char_fun_1 - mod_char_fun_2)
-                        * 0.5 * eta * SimpsonW)
-            payoff = (fft(fft_func)).real
-            call_value_m = payoff / (np.sinh(alpha * k) * math.pi)
-        pos = int((k + b) / eps)
-        call_value = call_value_m[pos]
-        return call_value * S
+        return self._fft_call_price(S, K, T, r, sigma, lamb, mu, delta)
+
+
+class MERTON_FRFT(FractionalFFTPricing, MertonFourierTransformPricing):
+    """Fourier option pricing - Carr-Madan approach (1999) with fractional FFT
+
+    Class implementing calculation for European option price using Forier Transform
+    via Carr-Madan approach (FrFT - Fractional Fast Fourier Transform).
+
+    Reference: Chourdakis, K. (2004) Option pricing using the fractional FFT
+    """
+
+    def _calculate_call_option_price(self, S, K, T, r, sigma, lamb, mu, delta):
+        """ Valuation of European call option in Merton model via Carr-Madan (1999)
+        Fourier-based approach.
+
+        Parameters
+        ==========
+        S: float
+            initial stock/index level
+        K: float
+            strike price
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+        lamb: float
+            jump intensity
+        mu: float
+            expected jump size
+        delta: float
+            standard deviation of jump
+
+        Returns
+        =======
+        call_value: float
+            European call option present value
+        """
+        return self._frft_call_price(S, K, T, r, sigma, lamb, mu, delta)
+
+
+class MERTON_COS(COSPricing, MertonFourierTransformPricing):
+    """Fourier option pricing - COS method (Fang and Oosterlee, 2008)
+
+    Class implementing calculation for European option price using Fourier-cosine
+    series expansion of the density (vectorized over strikes).
+
+    Reference: Fang, F., Oosterlee, C. W. (2008) A novel pricing method for European
+    options based on Fourier-cosine series expansions
+    """
+
+    def _calculate_call_option_price(self, S, K, T, r, sigma, lamb, mu, delta):
+        """ Valuation of European call option in Merton model via COS method
+
+        Parameters
+        ==========
+        S: float
+            initial stock/index level
+        K: float
+            strike price
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+        lamb: float
+            jump intensity
+        mu: float
+            expected jump size
+        delta: float
+            standard deviation of jump
+
+        Returns
+        =======
+        call_value: float
+            European call option present value
+        """
+        return self._cos_call_price(S, K, T, r, sigma, lamb, mu, delta)
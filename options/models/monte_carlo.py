@@ -0,0 +1,351 @@
+import time
+
+import numpy as np
+
+from .base import OptionPricingModel, OPTION_TYPE
+from .bsm import BSM
+
+
+class MonteCarloResult:
+    """Monte Carlo estimate with its standard error and the simulation throughput."""
+
+    __slots__ = ('price', 'std_error', 'n_paths', 'elapsed')
+
+    def __init__(self, price, std_error, n_paths, elapsed):
+        self.price = price
+        self.std_error = std_error
+        self.n_paths = n_paths
+        self.elapsed = elapsed
+
+    @property
+    def paths_per_second(self):
+        return self.n_paths / self.elapsed if self.elapsed > 0 else np.inf
+
+    def __repr__(self):
+        return f'MonteCarloResult(price={self.price}, std_error={self.std_error}, {self.paths_per_second:.3g} paths/s)'
+
+
+class _Moments:
+    """Running means and co-moments of payoffs y (paths x columns) and controls x (paths x columns x controls).
+
+    Moments of a chunk are merged into the running ones (Chan et al. pairwise update), so
+    no sums of squares of large values cancel.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = self.mean_y = self.xx = self.xy = self.yy = 0.
+
+    def add(self, x, y):
+        n = len(y)
+        mean_x, mean_y = x.mean(axis=0), y.mean(axis=0)
+        dx, dy = x - mean_x, y - mean_y
+        total = self.n + n
+        delta_x, delta_y = mean_x - self.mean_x, mean_y - self.mean_y
+        weight = self.n * n / total
+        self.xx = self.xx + np.einsum('pki,pkj->kij', dx, dx) + weight * delta_x[..., :, None] * delta_x[..., None, :]  # noqa
+        self.xy = self.xy + np.einsum('pki,pk->ki', dx, dy) + weight * delta_x * delta_y[..., None]
+        self.yy = self.yy + (dy * dy).sum(axis=0) + weight * delta_y * delta_y
+        self.mean_x = self.mean_x + delta_x * n / total
+        self.mean_y = self.mean_y + delta_y * n / total
+        self.n = total
+
+    def estimate(self, expected_x=None):
+        """Mean of y (corrected by the controls x with known means expected_x) and its standard error."""
+        if expected_x is None:
+            return self.mean_y, np.sqrt(self.yy / (self.n - 1) / self.n)
+        # least squares coefficients b = cov(x, x)^-1 cov(x, y), residual variance var(y) - cov(x, y) b
+        b = np.einsum('kij,kj->ki', np.linalg.pinv(self.xx), self.xy)
+        residual = np.maximum(self.yy - np.einsum('ki,ki->k', self.xy, b), 0.)
+        return self.mean_y - np.einsum('ki,ki->k', b, self.mean_x - expected_x), np.sqrt(residual / (self.n - 1) / self.n)  # noqa
+
+
+class MonteCarloPricing(OptionPricingModel):
+    """Base class for Monte Carlo pricing of the Merton jump diffusion (BSM without jumps).
+
+    Log-returns over a time step dt are simulated exactly:
+
+        (r - lamb * k - sigma^2 / 2) * dt + sigma * sqrt(dt) * Z + N * mu + delta * sqrt(N) * Z_J
+
+    with N ~ Poisson(lamb * dt) jumps and k = exp(mu + delta^2 / 2) - 1 (the sum of N normal
+    jump sizes is normal). Paths are simulated in chunks of chunk_size paths, so memory
+    stays bounded by a chunk whatever the number of paths, and moments of the payoffs are
+    merged chunk by chunk. Random numbers are drawn in fixed blocks of block_size paths,
+    block i from the generator seeded with SeedSequence(seed, spawn_key=(i,)), and chunks
+    are cut from the blocks. So an estimate depends only on the seed and the number of
+    paths (up to rounding of the merged moments), not on chunk_size, and is the same in
+    every process (e.g. PortfolioPricer with a process pool). Chunk sizes that are
+    multiples of block_size draw every block once. Contracts
+    priced with the same model share the random numbers (common random numbers), so
+    finite difference Greeks are smooth.
+
+    Variance reduction:
+    antithetic variates   every chunk holds the paths of Z and of -Z (same jump counts),
+                          a pair counts as one sample of the standard error
+    control variates      discounted terminal stock price (mean S) and model specific
+                          controls with known mean (_control), their coefficients are
+                          estimated by least squares from the same paths
+
+    Strikes of a chain are priced from the same paths, price_chain(..., return_error=True)
+    returns the standard errors, estimate() the full MonteCarloResult with the throughput.
+    """
+
+    n_paths = 2 ** 17  # number of simulated paths (rounded up to whole blocks)
+    chunk_size = 2 ** 14  # number of paths simulated at once
+    block_size = 2 ** 12  # number of paths drawn from one random stream
+    max_chunk_elements = 2 ** 20  # maximum number of payoffs (paths x strikes) of a chunk held at once
+    seed = 0
+    antithetic = True
+    control_variate = True  # use control variates
+
+    def __init__(self, n_paths=None, chunk_size=None, seed=None, antithetic=None, control_variate=None):
+        """
+        Parameters
+        ==========
+        n_paths: int
+            number of simulated paths
+        chunk_size: int
+            number of paths simulated at once
+        seed: int
+            seed of the random numbers
+        antithetic: bool
+            use antithetic variates
+        control_variate: bool
+            use the control variates
+        """
+        if n_paths is not None:
+            self.n_paths = int(n_paths)
+        if chunk_size is not None:
+            self.chunk_size = int(chunk_size)
+        if seed is not None:
+            self.seed = seed
+        if antithetic is not None:
+            self.antithetic = antithetic
+        if control_variate is not None:
+            self.control_variate = control_variate
+        if self.antithetic and (self.chunk_size % 2 or self.block_size % 2):
+            raise ValueError("Chunk size must be even with antithetic variates")
+        self._bsm = BSM()
+
+    @property
+    def _total_paths(self):
+        """Number of simulated paths, n_paths rounded up to whole blocks."""
+        return -(-self.n_paths // self.block_size) * self.block_size
+
+    def _draws(self, start, stop, n_steps, jump_rate):
+        """Normal draws (and jump counts and jump size draws with jump_rate > 0) of samples start to stop."""
+        per_block = self.block_size // 2 if self.antithetic else self.block_size
+        blocks = []
+        for i in range(start // per_block, -(-stop // per_block)):
+            rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(i,)))
+            draws = [rng.standard_normal((per_block, n_steps))]
+            if jump_rate > 0:
+                draws += [rng.poisson(jump_rate, (per_block, n_steps)), rng.standard_normal((per_block, n_steps))]
+            blocks.append(draws)
+        offset = start // per_block * per_block
+        return [np.concatenate(parts)[start - offset:stop - offset] for parts in zip(*blocks)]
+
+    def _chunks(self, T, r, sigma, lamb=0., mu=0., delta=0., n_steps=1):
+        """Yields log-returns of the time steps (paths x n_steps) and the diffusion part of their sum for every chunk."""  # noqa
+        n = self.chunk_size // 2 if self.antithetic else self.chunk_size
+        samples = self._total_paths // 2 if self.antithetic else self._total_paths
+        dt = T / n_steps
+        k = np.exp(mu + 0.5 * delta ** 2) - 1
+        drift = (r - lamb * k - 0.5 * sigma ** 2) * dt
+        for start in range(0, samples, n):
+            if lamb > 0:
+                z, counts, z_jump = self._draws(start, min(start + n, samples), n_steps, lamb * dt)
+            else:
+                z, = self._draws(start, min(start + n, samples), n_steps, 0.)
+            if self.antithetic:
+                z = np.concatenate((z, -z))
+                if lamb > 0:
+                    counts, z_jump = np.concatenate((counts, counts)), np.concatenate((z_jump, -z_jump))
+            diffusion = sigma * np.sqrt(dt) * z
+            log_returns = drift + diffusion
+            if lamb > 0:
+                log_returns += counts * mu + delta * np.sqrt(counts) * z_jump
+            yield log_returns, (r - 0.5 * sigma ** 2) * T + diffusion.sum(axis=1)
+
+    def _samples(self, values):
+        """Averages antithetic pairs, which are the independent samples."""
+        if self.antithetic:
+            half = len(values) // 2
+            return 0.5 * (values[:half] + values[half:])
+        return values
+
+    def _control(self, S, K, T, r, sigma, S_T, S_T_diffusion):
+        """Discounted control payoffs (paths x strikes x controls) and their expected values (strikes x controls)."""  # noqa
+        return np.exp(-r * T) * S_T[:, None, None], np.full((len(K), 1), S)
+
+    def _estimate_calls(self, S, K, T, r, sigma, lamb=0., mu=0., delta=0.):
+        """Call prices of a chain of strikes and their standard errors, simulation time."""
+        K = np.atleast_1d(np.asarray(K, dtype=float))
+        start = time.perf_counter()
+        discount = np.exp(-r * T)
+        # strikes are priced in blocks, so payoffs of a chunk hold at most max_chunk_elements values
+        size = max(1, self.max_chunk_elements // self.chunk_size)
+        blocks = [K[i:i + size] for i in range(0, len(K), size)]
+        moments, expected = [_Moments() for _ in blocks], [None] * len(blocks)
+        for log_returns, diffusion in self._chunks(T, r, sigma, lamb, mu, delta):
+            S_T = S * np.exp(log_returns[:, -1])
+            for i, strikes in enumerate(blocks):
+                y = discount * np.maximum(S_T[:, None] - strikes, 0.)
+                if self.control_variate:
+                    x, expected[i] = self._control(S, strikes, T, r, sigma, S_T, S * np.exp(diffusion))
+                    x = np.broadcast_to(x, y.shape + x.shape[2:])
+                else:
+                    x = np.zeros(y.shape + (1,))
+                moments[i].add(self._samples(x), self._samples(y))
+        price, std_error = (np.concatenate(a) for a in zip(*(m.estimate(e) for m, e in zip(moments, expected))))
+        return price, std_error, time.perf_counter() - start
+
+    def estimate(self, option_type, S, K, T, r, sigma, *args):
+        """Monte Carlo estimate of a chain of call/put option prices sharing S, T and model parameters.
+
+        Returns
+        =======
+        result: MonteCarloResult
+            prices (one per strike), their standard errors, number of paths and simulation time
+        """
+        if option_type not in (OPTION_TYPE.CALL_OPTION.value, OPTION_TYPE.PUT_OPTION.value):
+            raise Exception("Wrong option type")
+        K = np.atleast_1d(np.asarray(K, dtype=float))
+        prices, std_error, elapsed = self._estimate_calls(S, K, T, r, sigma, *args)
+        if option_type == OPTION_TYPE.PUT_OPTION.value:
+            prices = self._put_from_call(prices, S, K, T, r)
+        return MonteCarloResult(prices, std_error, self._total_paths, elapsed)
+
+    def estimate_payoff(self, payoff, S, T, r, sigma, *args, n_steps=252):
+        """Monte Carlo estimate of the present value of a path-dependent payoff.
+
+        Terminal stock price is the control variate (its discounted mean is S).
+
+        Parameters
+        ==========
+        payoff: callable
+            payoff(paths) of an array of stock price paths (paths x n_steps + 1, starting at S),
+            returning one payoff per path
+        S: float
+            initial stock/index level
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+        args:
+            additional model parameters (e.g. lamb, mu, delta for Merton model)
+        n_steps: int
+            number of time steps of the paths
+
+        Returns
+        =======
+        result: MonteCarloResult
+            present value, its standard error, number of paths and simulation time
+        """
+        start = time.perf_counter()
+        discount = np.exp(-r * T)
+        moments = _Moments()
+        n_paths = 0
+        for log_returns, _ in self._chunks(T, r, sigma, *args, n_steps=n_steps):
+            paths = S * np.exp(np.concatenate((np.zeros((len(log_returns), 1)), np.cumsum(log_returns, axis=1)), axis=1))  # noqa
+            y = discount * np.asarray(payoff(paths), dtype=float).reshape(-1, 1)
+            x = discount * paths[:, -1:, None] if self.control_variate else np.zeros(y.shape + (1,))
+            moments.add(self._samples(x), self._samples(y))
+            n_paths += len(paths)
+        price, std_error = moments.estimate(np.full((1, 1), S) if self.control_variate else None)
+        return MonteCarloResult(float(price[0]), float(std_error[0]), n_paths, time.perf_counter() - start)
+
+    def _calculate_call_chain(self, S, K, T, r, sigma, *args):
+        prices, std_error, _ = self._estimate_calls(S, K, T, r, sigma, *args)
+        return prices, std_error
+
+    def _calculate_call_batch(self, S, K, T, r, sigma, *args):
+        """Contracts sharing S, T and model parameters are priced as one chain."""
+        S, K, T, r, sigma, *args = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T, r, sigma, *args)))  # noqa
+        keys = np.stack([a.ravel() for a in (S, T, r, sigma, *args)], axis=1)
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        prices = np.empty(K.size)
+        strikes = K.ravel()
+        for i, row in enumerate(unique):
+            rows = np.flatnonzero(inverse == i)
+            S_i, T_i, r_i, sigma_i, *args_i = row
+            prices[rows] = self._estimate_calls(S_i, strikes[rows], T_i, r_i, sigma_i, *args_i)[0]
+        return prices.reshape(K.shape)
+
+
+class BSM_MC(MonteCarloPricing):
+    """Monte Carlo pricing in the Black-Scholes-Merton model.
+
+    Discounted terminal stock price is the only control (BSM call on the same paths
+    would reproduce the closed form exactly).
+    """
+
+    def _calculate_call_option_price(self, S, K, T, r, sigma):
+        """ Valuation of European call option in BSM Model via Monte Carlo simulation.
+
+        Parameters
+        ==========
+        S: float
+            initial stock/index level
+        K: float
+            strike price
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+
+        Returns
+        =======
+        call_value: float
+            European call option present value
+        """
+        return self._estimate_calls(S, K, T, r, sigma)[0][0]
+
+
+class MERTON_MC(MonteCarloPricing):
+    """Monte Carlo pricing in the Merton jump diffusion model.
+
+    Controls are the discounted terminal stock price and the call on the diffusion part of
+    the path, S * exp((r - sigma^2 / 2) * T + sigma * W_T), whose value is the BSM closed form.
+    The call control removes the diffusion noise of in-the-money calls, the stock price the
+    linear part of the jump noise.
+    """
+
+    def _calculate_call_option_price(self, S, K, T, r, sigma, lamb, mu, delta):
+        """ Valuation of European call option in Merton model via Monte Carlo simulation.
+
+        Parameters
+        ==========
+        S: float
+            initial stock/index level
+        K: float
+            strike price
+        T: float
+            time-to-maturity (for t=0)
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+        lamb: float
+            jump intensity
+        mu: float
+            expected jump size
+        delta: float
+            standard deviation of jump
+
+        Returns
+        =======
+        call_value: float
+            European call option present value
+        """
+        return self._estimate_calls(S, K, T, r, sigma, lamb, mu, delta)[0][0]
+
+    def _control(self, S, K, T, r, sigma, S_T, S_T_diffusion):
+        discount = np.exp(-r * T)
+        x = np.stack(np.broadcast_arrays(discount * S_T[:, None], discount * np.maximum(S_T_diffusion[:, None] - K, 0.)), axis=2)  # noqa
+        return x, np.stack(np.broadcast_arrays(S, self._bsm._calculate_call_option_price(S, K, T, r, sigma)), axis=1)
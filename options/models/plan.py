@@ -0,0 +1,173 @@
+from functools import lru_cache
+
+from numpy.fft import fft, ifft
+import numpy as np
+
+from . import instrumentation
+
+
+class FFTPlan:
+    """Precomputed grid for Carr-Madan (1999) FFT pricing.
+
+    Plan owns everything that depends only on (N, eta, alpha): frequency grid, Simpson
+    weights, phase factors, log-strike grid and damping factors. Pricing models keep a
+    reference to a plan, so the hot path doesn't rebuild (and reallocate) the grid.
+    All arrays are read-only, so a plan can be shared between models and threads.
+    Single precision copies of the arrays (single()) are made on first use.
+
+    Log-strike grid is centered at k = log(K / S) = 0 and spans [-b, b) with
+    spacing eps = 2 * pi / (N * eta).
+    """
+
+    def __init__(self, N, eta, alpha):
+        """Creates FFT plan
+
+        Parameters
+        ==========
+        N: int
+            number of FFT points
+        eta: float
+            spacing of the frequency grid
+        alpha: float
+            damping factor
+        """
+        self.N = int(N)
+        self.eta = float(eta)
+        self.alpha = float(alpha)
+        self.eps = 2 * np.pi / (self.N * self.eta)
+        self.b = 0.5 * self.N * self.eps
+        self.key = ('carr_madan', self.N, self.eta, self.alpha)
+
+        self.vo = self.eta * np.arange(self.N)
+        delt = np.zeros(self.N, dtype=float)
+        delt[0] = 1
+        j = np.arange(1, self.N + 1, 1)
+        simpson_w = (3 + (-1) ** j - delt) / 3
+        self.weights = self.eta * simpson_w
+        self.phase_weights = np.exp(1j * self.b * self.vo) * self.weights
+        self.k = -self.b + self.eps * np.arange(self.N)
+
+        # ITM case: damped call price transform
+        self.itm_argument = self.vo - (self.alpha + 1) * 1j
+        self.itm_denominator = self.alpha ** 2 + self.alpha - self.vo ** 2 + 1j * (2 * self.alpha + 1) * self.vo  # noqa
+        self.itm_damping = np.exp(-self.alpha * self.k) / np.pi
+
+        # OTM case: time value transform, evaluated at vo -/+ i * alpha
+        self.otm_arguments = (self.vo - 1j * self.alpha, self.vo + 1j * self.alpha)
+        with np.errstate(divide='ignore'):
+            self.otm_damping = 1 / (np.sinh(self.alpha * self.k) * np.pi)
+
+        for array in (self.vo, self.weights, self.phase_weights, self.k, self.itm_argument,
+                      self.itm_denominator, self.itm_damping, self.otm_damping, *self.otm_arguments):
+            array.setflags(write=False)
+        self._single = {}
+
+    def single(self, name):
+        """
+        Single precision (complex64/float32) copy of the plan array name, made on first use.
+        Real arrays are clipped to the float32 range: damping factors overflow it only at
+        the far ends of wide grids, away from the strikes that are priced.
+        """
+        array = self._single.get(name)
+        if array is None:
+            array = _single(getattr(self, name))
+            self._single[name] = array
+        return array
+
+    def __repr__(self):
+        return f'FFTPlan(N={self.N}, eta={self.eta}, alpha={self.alpha})'
+
+    @classmethod
+    def get(cls, N, eta, alpha):
+        """Returns plan shared by the whole process for (N, eta, alpha)."""
+        return _shared_plan(cls, int(N), float(eta), float(alpha))
+
+
+def _single(array):
+    """Read-only complex64/float32 copy of array."""
+    if np.iscomplexobj(array):
+        array = array.astype(np.complex64)
+    else:
+        limit = np.finfo(np.float32).max
+        array = np.clip(array, -limit, limit).astype(np.float32)
+    array.setflags(write=False)
+    return array
+
+
+@lru_cache(maxsize=64)
+def _shared_plan(cls, N, eta, alpha):
+    with instrumentation.timer('plan_build_seconds', plan=cls.__name__):
+        return cls(N, eta, alpha)
+
+
+class FrFTPlan:
+    """Precomputed grid for Carr-Madan pricing with the fractional FFT (Chourdakis, 2004).
+
+    Fractional FFT computes sum_j x_j * exp(-2 * pi * i * gamma * j * m) for any gamma,
+    so the log-strike spacing lam is chosen independently of the frequency spacing eta
+    (plain FFT requires eta * lam = 2 * pi / N). It is evaluated with FFTs of length 2N,
+    the chirp factors and the transformed kernel are precomputed here.
+    """
+
+    def __init__(self, N, eta, lam, alpha):
+        """Creates fractional FFT plan
+
+        Parameters
+        ==========
+        N: int
+            number of integration points and log-strikes
+        eta: float
+            spacing of the frequency grid
+        lam: float
+            spacing of the log-strike grid
+        alpha: float
+            damping factor
+        """
+        self.N = int(N)
+        self.eta = float(eta)
+        self.lam = float(lam)
+        self.alpha = float(alpha)
+        self.gamma = self.eta * self.lam / (2 * np.pi)
+        self.key = ('frft', self.N, self.eta, self.lam, self.alpha)
+
+        self.vo = self.eta * np.arange(self.N)
+        delt = np.zeros(self.N, dtype=float)
+        delt[0] = 1
+        j = np.arange(1, self.N + 1, 1)
+        simpson_w = (3 + (-1) ** j - delt) / 3
+        self.weights = self.eta * simpson_w
+        self.offsets = self.lam * np.arange(self.N)
+
+        self.itm_argument = self.vo - (self.alpha + 1) * 1j
+        self.itm_denominator = self.alpha ** 2 + self.alpha - self.vo ** 2 + 1j * (2 * self.alpha + 1) * self.vo  # noqa
+
+        m = np.arange(self.N)
+        self.chirp = np.exp(-1j * np.pi * self.gamma * m ** 2)
+        m = np.arange(2 * self.N)
+        m = np.where(m < self.N, m, 2 * self.N - m)
+        self.kernel = fft(np.exp(1j * np.pi * self.gamma * m ** 2))
+
+        for array in (self.vo, self.weights, self.offsets, self.itm_argument,
+                      self.itm_denominator, self.chirp, self.kernel):
+            array.setflags(write=False)
+
+    def __repr__(self):
+        return f'FrFTPlan(N={self.N}, eta={self.eta}, lam={self.lam}, alpha={self.alpha})'
+
+    def transform(self, x):
+        """Fractional FFT of x with the plan's gamma (along the last axis)."""
+        x = np.asarray(x)
+        y = np.zeros(x.shape[:-1] + (2 * self.N,), dtype=complex)
+        y[..., :self.N] = x * self.chirp
+        return self.chirp * ifft(fft(y) * self.kernel)[..., :self.N]
+
+    @classmethod
+    def get(cls, N, eta, lam, alpha):
+        """Returns plan shared by the whole process for (N, eta, lam, alpha)."""
+        return _shared_frft_plan(cls, int(N), float(eta), float(lam), float(alpha))
+
+
+@lru_cache(maxsize=64)
+def _shared_frft_plan(cls, N, eta, lam, alpha):
+    with instrumentation.timer('plan_build_seconds', plan=cls.__name__):
+        return cls(N, eta, lam, alpha)
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+class QuadratureRule:
+    """Fixed quadrature nodes and weights for integrals over [0, inf).
+
+    Integral of f over [0, inf) is approximated by sum(weights * f(nodes)).
+    Nodes and weights are read-only, so a rule can be shared between models and threads.
+    """
+
+    def __init__(self, nodes, weights, key=None):
+        """Creates quadrature rule
+
+        Parameters
+        ==========
+        nodes: array_like
+            integration nodes
+        weights: array_like
+            integration weights
+        key: tuple
+            hashable identifier of the rule (defaults to the rule's nodes and weights)
+        """
+        self.nodes = np.array(nodes, dtype=float)
+        self.weights = np.array(weights, dtype=float)
+        self.nodes.setflags(write=False)
+        self.weights.setflags(write=False)
+        self.key = key if key is not None else (self.nodes.tobytes(), self.weights.tobytes())
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return f'QuadratureRule(n={len(self)})'
+
+    @classmethod
+    def gauss_legendre(cls, n=128, upper=100.):
+        """Gauss-Legendre rule with n nodes on the truncated interval [0, upper]."""
+        x, w = np.polynomial.legendre.leggauss(n)
+        return cls(0.5 * upper * (x + 1), 0.5 * upper * w, key=('gauss_legendre', n, float(upper)))
+
+    @classmethod
+    def gauss_laguerre(cls, n=64, scale=1.):
+        """
+        Gauss-Laguerre rule with n nodes on [0, inf), nodes are divided by scale.
+        Weights include the exp(x) factor, so the rule integrates f directly (not f * exp(-x)).
+        """
+        x, w = np.polynomial.laguerre.laggauss(n)
+        return cls(x / scale, w * np.exp(x) / scale, key=('gauss_laguerre', n, float(scale)))
@@ -0,0 +1,97 @@
+import threading
+
+from .bsm import BSM
+from .bsm_fourier import BSM_FT_NUM, BSM_FT_QUAD, BSM_FFT, BSM_FRFT, BSM_COS
+from .merton import MERTON
+from .merton_fourier import MERTON_FT_NUM, MERTON_FT_QUAD, MERTON_FFT, MERTON_FRFT, MERTON_COS
+from .monte_carlo import BSM_MC, MERTON_MC
+
+
+class ModelRegistry:
+    """Registry of pre-built pricing model instances, looked up by name.
+
+    Every entry holds a model class, its configuration (constructor arguments, e.g. N,
+    eps, itm_alpha or itm_threshold of the FFT models, upper and limit of the adaptive
+    quadrature) and the instance built from them. Lookup is a dict access returning
+    the shared instance, so grids, plans and quadrature rules are built once per process.
+    Pricing models don't change their state while pricing, so instances can be shared
+    between threads. Use create() for a private instance (e.g. to change its cache).
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def register(self, name, model_class, replace=False, **config):
+        """Builds and registers model instance under name.
+
+        Parameters
+        ==========
+        name: str
+            name the model is looked up by
+        model_class: type
+            pricing model class
+        replace: bool
+            allow replacing an already registered model
+        config:
+            constructor arguments of the model class
+
+        Returns
+        =======
+        model: OptionPricingModel
+            registered model instance
+        """
+        model = model_class(**config)
+        model.name = name
+        with self._lock:
+            if name in self._entries and not replace:
+                raise Exception(f"Option pricing model {name} is already registered")
+            self._entries[name] = (model_class, config, model)
+        return model
+
+    def unregister(self, name):
+        """Removes model from the registry."""
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def get(self, name):
+        """Returns shared instance of the registered model."""
+        entry = self._entries.get(name)
+        if entry is None:
+            raise Exception("Wrong option pricing model. Specified model doesn't exist")
+        return entry[2]
+
+    def create(self, name, **config):
+        """Returns new instance of the registered model, config overrides its registered configuration."""
+        entry = self._entries.get(name)
+        if entry is None:
+            raise Exception("Wrong option pricing model. Specified model doesn't exist")
+        model_class, registered_config, _ = entry
+        return model_class(**{**registered_config, **config})
+
+    def config(self, name):
+        """Returns configuration the model was registered with."""
+        self.get(name)
+        return dict(self._entries[name][1])
+
+
+# registry used by option_model_factory, Option and price_batch
+registry = ModelRegistry()
+for model_class in (BSM, BSM_FT_NUM, BSM_FT_QUAD, BSM_FFT, BSM_FRFT, BSM_COS,
+                    MERTON, MERTON_FT_NUM, MERTON_FT_QUAD, MERTON_FFT, MERTON_FRFT, MERTON_COS, BSM_MC, MERTON_MC):
+    registry.register(model_class.__name__, model_class)
+# FFT models with the grid chosen per contract group for 1e-8 * S accuracy
+registry.register('BSM_FFT_ADAPTIVE', BSM_FFT, tol=1e-8)
+registry.register('MERTON_FFT_ADAPTIVE', MERTON_FFT, tol=1e-8)
+# FFT models transforming in single precision (complex64/float32), for bulk surface jobs
+registry.register('BSM_FFT_SINGLE', BSM_FFT, precision='single')
+registry.register('MERTON_FFT_SINGLE', MERTON_FFT, precision='single')
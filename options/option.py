@@ -6,6 +6,8 @@ from .models import option_model_factory
 
 
 class Option:
+    __slots__ = ('S', 'K', 'T', 'r', 'sigma')
+
     def __init__(self, S, K, T, r, sigma):
         """Creates option instance
 
@@ -49,3 +51,28 @@ class Option:
             return pricing_model.price(option_type, self.S, self.K, self.T, self.r, self.sigma)
 
         return None
+
+    def price_and_greeks(self, option_type, model, lamb=None, mu=None, delta=None):
+        """Calculates call/put option price together with delta, gamma, vega and theta.
+
+        Greeks are computed in the same pass as the price (closed form for BSM,
+        differentiated characteristic function for the Fourier models).
+
+        Parameters
+        ==========
+        lamb: float
+            jump frequency p.a. (Merton model)
+        mu: float
+            expected jump size (Merton model)
+        delta: float
+            jump size volatility (Merton model)
+
+        Returns
+        =======
+        greeks: dict
+            price, delta, gamma, vega and theta
+        """
+        pricing_model = option_model_factory(model=model)
+        params = (lamb, mu, delta) if lamb is not None and mu is not None and delta is not None else ()
+        greeks = pricing_model.price_and_greeks(option_type, self.S, self.K, self.T, self.r, self.sigma, *params)
+        return {name: value[()] for name, value in greeks.items()}
@@ -0,0 +1,156 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+
+import numpy as np
+
+from .models import registry
+from .models.base import OPTION_TYPE
+
+
+def _worker_model(model_name, spec):
+    """Returns the model instance of the worker, registering it from spec (model class, config) if the
+    worker's registry doesn't hold it (models registered after the pool was started, spawned workers)."""
+    if spec is not None:
+        model_class, config = spec
+        if model_name not in registry or type(registry.get(model_name)) is not model_class \
+                or registry.config(model_name) != config:
+            registry.register(model_name, model_class, replace=True, **config)
+    return registry.get(model_name)
+
+
+def _price_groups(groups):
+    """Worker task: prices a list of contract groups, each with a single pricing model."""
+    results = []
+    for model_name, spec, index, S, K, T, r, sigma, is_put, jumps in groups:
+        # registry instances live for the whole worker process, so FFT plans,
+        # quadrature rules and characteristic function caches stay warm between tasks
+        model = _worker_model(model_name, spec)
+        call_value = model.price_batch('call', S, K, T, r, sigma, *jumps)
+        prices = np.where(is_put, model._put_from_call(call_value, S, K, T, r), call_value)
+        results.append((index, prices))
+    return results
+
+
+class PortfolioPricer:
+    """Prices a book of contracts in parallel.
+
+    Contracts are grouped by (underlying, maturity, model), so each group is a strike chain
+    priced with one vectorized call (a single transform for the Fourier models).
+    Groups are bundled into balanced tasks and dispatched to a process or thread pool.
+    The pool is kept alive between calls, so workers reuse their model instances.
+    Process workers get every model's class and configuration with the tasks and register
+    it in their own registry, so models registered (or replaced) after the pool was started
+    are priced too; custom model classes must be importable by the workers (picklable).
+    Every group is always priced as a whole, so results don't depend on the number
+    of workers and are returned in the input order.
+    """
+
+    def __init__(self, max_workers=None, executor='process', tasks_per_worker=4):
+        """Creates portfolio pricer
+
+        Parameters
+        ==========
+        max_workers: int
+            number of workers (defaults to the number of CPUs)
+        executor: str
+            'process', 'thread' or 'serial' (price in the calling thread)
+        tasks_per_worker: int
+            number of tasks per worker the book is split into (for load balancing)
+        """
+        if executor not in ('process', 'thread', 'serial'):
+            raise Exception("Wrong executor. Use 'process', 'thread' or 'serial'")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor
+        self.tasks_per_worker = tasks_per_worker
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shuts down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            pool_class = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+            self._pool = pool_class(max_workers=self.max_workers)
+        return self._pool
+
+    def price(self, contracts):
+        """Calculates prices of all contracts in the book.
+
+        Parameters
+        ==========
+        contracts: mapping
+            table of contracts (dict of columns, pandas DataFrame, OptionBook, ...) with
+            columns option_type ('call'/'put'), model, S, K, T, r, sigma and optionally
+            underlying and lamb, mu, delta (Merton model, NaN for other models)
+
+        Returns
+        =======
+        prices: ndarray
+            option present values in the order of the contracts
+        """
+        tasks = self._make_tasks(contracts)
+        prices = np.empty(len(np.asarray(contracts['K'])), dtype=float)
+
+        if self.executor == 'serial' or len(tasks) <= 1:
+            results = map(_price_groups, tasks)
+        else:
+            results = self._get_pool().map(_price_groups, tasks)
+        for task_result in results:
+            for index, group_prices in task_result:
+                prices[index] = group_prices
+        return prices
+
+    def _make_tasks(self, contracts):
+        """Splits the book into groups of contracts and bundles them into balanced tasks."""
+        columns = {name: np.asarray(contracts[name], dtype=float) for name in ('S', 'K', 'T', 'r', 'sigma')}
+        n = len(columns['K'])
+        model = np.asarray(contracts['model']).astype(str)
+        option_type = np.asarray(contracts['option_type']).astype(str)
+        if not np.isin(option_type, (OPTION_TYPE.CALL_OPTION.value, OPTION_TYPE.PUT_OPTION.value)).all():
+            raise Exception("Wrong option type")
+        is_put = option_type == OPTION_TYPE.PUT_OPTION.value
+        underlying = np.asarray(contracts['underlying']).astype(str) if 'underlying' in contracts \
+            else np.zeros(n, dtype=str)
+        jumps = [np.asarray(contracts[name], dtype=float) if name in contracts else np.full(n, np.nan)
+                 for name in ('lamb', 'mu', 'delta')]
+
+        codes = np.column_stack([np.unique(a, return_inverse=True)[1].ravel()
+                                 for a in (underlying, columns['T'], model)])
+        _, group_of = np.unique(codes, axis=0, return_inverse=True)
+        group_of = group_of.ravel()
+        order = np.argsort(group_of, kind='stable')
+        bounds = np.cumsum(np.bincount(group_of))[:-1]
+
+        # worker processes have their own registry, copied when the pool was started
+        specs = {}
+        if self.executor == 'process':
+            specs = {name: (type(registry.get(name)), registry.config(name)) for name in np.unique(model)}
+
+        groups = []
+        for index in np.split(order, bounds):
+            group_jumps = tuple(a[index] for a in jumps)
+            if np.isnan(group_jumps[0]).all():
+                group_jumps = ()
+            name = model[index[0]]
+            groups.append((name, specs.get(name), index, columns['S'][index], columns['K'][index],
+                           columns['T'][index], columns['r'][index], columns['sigma'][index],
+                           is_put[index], group_jumps))
+
+        # longest processing time first: biggest group goes to the least loaded task
+        n_tasks = max(1, min(len(groups), self.max_workers * self.tasks_per_worker))
+        tasks = [[] for _ in range(n_tasks)]
+        load = np.zeros(n_tasks)
+        for group in sorted(groups, key=lambda g: len(g[2]), reverse=True):
+            i = int(np.argmin(load))
+            tasks[i].append(group)
+            load[i] += len(group[2])
+        return [task for task in tasks if task]
@@ -0,0 +1,218 @@
+import asyncio
+import time
+
+import numpy as np
+
+from .book import OptionBook
+from .models import registry
+
+
+GREEKS = ('price', 'delta', 'gamma', 'vega', 'theta')
+
+
+class PriceUpdate:
+    """Repricing result of one spot tick.
+
+    index holds the positions (in the input order of the book) of the contracts whose
+    price changed by more than the pricer's min_change since it was last emitted, values
+    their new price and Greeks, changes the differences to the previously emitted ones
+    (the initial values for contracts not emitted yet), so applying the changes keeps
+    a consumer's values within min_change of the current prices.
+    """
+
+    __slots__ = ('timestamp', 'underlying', 'spot', 'index', 'values', 'changes', 'latency')
+
+    def __init__(self, timestamp, underlying, spot, index, values, changes, latency):
+        self.timestamp = timestamp
+        self.underlying = underlying
+        self.spot = spot
+        self.index = index
+        self.values = values
+        self.changes = changes
+        self.latency = latency
+
+    def __repr__(self):
+        return f'PriceUpdate({self.underlying!r}, spot={self.spot}, {len(self.index)} contracts)'
+
+
+class StreamingPricer:
+    """Reprices a fixed set of contracts on every spot tick of their underlyings.
+
+    Contracts are split once into groups of one underlying, model and option type, a
+    tick reprices only the groups of its underlying with a vectorized price_and_greeks
+    call. Fourier models price a group in moneyness K / S, so characteristic function
+    values and grids (cached by the shared registry instances) are reused between ticks,
+    only the transform is repeated.
+
+    stream() consumes an iterable of ticks and is pulled by the consumer, so a slow
+    consumer slows down reading the ticks (backpressure). astream() consumes an async
+    stream of ticks: ticks are read by a separate task into a buffer holding the latest
+    tick of every underlying, ticks arriving while the underlying waits for repricing
+    replace the waiting one (conflation), so latency stays bounded by one repricing of
+    every underlying, however fast the ticks arrive.
+
+    Ticks are (timestamp, underlying, spot) or (timestamp, spot) for books with a single underlying.
+    """
+
+    def __init__(self, contracts, greeks=True, min_change=0.):
+        """
+        Parameters
+        ==========
+        contracts: OptionBook or mapping
+            contracts to reprice (table of columns as accepted by OptionBook.from_frame),
+            S column gives the initial spot of every underlying
+        greeks: bool
+            if False only prices are calculated
+        min_change: float
+            contracts whose price changed by at most min_change are left out of the updates
+        """
+        self.book = contracts if isinstance(contracts, OptionBook) else OptionBook.from_frame(contracts)
+        self.fields = GREEKS if greeks else GREEKS[:1]
+        self.min_change = min_change
+        self.conflated = 0  # ticks replaced by a later tick of the same underlying (astream)
+
+        codes = self.book.codes('underlying')
+        model_codes, type_codes = self.book.codes('model'), self.book.codes('option_type')
+        models, option_types = self.book.categories('model'), self.book.categories('option_type')
+        columns = {name: self.book[name] for name in ('S', 'K', 'T', 'r', 'sigma', 'lamb', 'mu', 'delta')}
+
+        self._groups = {}
+        self.spot = {}
+        for code, underlying in enumerate(self.book.categories('underlying')):
+            start, stop = np.searchsorted(codes, code, 'left'), np.searchsorted(codes, code, 'right')
+            if stop == start:
+                continue
+            groups = []
+            keys = model_codes[start:stop].astype(np.int64) * len(option_types) + type_codes[start:stop]
+            for key in np.unique(keys):
+                rows = start + np.flatnonzero(keys == key)
+                jumps = tuple(columns[name][rows] for name in ('lamb', 'mu', 'delta'))
+                if np.isnan(jumps[0]).all():
+                    jumps = ()
+                groups.append((rows, registry.get(models[key // len(option_types)]),
+                               option_types[key % len(option_types)],
+                               *(columns[name][rows] for name in ('K', 'T', 'r', 'sigma')), jumps))
+            self._groups[str(underlying)] = groups
+            self.spot[str(underlying)] = float(columns['S'][start])
+
+        self.values = {name: np.empty(len(self.book)) for name in self.fields}  # latest computed values
+        for underlying in self._groups:
+            self._price(underlying, self.spot[underlying])
+        self.emitted = {name: values.copy() for name, values in self.values.items()}  # latest emitted values
+
+    def _price(self, underlying, spot):
+        """Reprices the contracts of the underlying, returns their rows."""
+        rows = []
+        for group_rows, model, option_type, K, T, r, sigma, jumps in self._groups[underlying]:
+            if len(self.fields) > 1:
+                values = model.price_and_greeks(option_type, spot, K, T, r, sigma, *jumps)
+            else:
+                values = {'price': model.price_batch(option_type, spot, K, T, r, sigma, *jumps)}
+            for name in self.fields:
+                self.values[name][group_rows] = values[name]
+            rows.append(group_rows)
+        return np.concatenate(rows)
+
+    def update(self, underlying, spot, timestamp=None):
+        """Reprices the contracts of the underlying at the new spot.
+
+        Returns
+        =======
+        update: PriceUpdate
+            new values and changes of the repriced contracts, None if the spot didn't change
+        """
+        if underlying not in self._groups:
+            raise Exception(f"No contracts on underlying {underlying!r}")
+        spot = float(spot)
+        if spot == self.spot[underlying]:
+            return None
+
+        start = time.perf_counter()
+        self.spot[underlying] = spot
+        rows = self._price(underlying, spot)
+        changes = {name: self.values[name][rows] - self.emitted[name][rows] for name in self.fields}
+        changed = np.abs(changes['price']) > self.min_change
+        rows = rows[changed]
+        values = {name: self.values[name][rows] for name in self.fields}
+        for name in self.fields:
+            self.emitted[name][rows] = values[name]
+        return PriceUpdate(timestamp, underlying, spot, self.book.index[rows], values,
+                           {name: change[changed] for name, change in changes.items()},
+                           time.perf_counter() - start)
+
+    def _parse_tick(self, tick):
+        if len(tick) == 3:
+            return tick
+        if len(self._groups) != 1:
+            raise Exception("Ticks without underlying require a book with a single underlying")
+        timestamp, spot = tick
+        return timestamp, next(iter(self._groups)), spot
+
+    def stream(self, ticks):
+        """Yields a PriceUpdate for every tick changing the spot.
+
+        Parameters
+        ==========
+        ticks: iterable
+            (timestamp, underlying, spot) or (timestamp, spot) ticks
+        """
+        for tick in ticks:
+            timestamp, underlying, spot = self._parse_tick(tick)
+            update = self.update(underlying, spot, timestamp)
+            if update is not None:
+                yield update
+
+    async def astream(self, ticks, max_pending=1024, executor=None):
+        """Yields a PriceUpdate for the latest tick of every underlying (async generator).
+
+        Parameters
+        ==========
+        ticks: async iterable
+            (timestamp, underlying, spot) or (timestamp, spot) ticks
+        max_pending: int
+            maximum number of underlyings waiting for repricing, reading of ticks
+            on further underlyings is suspended until one is repriced
+        executor: concurrent.futures.Executor
+            executor repricing runs in, so the event loop keeps reading ticks
+            (repricing runs in the event loop if None)
+        """
+        loop = asyncio.get_running_loop()
+        pending = {}  # underlying -> (timestamp, spot) of its latest tick
+        ready, space = asyncio.Event(), asyncio.Event()
+
+        async def read_ticks():
+            async for tick in ticks:
+                timestamp, underlying, spot = self._parse_tick(tick)
+                while underlying not in pending and len(pending) >= max_pending:
+                    space.clear()
+                    await space.wait()
+                if underlying in pending:
+                    self.conflated += 1
+                    del pending[underlying]  # latest tick queues behind the other underlyings
+                pending[underlying] = (timestamp, spot)
+                ready.set()
+
+        reader = asyncio.ensure_future(read_ticks())
+        try:
+            while True:
+                if not pending:
+                    if reader.done():
+                        reader.result()  # re-raises errors of the tick stream
+                        return
+                    ready.clear()
+                    waiter = asyncio.ensure_future(ready.wait())
+                    await asyncio.wait((reader, waiter), return_when=asyncio.FIRST_COMPLETED)
+                    waiter.cancel()
+                    continue
+                underlying = next(iter(pending))
+                timestamp, spot = pending.pop(underlying)
+                space.set()
+                if executor is None:
+                    update = self.update(underlying, spot, timestamp)
+                else:
+                    update = await loop.run_in_executor(executor, self.update, underlying, spot, timestamp)
+                if update is not None:
+                    yield update
+                await asyncio.sleep(0)  # lets the reader take the ticks which arrived meanwhile
+        finally:
+            reader.cancel()
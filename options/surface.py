@@ -0,0 +1,309 @@
+import json
+import os
+
+import numpy as np
+
+from .implied_vol import implied_volatility
+from .models import registry
+from .models.base import OPTION_TYPE
+
+
+METHODS = {'linear': 1, 'cubic': 3}
+ARRAYS = ('price', 'price_error', 'iv', 'iv_error')
+
+
+def _denominators(grid, order):
+    """Denominators prod(x_j - x_m, m != j) of the Lagrange weights of every stencil of the grid."""
+    nodes = grid[np.arange(len(grid) - order)[:, None] + np.arange(order + 1)]
+    differences = nodes[:, :, None] - nodes[:, None, :]
+    differences[:, np.eye(order + 1, dtype=bool)] = 1.
+    return differences.prod(axis=2)
+
+
+def _stencil(grid, denominators, x, order):
+    """Cell of every x on the grid, first node of its interpolation stencil and Lagrange weights of the stencil."""
+    n = len(grid)
+    cell = np.minimum(np.maximum(np.searchsorted(grid, x, 'right') - 1, 0), n - 2)
+    first = np.minimum(np.maximum(cell - (order - 1) // 2, 0), n - order - 1)
+    diff = x[:, None] - grid[first[:, None] + np.arange(order + 1)]
+    # numerator of weight j is the product of (x - x_m) over m != j: products left and right of j
+    ones = np.ones((len(x), 1))
+    left = np.cumprod(np.hstack((ones, diff[:, :-1])), axis=1)
+    right = np.cumprod(np.hstack((ones, diff[:, :0:-1])), axis=1)[:, ::-1]
+    return cell, first, left * right / denominators[first]
+
+
+def _first(n, order):
+    """First node of the interpolation stencil of every grid cell."""
+    return np.clip(np.arange(n - 1) - (order - 1) // 2, 0, n - order - 1)
+
+
+def _divided_differences(grid, values, order, axis):
+    """Divided differences of the given order along axis."""
+    d = np.moveaxis(values, axis, -1)
+    for m in range(1, order + 1):
+        d = np.diff(d, axis=-1) / (grid[m:] - grid[:-m])
+    return np.moveaxis(d, -1, axis)
+
+
+def _neighbour_max(values, index, shifts, axis):
+    """Maximum of |values| at index + shift (clipped to the array) over the shifts, along axis."""
+    n = values.shape[axis]
+    return np.max([np.take(np.abs(values), np.clip(index + shift, 0, n - 1), axis=axis) for shift in shifts], axis=0)  # noqa
+
+
+def _stencil_max(values, order, axis):
+    """Maximum of the nodes of the interpolation stencil of every cell along axis."""
+    first = _first(values.shape[axis], order)
+    return _neighbour_max(values, first, range(order + 1), axis)
+
+
+def _cell_polynomials(grid, order, samples=17):
+    """
+    Largest node polynomial |prod(x - x_m)| and Lebesgue function sum(|l_j(x)|) of the
+    interpolation stencil over every grid cell.
+    """
+    first = _first(len(grid), order)
+    x = grid[:-1, None] + np.linspace(0., 1., samples) * np.diff(grid)[:, None]
+    nodes = grid[first[:, None] + np.arange(order + 1)]
+    diff = x[:, :, None] - nodes[:, None, :]
+    node_polynomial = np.abs(np.prod(diff, axis=2))
+    basis = np.ones_like(diff)
+    for j in range(order + 1):
+        for m in range(order + 1):
+            if m != j:
+                basis[:, :, j] *= diff[:, :, m] / (nodes[:, j] - nodes[:, m])[:, None]
+    return node_polynomial.max(axis=1), np.abs(basis).sum(axis=2).max(axis=1)
+
+
+def _interpolation_error(grid, values, order, axis):
+    """
+    Error bound of interpolation along axis in every grid cell: next term of the Newton form,
+    i.e. divided difference of order + 1 times the largest node polynomial in the cell.
+    The divided difference is taken on the stencil extended by its left or right neighbour,
+    the change to the divided difference at the query point is bounded by the divided
+    difference of order + 2 times the width of the extended stencil (stencil-extension term).
+
+    Returns
+    =======
+    error: ndarray
+        values shape with n - 1 cells instead of n nodes along axis
+    """
+    n = len(grid)
+    first = _first(n, order)
+    dd = _neighbour_max(_divided_differences(grid, values, order + 1, axis), first, (-1, 0), axis)
+    extension = _neighbour_max(_divided_differences(grid, values, order + 2, axis), first, (-2, -1, 0), axis)
+    width = grid[np.minimum(first + order + 1, n - 1)] - grid[np.maximum(first - 1, 0)]
+    w = _cell_polynomials(grid, order)[0]
+    shape = [1] * values.ndim
+    shape[axis] = n - 1
+    return (dd + extension * width.reshape(shape)) * w.reshape(shape)
+
+
+def _tensor_error(T, k, values, order, node_error=None):
+    """
+    Error bound of the tensor product interpolation in every (maturity x log-moneyness) cell.
+
+    With interpolation operators P_T, P_k the error f - P_T P_k f = (f - P_T f) + P_T (f - P_k f)
+    is bounded by the error along k at the stencil rows times the Lebesgue constant of P_T,
+    the error along T at the stencil columns times the Lebesgue constant of P_k (the columns
+    interpolate the T error to the query) and the cross-axis term: mixed divided difference
+    times both node polynomials. Errors of the node values are amplified by both Lebesgue constants.
+    """
+    w_T, lebesgue_T = _cell_polynomials(T, order)
+    w_k, lebesgue_k = _cell_polynomials(k, order)
+    first_T, first_k = _first(len(T), order), _first(len(k), order)
+    mixed = _divided_differences(T, _divided_differences(k, values, order + 1, 1), order + 1, 0)
+    mixed = _neighbour_max(_neighbour_max(mixed, first_T, (-1, 0), 0), first_k, (-1, 0), 1)
+    error = lebesgue_T[:, None] * _stencil_max(_interpolation_error(k, values, order, 1), order, 0) \
+        + lebesgue_k[None, :] * _stencil_max(_interpolation_error(T, values, order, 0), order, 1) \
+        + mixed * w_T[:, None] * w_k[None, :]
+    if node_error is not None:
+        error += lebesgue_T[:, None] * lebesgue_k[None, :] * _stencil_max(_stencil_max(np.abs(node_error), order, 0), order, 1)  # noqa
+    return error
+
+
+class PriceSurface:
+    """Call price and implied volatility surface over log-moneyness and maturity.
+
+    Call prices of one parameter set are homogeneous in the spot, C(S, K, T) = S * c(log(K / S), T),
+    so the model prices the surface c once on a dense (maturity x log-moneyness) grid, one
+    strike chain per maturity (a single transform for the FFT models). Queries are answered
+    by tensor product Lagrange interpolation of the grid ('linear' or 'cubic', 2 or 4 nodes
+    per axis) and put prices by Put-Call parity. Implied volatilities of the grid prices
+    are interpolated the same way.
+
+    Error bound of a query is the numerical error of the model at the stencil nodes
+    (price_chain error estimate, amplified by the Lebesgue constants of the interpolation)
+    plus the interpolation error bounded per grid cell from the divided differences of the
+    grid values: error along each axis with its stencil-extension term and the cross-axis
+    term of the tensor product (see _tensor_error). The bound holds as far as the divided
+    differences resolve the derivatives of the surface and the model's error estimate holds
+    (COS models report no truncation error).
+
+    Surface is valid for the parameters it was built with: set_parameters() with different
+    values invalidates it, and the grid is priced again on the next query. save() writes the
+    grid values as .npy files, load() memory-maps them, so processes sharing a surface
+    share its pages.
+    """
+
+    def __init__(self, model, r, sigma, *params, log_moneyness=None, maturities=None, method='cubic'):
+        """
+        Parameters
+        ==========
+        model: str
+            name of the registered pricing model
+        r: float
+            constant risk-free short rate
+        sigma: float
+            volatility factor in diffusion term
+        params:
+            additional model parameters (e.g. lamb, mu, delta for Merton model)
+        log_moneyness: array_like
+            increasing grid of log(K / S) (defaults to 201 nodes in [-1, 1])
+        maturities: array_like
+            increasing grid of times-to-maturity (defaults to 64 nodes from one week to 5 years)
+        method: str
+            'linear' or 'cubic' interpolation
+        """
+        if method not in METHODS:
+            raise ValueError(f"Wrong interpolation method {method!r}, use 'linear' or 'cubic'")
+        registry.get(model)
+        self.model = model
+        self.method = method
+        self.log_moneyness = np.asarray(np.linspace(-1., 1., 201) if log_moneyness is None else log_moneyness, dtype=float)  # noqa
+        self.maturities = np.asarray(np.geomspace(1. / 52, 5., 64) if maturities is None else maturities, dtype=float)  # noqa
+        for grid in (self.log_moneyness, self.maturities):
+            if grid.ndim != 1 or len(grid) < METHODS[method] + 3 or np.any(np.diff(grid) <= 0):
+                raise ValueError(f"Surface grid must be increasing with at least {METHODS[method] + 3} nodes")
+        self.parameters = (float(r), float(sigma), *(float(p) for p in params))
+        self._denominators = tuple(_denominators(grid, METHODS[method]) for grid in (self.maturities, self.log_moneyness))  # noqa
+        self._arrays = None
+
+    def set_parameters(self, r, sigma, *params):
+        """Sets model parameters, the surface is priced again on the next query if they changed."""
+        parameters = (float(r), float(sigma), *(float(p) for p in params))
+        if parameters != self.parameters:
+            self.parameters = parameters
+            self._arrays = None
+
+    @property
+    def is_built(self):
+        """True if the grid values of the current parameters are available."""
+        return self._arrays is not None
+
+    def build(self):
+        """Prices the grid with the current parameters."""
+        model = registry.get(self.model)
+        r, sigma, *params = self.parameters
+        k, T = self.log_moneyness, self.maturities
+        price, model_error = np.empty((len(T), len(k))), np.empty((len(T), len(k)))
+        for i, t in enumerate(T):
+            price[i], model_error[i] = model.price_chain('call', 1., np.exp(k), t, r, sigma, *params, return_error=True)  # noqa
+        iv = implied_volatility(price, 1., np.exp(k), T[:, None], r)
+
+        order = METHODS[self.method]
+        price_error = _tensor_error(T, k, price, order, model_error)
+        iv_error = _tensor_error(T, k, iv, order)
+        self._arrays = dict(zip(ARRAYS, (price, price_error, iv, iv_error)))
+        return self
+
+    def _interpolate(self, name, k, T):
+        if self._arrays is None:
+            self.build()
+        k_grid, T_grid = self.log_moneyness, self.maturities
+        if np.any((k < k_grid[0]) | (k > k_grid[-1]) | (T < T_grid[0]) | (T > T_grid[-1])):
+            raise ValueError("Query is outside of the surface grid")
+        order = METHODS[self.method]
+        i, first_T, w_T = _stencil(T_grid, self._denominators[0], T, order)
+        j, first_k, w_k = _stencil(k_grid, self._denominators[1], k, order)
+        rows = first_T[:, None, None] + np.arange(order + 1)[:, None]
+        columns = first_k[:, None, None] + np.arange(order + 1)
+        values = np.einsum('qi,qij,qj->q', w_T, self._arrays[name][rows, columns], w_k)
+        return values, self._arrays[name + '_error'][i, j]
+
+    def price(self, option_type, S, K, T, return_error=False):
+        """Interpolates option prices from the surface, all parameters are broadcast against each other.
+
+        Parameters
+        ==========
+        option_type: str
+            'call' or 'put'
+        S: array_like
+            initial stock/index level
+        K: array_like
+            strike prices
+        T: array_like
+            time-to-maturity (for t=0), inside the maturity grid
+        return_error: bool
+            if True, bound of the absolute error is returned as well
+
+        Returns
+        =======
+        prices: ndarray
+            option present values
+        error: ndarray
+            bound of the absolute error of every price (only if return_error is True)
+        """
+        if option_type not in (OPTION_TYPE.CALL_OPTION.value, OPTION_TYPE.PUT_OPTION.value):
+            raise Exception("Wrong option type")
+        S, K, T = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T)))
+        c, error = self._interpolate('price', np.log(K / S).ravel(), T.ravel())
+        prices = S * c.reshape(S.shape)
+        if option_type == OPTION_TYPE.PUT_OPTION.value:
+            prices = registry.get(self.model)._put_from_call(prices, S, K, T, self.parameters[0])
+        if return_error:
+            return prices, S * error.reshape(S.shape)
+        return prices
+
+    def implied_vol(self, S, K, T, return_error=False):
+        """Interpolates BSM implied volatilities of the model prices from the surface.
+
+        Returns
+        =======
+        sigma: ndarray
+            implied volatilities (NaN where the grid prices have no implied volatility)
+        error: ndarray
+            interpolation error bound of every volatility (only if return_error is True)
+        """
+        S, K, T = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T)))
+        iv, error = self._interpolate('iv', np.log(K / S).ravel(), T.ravel())
+        if return_error:
+            return iv.reshape(S.shape), error.reshape(S.shape)
+        return iv.reshape(S.shape)
+
+    def save(self, directory):
+        """Writes grid values (priced first if needed) and configuration of the surface to directory.
+
+        Files are written aside and renamed into place, so readers never see partly written arrays.
+        """
+        if self._arrays is None:
+            self.build()
+        os.makedirs(directory, exist_ok=True)
+        arrays = {'log_moneyness': self.log_moneyness, 'maturities': self.maturities, **self._arrays}
+        for name, array in arrays.items():
+            path = os.path.join(directory, name + '.npy')
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(path + '.tmp', path)
+        meta = {'model': self.model, 'method': self.method, 'parameters': list(self.parameters)}
+        path = os.path.join(directory, 'meta.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """Loads surface written by save(), grid values are memory-mapped (read into memory if mmap_mode is None)."""
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode)
+                  for name in ('log_moneyness', 'maturities', *ARRAYS)}
+        surface = cls(meta['model'], *meta['parameters'], log_moneyness=arrays.pop('log_moneyness'),
+                      maturities=arrays.pop('maturities'), method=meta['method'])
+        surface._arrays = arrays
+        return surface
+
+    def __repr__(self):
+        return (f'PriceSurface({self.model!r}, {len(self.maturities)}x{len(self.log_moneyness)} {self.method}, '
+                f'parameters={self.parameters})')
@@ -1,10 +1,5 @@
-# Standard library imports
-import datetime
-
-# Third party imports
-import requests_cache
-import matplotlib.pyplot as plt
-from pandas_datareader import data as wb
+# Local imports
+from .market_data import shared_session
 
 
 class Ticker:
@@ -13,7 +8,7 @@ class Ticker:
     @staticmethod
     def get_historical_data(ticker, start_date=None, end_date=None, cache_data=True, cache_days=1):
         """
-        Fetches stock data from yahoo finance. Request is by default cashed in sqlite db for 1 day.
+        Fetches stock data from yahoo finance. Request is by default cashed in sqlite db for cache_days.
 
         Parameters
         ==========
@@ -24,13 +19,10 @@ class Ticker:
         cache_days: number of days data will stay in cache 
         """
         try:
-            # initializing sqlite for caching yahoo finance requests
-            expire_after = datetime.timedelta(days=1)
-            session = requests_cache.CachedSession(
-                cache_name='cache', backend='sqlite', expire_after=expire_after)
+            from pandas_datareader import data as wb
 
-            # Adding headers to session
-            session.headers = {'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:89.0) Gecko/20100101 Firefox/89.0', 'Accept': 'application/json;charset=utf-8'}  # noqa
+            # sqlite cached session, shared between calls with the same cache settings
+            session = shared_session(cache_days if cache_data else None)
 
             if start_date is not None and end_date is not None:
                 data = wb.DataReader(
@@ -86,6 +78,8 @@ class Ticker:
         try:
             if data is None:
                 return
+            import matplotlib.pyplot as plt
+
             data[column_name].plot()
             plt.ylabel(f'{column_name}')
             plt.xlabel('Date')
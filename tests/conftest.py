@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from options.models import option_model_factory
+
+
+def _make_contracts(n=300, seed=0, models=('BSM', 'MERTON', 'MERTON_COS')):
+    rng = np.random.default_rng(seed)
+    model = rng.choice(list(models), n)
+    merton = np.char.startswith(model, 'MERTON')
+    return {
+        'underlying': rng.choice(['AAPL', 'MSFT', 'SPY'], n),
+        'option_type': rng.choice(['call', 'put'], n),
+        'model': model,
+        'S': rng.choice([100., 250., 400.], n),
+        'K': rng.uniform(70., 130., n),
+        'T': rng.choice([0.25, 0.5, 1.], n),
+        'r': np.full(n, 0.05),
+        'sigma': rng.uniform(0.15, 0.3, n),
+        'lamb': np.where(merton, 1.0, np.nan),
+        'mu': np.where(merton, -0.2, np.nan),
+        'delta': np.where(merton, 0.1, np.nan),
+    }
+
+
+def _expected_prices(contracts):
+    prices = []
+    for i in range(len(contracts['K'])):
+        args = [contracts[name][i] for name in ('S', 'K', 'T', 'r', 'sigma')]
+        if not np.isnan(contracts['lamb'][i]):
+            args += [contracts[name][i] for name in ('lamb', 'mu', 'delta')]
+        prices.append(option_model_factory(contracts['model'][i]).price(contracts['option_type'][i], *args))
+    return np.array(prices)
+
+
+@pytest.fixture
+def make_contracts():
+    """Factory of random books (dict of columns) of calls and puts on three underlyings."""
+    return _make_contracts
+
+
+@pytest.fixture
+def expected_prices():
+    """Prices of a book of contracts priced one by one with the scalar price of their models."""
+    return _expected_prices
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from options import Option, OptionBook, PortfolioPricer
+from options.models import option_model_factory
+
+
+def test_book_prices_every_contract(make_contracts, expected_prices):
+    columns = make_contracts()
+    book = OptionBook.from_frame(columns)
+    assert len(book) == 300
+    assert np.array_equal(book['K'], columns['K'][book.index])
+    assert np.array_equal(book['model'], columns['model'][book.index])
+    assert np.allclose(book.price(), expected_prices(columns), rtol=0, atol=1e-8)
+
+    with PortfolioPricer(executor='serial') as pricer:
+        assert np.allclose(book.price(pricer), book.price(), rtol=0, atol=1e-10)
+
+
+def test_book_slices_are_views(make_contracts):
+    book = OptionBook.from_frame(make_contracts())
+    aapl = book.by_underlying('AAPL')
+    assert set(aapl['underlying']) == {'AAPL'}
+    assert np.shares_memory(aapl['K'], book['K'])
+    assert len(aapl) == np.sum(book['underlying'] == 'AAPL')
+
+    chain = book.by_underlying('SPY', T=0.5)
+    assert set(chain['T']) == {0.5} and np.shares_memory(chain['sigma'], book['sigma'])
+    assert len(book.by_underlying('QQQ')) == 0
+
+    expiry = book.by_expiry(1.)
+    assert set(expiry['T']) == {1.} and len(expiry) == np.sum(book['T'] == 1.)
+    assert sum(len(group) for _, group in book.groups()) == len(book)
+    for (underlying, T), group in book.groups():
+        assert set(group['underlying']) == {underlying} and set(group['T']) == {T}
+
+
+def test_book_broadcasts_columns():
+    K, T = np.broadcast_arrays(np.linspace(80., 120., 5), [[1.], [0.5]])
+    book = OptionBook(100., K, T, 0.05, 0.2, option_type='put', model='BSM')
+    assert len(book) == 10
+    # prices are returned in input order, though the book is sorted by maturity
+    expected = option_model_factory('BSM').price('put', 100., K.ravel(), T.ravel(), 0.05, 0.2)
+    assert np.allclose(book.price(), expected)
+    assert np.allclose(book.by_expiry(1.).price(), expected[:5])
+
+
+@pytest.mark.parametrize('option_type', ['PUT', 'P', 'cal'])
+def test_book_rejects_unknown_option_types(option_type):
+    with pytest.raises(Exception, match='Wrong option type'):
+        OptionBook(100., [90., 100.], 1., 0.05, 0.2, option_type=['call', option_type])
+    with pytest.raises(Exception, match='Wrong option type'):
+        OptionBook.from_columns({'K': [100.]}, {'option_type': [0]}, {'option_type': [option_type]})
+
+
+def test_book_from_csv(tmp_path, make_contracts):
+    pd = pytest.importorskip('pandas')
+    columns = make_contracts(50)
+    path = tmp_path / 'book.csv'
+    pd.DataFrame(columns).to_csv(path, index=False)
+
+    book = OptionBook.from_csv(path)
+    assert np.array_equal(book['underlying'], columns['underlying'][book.index])
+    assert np.allclose(book.price(), OptionBook.from_frame(columns).price())
+
+
+def test_book_from_parquet(tmp_path, make_contracts):
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('pyarrow')
+    columns = make_contracts(50)
+    path = tmp_path / 'book.parquet'
+    pd.DataFrame(columns).to_parquet(path)
+
+    book = OptionBook.from_parquet(path)
+    assert np.array_equal(book['model'], columns['model'][book.index])
+    assert np.allclose(book.price(), OptionBook.from_frame(columns).price())
+
+    empty = tmp_path / 'empty.parquet'
+    pd.DataFrame(columns).iloc[:0].to_parquet(empty)
+    assert len(OptionBook.from_parquet(empty)) == 0
+
+
+def test_option_has_no_instance_dict():
+    option = Option(100., 100., 1., 0.05, 0.2)
+    assert not hasattr(option, '__dict__')
+    with pytest.raises(AttributeError):
+        option.strike = 100.
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from options.calibration import MertonCalibrator
+from options.models import option_model_factory
+
+
+S = 100.00
+r = 0.05
+strikes = np.linspace(70., 140., 30)
+params = (0.18, 0.8, -0.25, 0.12)
+
+
+@pytest.mark.parametrize('model', ['MERTON_FT_QUAD', 'MERTON_COS', 'MERTON_FFT'])
+def test_calibration_recovers_parameters(model):
+    prices = option_model_factory('MERTON_FT_QUAD').price_chain('call', S, strikes, 0.5, r, *params)
+    result = MertonCalibrator(model).calibrate(prices, S, strikes, 0.5, r)
+    assert result['success']
+    assert np.allclose([result[name] for name in ('sigma', 'lamb', 'mu', 'delta')], params, atol=1e-4)
+    assert result['rmse'] < 1e-5
+
+
+def test_calibration_to_surface_of_calls_and_puts():
+    K, T = np.meshgrid(strikes, [0.25, 1.0])
+    option_type = np.where(K < S, 'put', 'call')
+    pricing_model = option_model_factory('MERTON_COS')
+    prices = np.where(option_type == 'put',
+                      pricing_model.price_batch('put', S, K, T, r, *params),
+                      pricing_model.price_batch('call', S, K, T, r, *params))
+    result = MertonCalibrator('MERTON_COS').calibrate(prices, S, K, T, r, option_type)
+    assert np.allclose([result[name] for name in ('sigma', 'lamb', 'mu', 'delta')], params, atol=1e-5)
+
+
+def test_zero_weight_quotes_count_in_rmse():
+    prices = option_model_factory('MERTON_FT_QUAD').price_chain('call', S, strikes, 0.5, r, *params)
+    prices[0] += 1.  # stale quote left out of the fit
+    weights = np.ones_like(prices)
+    weights[0] = 0.
+    result = MertonCalibrator().calibrate(prices, S, strikes, 0.5, r, weights=weights)
+    assert np.allclose([result[name] for name in ('sigma', 'lamb', 'mu', 'delta')], params, atol=1e-4)
+    assert result['rmse'] == pytest.approx(1. / np.sqrt(len(strikes)), rel=1e-3)
+
+
+def test_warm_start_from_previous_fit():
+    pricing_model = option_model_factory('MERTON_FT_QUAD')
+    calibrator = MertonCalibrator()
+    first = calibrator.calibrate(pricing_model.price_chain('call', S, strikes, 0.5, r, *params), S, strikes, 0.5, r)
+    moved = (0.185, 0.85, -0.24, 0.12)
+    second = calibrator.calibrate(pricing_model.price_chain('call', S, strikes, 0.5, r, *moved), S, strikes, 0.5, r)
+    assert second['nfev'] < first['nfev']
+    assert np.allclose(calibrator.params, moved, atol=1e-6)
+
+
+def test_calibration_requires_merton_model():
+    with pytest.raises(Exception):
+        MertonCalibrator('BSM_FFT')
@@ -0,0 +1,58 @@
+import numpy as np
+
+from options.models import BSM_FFT, MERTON_FT_QUAD, CharacteristicFunctionCache
+
+
+T = 1.
+r = 0.05
+sigma = 0.2
+lamb = 1.0
+mu = -0.2
+delta = 0.1
+
+
+def test_cache_reused_when_only_spot_changes():
+    model = MERTON_FT_QUAD()
+    model.cf_cache = CharacteristicFunctionCache()
+
+    first = model.price('call', 100., 105., T, r, sigma, lamb, mu, delta)
+    model.price('call', 101., 105., T, r, sigma, lamb, mu, delta)
+    model.price('call', 99., 95., T, r, sigma, lamb, mu, delta)
+    assert model.cf_cache.misses == 1
+    assert model.cf_cache.hits == 2
+
+    model.price('call', 100., 105., T, r, 0.25, lamb, mu, delta)
+    assert model.cf_cache.misses == 2
+
+    uncached = MERTON_FT_QUAD()
+    uncached.cf_cache = None
+    assert uncached.price('call', 100., 105., T, r, sigma, lamb, mu, delta) == first
+
+
+def test_cache_keeps_itm_and_otm_transforms_apart():
+    model = BSM_FFT(damping='branch')
+    model.cf_cache = CharacteristicFunctionCache()
+    itm = model.price('call', 100., 90., T, r, sigma)
+    otm = model.price('call', 100., 120., T, r, sigma)
+    assert model.cf_cache.misses == 2
+    assert model.price('call', 100., 90., T, r, sigma) == itm
+    assert model.price('call', 100., 120., T, r, sigma) == otm
+    assert model.cf_cache.hits == 2
+
+
+def test_lru_eviction_and_memory_cap():
+    cache = CharacteristicFunctionCache(max_entries=2, max_bytes=1000)
+    cache.get('a', lambda: np.zeros(10))
+    cache.get('b', lambda: np.zeros(10))
+    cache.get('a', lambda: np.zeros(10))
+    cache.get('c', lambda: np.zeros(10))
+    assert len(cache) == 2
+    assert cache.get('a', lambda: None) is not None  # 'b' was least recently used
+
+    cache.get('big', lambda: np.zeros(200))  # larger than the memory cap, not stored
+    assert cache.info()['entries'] == 2
+    assert cache.nbytes <= cache.max_bytes
+
+    cache.get('d', lambda: np.zeros(120))
+    assert cache.nbytes <= cache.max_bytes
+    assert len(cache) == 1
@@ -0,0 +1,41 @@
+import numpy as np
+
+from options import Option
+from options.models import option_model_factory, BSM_COS
+
+
+S = 100.00
+T = 1.
+r = 0.05
+sigma = 0.2
+lamb = 1.0
+mu = -0.2
+delta = 0.1
+strikes = np.linspace(50., 200., 151)
+
+
+def test_bsm_cos_accuracy():
+    bsm = option_model_factory('BSM')
+    bsm_cos = option_model_factory('BSM_COS')
+    for T_ in (0.02, 0.5, 5.):
+        for option_type in ('call', 'put'):
+            prices = bsm_cos.price_chain(option_type, S, strikes, T_, r, sigma)
+            assert np.allclose(prices, bsm.price(option_type, S, strikes, T_, r, sigma), rtol=0, atol=1e-10)
+
+
+def test_merton_cos_matches_quadrature():
+    merton_cos = option_model_factory('MERTON_COS')
+    merton_quad = option_model_factory('MERTON_FT_QUAD')
+    prices = merton_cos.price_chain('call', S, strikes, T, r, sigma, lamb, mu, delta)
+    expected = merton_quad.price_chain('call', S, strikes, T, r, sigma, lamb, mu, delta)
+    assert np.allclose(prices, expected, rtol=0, atol=1e-8)
+
+
+def test_cos_scalar_pricing():
+    option = Option(S, 105., T, r, sigma)
+    assert abs(option.price('call', 'BSM_COS') - option.price('call', 'BSM')) < 1e-10
+    assert abs(option.price('put', 'MERTON_COS', lamb, mu, delta)
+               - option.price('put', 'MERTON_FT_QUAD', lamb, mu, delta)) < 1e-8
+
+    coarse = BSM_COS(n_terms=32)
+    assert abs(coarse.price('call', S, 105., T, r, sigma) - option.price('call', 'BSM')) < 1e-3
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from options.models import BSM, BSM_FFT, MERTON, MERTON_FFT, registry
+
+
+S = 100.
+r = 0.05
+strikes = np.array([80., 95., 100., 105., 120.])
+
+
+@pytest.mark.parametrize('T, sigma', [(0.02, 0.1), (1., 0.2), (5., 0.5)])
+@pytest.mark.parametrize('tol', [1e-6, 1e-10])
+def test_error_targeted_grid_meets_tolerance(T, sigma, tol):
+    model = BSM_FFT(tol=tol)
+    expected = BSM().price('call', S, strikes, T, r, sigma)
+    single = np.array([model.price('call', S, K, T, r, sigma) for K in strikes])
+    chain, error = model.price_chain('call', S, strikes, T, r, sigma, return_error=True)
+    assert np.abs(single - expected).max() < tol * S
+    assert np.abs(chain - expected).max() < tol * S
+    assert np.abs(chain - expected).max() <= 2 * error.max()
+
+
+def test_grid_follows_maturity_and_tolerance():
+    model = BSM_FFT(tol=1e-8)
+    short = model.fft_parameters(S, 100., 0.02, r, 0.1)
+    long = model.fft_parameters(S, 100., 2., r, 0.3)
+    assert short['N'] > long['N']
+    assert short['error'] <= 1e-8 * S
+    assert set(short) == {'N', 'eta', 'alpha', 'eps', 'error'}
+    assert BSM_FFT(tol=1e-4).fft_parameters(S, 100., 0.02, r, 0.1)['N'] < short['N']
+    with pytest.raises(Exception):
+        BSM_FFT().fft_parameters(S, 100., 1., r, 0.2)
+
+
+def test_error_targeted_merton_chain():
+    jumps = (1., -0.2, 0.1)
+    K = np.linspace(80., 120., 41)
+    expected = MERTON(tol=1e-16).price_chain('call', S, K, 0.05, r, 0.1, *jumps)
+    model = registry.get('MERTON_FFT_ADAPTIVE')
+    assert isinstance(model, MERTON_FFT) and model.tol == 1e-8
+    assert np.allclose(model.price_chain('call', S, K, 0.05, r, 0.1, *jumps), expected, rtol=0, atol=1e-6)
+    greeks = model.price_and_greeks('call', S, K, 0.05, r, 0.1, *jumps)
+    assert np.allclose(greeks['price'], expected, rtol=0, atol=1e-6)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from options.models import BSM, BSM_FFT, MERTON, MERTON_FFT, CharacteristicFunctionCache
+
+
+S = 100.
+r = 0.05
+strikes = np.linspace(60., 160., 101)
+
+
+def test_chain_is_priced_with_one_transform():
+    model = BSM_FFT()
+    model.cf_cache = CharacteristicFunctionCache()
+    model.price_chain('call', S, strikes, 0.5, r, 0.2)
+    assert model.cf_cache.misses == 1
+
+    branch = BSM_FFT(damping='branch')
+    branch.cf_cache = CharacteristicFunctionCache()
+    branch.price_chain('call', S, strikes, 0.5, r, 0.2)
+    assert branch.cf_cache.misses == 2
+
+
+@pytest.mark.parametrize('T, sigma', [(0.02, 0.2), (0.25, 0.1), (1., 0.2), (3., 0.5)])
+def test_optimal_damping_is_more_accurate_than_branch(T, sigma):
+    expected = BSM().price('call', S, strikes, T, r, sigma)
+    optimal = np.abs(BSM_FFT().price_chain('call', S, strikes, T, r, sigma) - expected).max()
+    branch = np.abs(BSM_FFT(damping='branch').price_chain('call', S, strikes, T, r, sigma) - expected).max()
+    assert optimal <= branch
+    assert abs(BSM_FFT().price('call', S, 140., T, r, sigma) - expected[80]) < 1e-7
+
+
+def test_merton_optimal_damping():
+    jumps = (1.0, -0.2, 0.1)
+    expected = MERTON(tol=1e-16).price_chain('call', S, strikes, 1., r, 0.2, *jumps)
+    assert np.allclose(MERTON_FFT().price_chain('call', S, strikes, 1., r, 0.2, *jumps), expected, rtol=0, atol=1e-8)
+
+
+def test_damping_factor_follows_maturity_and_aliasing_bound():
+    model = BSM_FFT()
+    k_min = np.log(60. / S)
+    short = model._optimal_damping_plan(k_min, 0.02, r, 0.2, ())
+    long = model._optimal_damping_plan(k_min, 1., r, 0.5, ())
+    assert short.alpha > long.alpha
+    assert np.exp(-long.alpha * np.pi / long.eta) < model.aliasing_tol
+    assert (short.N, short.eta) == (model.itm_plan.N, model.itm_plan.eta)
+
+
+@pytest.mark.parametrize('T, sigma', [(5., 0.8), (10., 0.8)])
+def test_error_covers_damping_without_aliasing_tol(T, sigma):
+    # no damping factor meets aliasing_tol, the error bound of the fallback alpha is reported
+    prices, error = BSM_FFT().price_chain('call', S, strikes, T, r, sigma, return_error=True)
+    assert np.all(np.abs(prices - BSM().price('call', S, strikes, T, r, sigma)) <= error)
+    assert error.min() > 1e-4
+
+
+def test_wrong_damping_scheme():
+    with pytest.raises(ValueError):
+        BSM_FFT(damping='fixed')
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from options.models import BSM, BSM_FFT, MERTON_FFT, FFTPlan
+
+
+S = 100.00
+T = 1.
+r = 0.05
+sigma = 0.2
+
+
+def test_models_share_plans():
+    first, second = MERTON_FFT(), MERTON_FFT()
+    assert first.itm_plan is second.itm_plan
+    assert first.otm_plan is second.otm_plan
+    assert first.itm_plan.N == 8192
+    assert first.itm_plan.eps == pytest.approx(MERTON_FFT.eps)
+    assert FFTPlan.get(4096, 0.25, 1.5) is FFTPlan.get(4096, 0.25, 1.5)
+
+
+def test_plan_arrays_are_read_only():
+    plan = FFTPlan(1024, 0.25, 1.5)
+    with pytest.raises(ValueError):
+        plan.phase_weights[0] = 0
+
+
+def test_model_accepts_custom_plan():
+    plan = FFTPlan(2048, 0.25, 1.5)
+    model = BSM_FFT(itm_plan=plan)
+    strikes = np.array([80., 100., 120.])
+    prices = model.price_chain('call', S, strikes, T, r, sigma)
+    assert np.allclose(prices, BSM().price('call', S, strikes, T, r, sigma), atol=1e-3)
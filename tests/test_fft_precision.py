@@ -0,0 +1,80 @@
+import threading
+
+import numpy as np
+import pytest
+
+from options import PriceSurface
+from options.models import BSM, BSM_FFT, MERTON, MERTON_FFT, registry
+from options.models.cache import CharacteristicFunctionCache
+from options.models.fourier import _work_buffers
+
+
+S = 100.
+r = 0.05
+strikes = S * np.exp(np.linspace(-1., 1., 41))
+jumps = (1., -0.2, 0.3)
+
+
+# branch transform fails for long high volatility maturities in double precision too
+@pytest.mark.parametrize('damping, T, sigma', [('optimal', 0.02, 0.1), ('optimal', 1., 0.2), ('optimal', 5., 0.8),
+                                               ('branch', 0.02, 0.1), ('branch', 1., 0.2), ('branch', 5., 0.2)])
+def test_single_precision_within_envelope(damping, T, sigma):
+    for model_class, params in ((BSM_FFT, ()), (MERTON_FFT, jumps)):
+        double = model_class(damping=damping)
+        single = model_class(damping=damping, precision='single')
+        expected, expected_error = double.price_chain('call', S, strikes, T, r, sigma, *params, return_error=True)
+        chain, error = single.price_chain('call', S, strikes, T, r, sigma, *params, return_error=True)
+        assert chain.dtype == np.float64
+        assert np.abs(chain - expected).max() < 1e-6 * S
+        assert np.all(np.abs(chain - expected) <= error + expected_error)
+
+
+def test_single_precision_prices_against_closed_form():
+    model = registry.get('MERTON_FFT_SINGLE')
+    assert isinstance(model, MERTON_FFT) and model.precision == 'single'
+    expected = MERTON(tol=1e-16).price_chain('call', S, strikes, 1., r, 0.2, *jumps)
+    assert np.allclose(model.price_chain('call', S, strikes, 1., r, 0.2, *jumps), expected, rtol=0, atol=1e-4)
+    puts = registry.get('BSM_FFT_SINGLE').price_chain('put', S, strikes, 0.5, r, 0.3)
+    assert np.allclose(puts, BSM().price('put', S, strikes, 0.5, r, 0.3), rtol=0, atol=1e-4)
+
+
+def test_error_targeted_single_precision():
+    model = BSM_FFT(tol=1e-5, precision='single')
+    expected = BSM().price('call', S, strikes, 0.25, r, 0.2)
+    assert np.abs(model.price_chain('call', S, strikes, 0.25, r, 0.2) - expected).max() < 1e-5 * S
+    with pytest.raises(ValueError):
+        BSM_FFT(tol=1e-8, precision='single')
+    with pytest.raises(ValueError):
+        BSM_FFT(precision='half')
+
+
+def test_single_precision_reuses_work_buffers():
+    model = MERTON_FFT(precision='single')
+    plan = model.itm_plan
+    _, first, rounding = model._fft_call_value_grid(1., r, 0.2, jumps, False, plan)
+    _, second, _ = model._fft_call_value_grid(2., r, 0.2, jumps, False, plan)
+    assert first.dtype == np.float32 and rounding > 0
+    assert np.shares_memory(first, second) and np.shares_memory(second, _work_buffers(plan.N)[1])
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(_work_buffers(plan.N)))
+    thread.start()
+    thread.join()
+    assert not np.shares_memory(other[0][1], second)
+
+
+def test_single_precision_cache_holds_complex64():
+    double, single = BSM_FFT(), BSM_FFT(precision='single')
+    for model in (double, single):
+        model.cf_cache = CharacteristicFunctionCache()
+        model.price_chain('call', S, strikes, 1., r, 0.2)
+    assert single.cf_cache.nbytes * 2 == double.cf_cache.nbytes
+    assert single.itm_plan.single('itm_damping').dtype == np.float32
+    assert single.itm_plan.single('phase_weights').dtype == np.complex64
+
+
+def test_single_precision_surface():
+    surface = PriceSurface('BSM_FFT_SINGLE', r, 0.2, maturities=np.linspace(0.25, 2., 8))
+    K = np.array([90., 100., 110.])
+    prices, error = surface.price('call', S, K, 1., return_error=True)
+    assert np.all(np.abs(prices - BSM().price('call', S, K, 1., r, 0.2)) <= error)
@@ -0,0 +1,50 @@
+import numpy as np
+
+from options.models import option_model_factory, FrFTPlan
+
+
+S = 100.00
+T = 1.
+r = 0.05
+sigma = 0.2
+lamb = 1.0
+mu = -0.2
+delta = 0.1
+strikes = np.linspace(60., 160., 101)
+
+
+def test_frft_matches_direct_sum():
+    plan = FrFTPlan(64, 0.3, 0.02, 1.5)
+    x = np.random.default_rng(0).normal(size=64) + 0j
+    j = np.arange(64)
+    expected = np.exp(-2j * np.pi * plan.gamma * np.outer(j, j)) @ x
+    assert np.allclose(plan.transform(x), expected)
+
+
+def test_bsm_frft_accuracy():
+    bsm = option_model_factory('BSM')
+    bsm_frft = option_model_factory('BSM_FRFT')
+    prices = bsm_frft.price_chain('call', S, strikes, T, r, sigma)
+    assert np.allclose(prices, bsm.price('call', S, strikes, T, r, sigma), atol=1e-6)
+    assert abs(bsm_frft.price('put', S, 95., T, r, sigma) - bsm.price('put', S, 95., T, r, sigma)) < 1e-6
+
+
+def test_merton_frft_matches_quadrature():
+    merton_frft = option_model_factory('MERTON_FRFT')
+    merton_quad = option_model_factory('MERTON_FT_QUAD')
+    prices = merton_frft.price_chain('call', S, strikes, T, r, sigma, lamb, mu, delta)
+    expected = merton_quad.price_chain('call', S, strikes, T, r, sigma, lamb, mu, delta)
+    assert np.allclose(prices, expected, atol=1e-6)
+
+
+def test_frft_prices_chains_wider_than_the_grid():
+    bsm = option_model_factory('BSM')
+    bsm_frft = option_model_factory('BSM_FRFT')
+    K = np.array([600., 20., 100., 300., 50.])
+    expected = bsm.price_batch('call', S, K, T, r, sigma)
+    assert np.allclose(bsm_frft.price_batch('call', S, K, T, r, sigma), expected, atol=1e-6)
+    assert np.allclose(bsm_frft.price_chain('call', S, K, T, r, sigma), expected, atol=1e-6)
+    greeks = bsm_frft.price_and_greeks('call', S, K, T, r, sigma)
+    expected_greeks = bsm.price_and_greeks('call', S, K, T, r, sigma)
+    for name in ('price', 'delta', 'gamma', 'vega'):
+        assert np.allclose(greeks[name], expected_greeks[name], atol=1e-5)
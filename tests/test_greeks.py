@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from options import Option
+from options.models import option_model_factory
+
+
+S = 100.00
+T = 0.5
+r = 0.05
+sigma = 0.2
+lamb = 1.0
+mu = -0.2
+delta = 0.1
+strikes = np.linspace(60., 160., 21)
+GREEKS = ('price', 'delta', 'gamma', 'vega', 'theta')
+
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_bsm_greeks_match_finite_differences(option_type):
+    pricing_model = option_model_factory('BSM')
+    greeks = pricing_model.price_and_greeks(option_type, S, strikes, T, r, sigma)
+    h = 1e-4
+
+    def price(S=S, T=T, sigma=sigma):
+        return pricing_model.price(option_type, S, strikes, T, r, sigma)
+
+    assert np.allclose(greeks['price'], price())
+    assert np.allclose(greeks['delta'], (price(S=S + h) - price(S=S - h)) / (2 * h), atol=1e-6)
+    assert np.allclose(greeks['gamma'], (price(S=S + 1e-2) - 2 * price() + price(S=S - 1e-2)) / 1e-4, atol=1e-5)
+    assert np.allclose(greeks['vega'], (price(sigma=sigma + h) - price(sigma=sigma - h)) / (2 * h), atol=1e-5)
+    assert np.allclose(greeks['theta'], -(price(T=T + h) - price(T=T - h)) / (2 * h), atol=1e-5)
+
+
+@pytest.mark.parametrize('model', ['BSM_FT_NUM', 'BSM_FT_QUAD', 'BSM_FFT', 'BSM_FRFT', 'BSM_COS'])
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_fourier_greeks_match_bsm(model, option_type):
+    expected = option_model_factory('BSM').price_and_greeks(option_type, S, strikes, T, r, sigma)
+    greeks = option_model_factory(model).price_and_greeks(option_type, S, strikes, T, r, sigma)
+    for name in GREEKS:
+        assert greeks[name].shape == strikes.shape
+        assert np.allclose(greeks[name], expected[name], rtol=0, atol=1e-5), name
+
+
+@pytest.mark.parametrize('model', ['MERTON_FT_QUAD', 'MERTON_FFT', 'MERTON_FRFT', 'MERTON_COS'])
+def test_merton_greeks_match_finite_differences(model):
+    pricing_model = option_model_factory(model)
+    reference = option_model_factory('MERTON_FT_NUM')
+    greeks = pricing_model.price_and_greeks('call', S, strikes, T, r, sigma, lamb, mu, delta)
+    h = 1e-3
+
+    def price(S=S, T=T, sigma=sigma):
+        return np.array([reference.price('call', S, K, T, r, sigma, lamb, mu, delta) for K in strikes])
+
+    assert np.allclose(greeks['price'], price(), atol=1e-5)
+    assert np.allclose(greeks['delta'], (price(S=S + h) - price(S=S - h)) / (2 * h), atol=1e-5)
+    assert np.allclose(greeks['vega'], (price(sigma=sigma + h) - price(sigma=sigma - h)) / (2 * h), atol=1e-4)
+    assert np.allclose(greeks['theta'], -(price(T=T + h) - price(T=T - h)) / (2 * h), atol=1e-4)
+
+
+def test_greeks_broadcast_over_contracts():
+    pricing_model = option_model_factory('MERTON_COS')
+    maturities = np.array([0.1, 0.5, 1.0])
+    greeks = pricing_model.price_and_greeks('put', S, strikes[:, None], maturities, r, sigma, lamb, mu, delta)
+    assert greeks['gamma'].shape == (len(strikes), len(maturities))
+    single = pricing_model.price_and_greeks('put', S, strikes, maturities[1], r, sigma, lamb, mu, delta)
+    for name in GREEKS:
+        assert np.allclose(greeks[name][:, 1], single[name])
+
+
+def test_option_price_and_greeks():
+    option = Option(S, 110., T, r, sigma)
+    greeks = option.price_and_greeks('call', 'MERTON_FFT', lamb, mu, delta)
+    assert greeks['price'] == pytest.approx(option.price('call', 'MERTON_FFT', lamb, mu, delta), abs=1e-4)
+    assert 0 < greeks['delta'] < 1 and greeks['gamma'] > 0 and greeks['vega'] > 0
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from options.implied_vol import implied_volatility, IV_STATUS
+from options.models import option_model_factory
+
+
+S = 100.00
+T = 0.5
+r = 0.05
+strikes = np.linspace(60., 160., 101)
+
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_implied_volatility_recovers_bsm_volatility(option_type):
+    rng = np.random.default_rng(0)
+    sigma = rng.uniform(0.05, 1.0, len(strikes))
+    maturities = rng.uniform(0.05, 3., len(strikes))
+    greeks = option_model_factory('BSM').price_and_greeks(option_type, S, strikes, maturities, r, sigma)
+    # volatility is only identified by quotes with time value
+    quoted = greeks['vega'] > 1e-3
+
+    implied, status = implied_volatility(greeks['price'], S, strikes, maturities, r, option_type, return_status=True)
+    assert np.all(status[quoted] == IV_STATUS.CONVERGED)
+    assert np.allclose(implied[quoted], sigma[quoted], rtol=0, atol=1e-8)
+
+
+def test_implied_volatility_of_merton_smile():
+    prices = option_model_factory('MERTON_COS').price_chain('call', S, strikes, T, r, 0.2, 1.0, -0.2, 0.1)
+    implied = implied_volatility(prices, S, strikes, T, r)
+    repriced = option_model_factory('BSM').price('call', S, strikes, T, r, implied)
+    assert np.allclose(repriced, prices, atol=1e-8)
+    # negative jumps produce a downward sloping skew
+    assert implied[0] > implied[50] > 0.2
+
+
+def test_implied_volatility_flags_arbitrage_violations():
+    prices = np.array([0.5, 10., 120., np.nan])
+    implied, status = implied_volatility(prices, S, np.array([50., 100., 100., 100.]), T, r, return_status=True)
+    assert list(status) == [IV_STATUS.OUT_OF_BOUNDS, IV_STATUS.CONVERGED, IV_STATUS.OUT_OF_BOUNDS, IV_STATUS.OUT_OF_BOUNDS]  # noqa
+    assert np.isnan(implied[[0, 2, 3]]).all()
+
+
+def test_implied_volatility_keeps_input_shape():
+    prices = option_model_factory('BSM').price('put', S, strikes.reshape(101, 1), np.array([0.25, 1.]), r, 0.3)
+    implied = implied_volatility(prices, S, strikes.reshape(101, 1), np.array([0.25, 1.]), r, 'put')
+    assert implied.shape == (101, 2)
+    assert np.allclose(implied, 0.3)
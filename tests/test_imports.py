@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import options
+from options.models import BSM, MERTON
+
+
+HEAVY_MODULES = ('matplotlib', 'pandas', 'pandas_datareader', 'requests_cache', 'scipy.stats',
+                 'scipy.integrate', 'scipy.optimize', 'numba')
+
+
+def loaded_modules(statement):
+    code = f'import json, sys\n{statement}\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))'
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+def test_pricing_core_doesnt_load_heavy_modules():
+    assert loaded_modules('import options') == []
+    statement = ("import options, numpy\n"
+                 "options.Option(100., 105., 1., 0.05, 0.2).price('call', 'BSM_FFT')\n"
+                 "options.price_batch('call', 'MERTON', 100., numpy.array([90., 110.]), 1., 0.05, 0.2, 1., -0.2, 0.1)\n"
+                 "options.implied_volatility(10., 100., 100., 1., 0.05)")
+    assert loaded_modules(statement) == []
+
+
+def test_lazy_attributes():
+    from options.market_data import MarketDataLoader
+    from options.streaming import StreamingPricer
+    from options.ticker import Ticker
+
+    assert options.Ticker is Ticker
+    assert options.MarketDataLoader is MarketDataLoader
+    assert options.StreamingPricer is StreamingPricer
+    assert {'Ticker', 'MarketDataLoader', 'StreamingPricer', 'Option'} <= set(dir(options))
+    with pytest.raises(AttributeError):
+        options.NotExisting
+
+
+def test_broken_numba_falls_back_to_numpy(tmp_path):
+    (tmp_path / 'numba').mkdir()
+    (tmp_path / 'numba' / '__init__.py').write_text("raise ImportError('Numba needs an older NumPy')\n")
+    code = ("import json, warnings\n"
+            "warnings.simplefilter('ignore')\n"
+            "from options.models import _jit, registry\n"
+            "prices = [registry.get(m).price('call', 100., 105., 1., 0.05, 0.2, *p) for m, p in\n"
+            "          (('BSM_FT_NUM', ()), ('MERTON_FT_NUM', (1., -0.2, 0.1)), ('MERTON_FFT', (1., -0.2, 0.1)))]\n"
+            "print(json.dumps([_jit.NUMBA_AVAILABLE, _jit.ENABLED, prices]))")
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join([str(tmp_path), os.getcwd()])}
+    env.pop('OPTIONS_DISABLE_JIT', None)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, env=env)
+    available, enabled, prices = json.loads(output.stdout)
+    assert available and not enabled
+    bsm = BSM().price('call', 100., 105., 1., 0.05, 0.2)
+    merton = MERTON().price('call', 100., 105., 1., 0.05, 0.2, 1., -0.2, 0.1)
+    assert np.allclose(prices, [bsm, merton, merton], rtol=0, atol=1e-6)
@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import numpy as np
+import pytest
+
+from options.models import instrumentation, registry, BSM_FFT
+from options.models.instrumentation import MetricsRegistry, PrometheusTextFile
+
+
+@pytest.fixture
+def metrics():
+    sink = instrumentation.enable()
+    yield sink
+    instrumentation.disable()
+
+
+def test_disabled_by_default():
+    assert instrumentation.sink is None
+    assert registry.get('BSM').price('call', 100., 100., 1., 0.05, 0.2) > 0
+
+
+def test_calls_latency_and_regimes(metrics):
+    model = registry.get('MERTON_FFT')
+    model.price('call', 100., 130., 0.02, 0.05, 0.2, 1., -0.2, 0.1)
+    model.price('put', 100., 130., 0.02, 0.05, 0.2, 1., -0.2, 0.1)
+    model.price_chain('call', 100., np.linspace(80., 120., 9), 0.5, 0.05, 0.2, 1., -0.2, 0.1)
+
+    assert metrics.counter('pricing_calls_total', model='MERTON_FFT') == 3
+    assert metrics.counter('pricing_contracts_total', model='MERTON_FFT', method='price_chain') == 9
+    assert metrics.histogram('pricing_latency_seconds', maturity='<1m', moneyness='deep_otm').count == 1
+    assert metrics.histogram('pricing_latency_seconds', maturity='<1m', moneyness='itm').count == 1
+    assert metrics.histogram('pricing_latency_seconds', maturity='<1y', moneyness='mixed').count == 1
+    rows = metrics.summary()
+    assert {row['maturity'] for row in rows} == {'<1m', '<1y'}
+    assert rows[0]['mean'] >= rows[-1]['mean']
+
+
+def test_fourier_internals(metrics):
+    registry.get('MERTON_FT_NUM').price('call', 100., 110., 0.05, 0.05, 0.2, 1., -0.2, 0.1)
+    registry.get('BSM_FT_NUM').price_and_greeks('call', 100., [90., 110.], 0.5, 0.05, 0.2)
+    private = registry.create('MERTON_FFT_ADAPTIVE')
+    private.cf_cache = None
+    private.price_chain('call', 100., [90., 110.], 0.5, 0.05, 0.2, 1., -0.2, 0.1)
+    registry.get('BSM_COS').price('call', 100., 110., 0.5, 0.05, 0.2)
+
+    assert metrics.histogram('quad_evaluations', model='MERTON_FT_NUM').sum >= 21
+    assert metrics.histogram('quad_evaluations', model='BSM_FT_NUM').count == 1
+    assert metrics.histogram('fft_size', model='MERTON_FFT', transform='fft').count >= 1  # created, not registered
+    assert metrics.histogram('grid_selection_seconds', model='MERTON_FFT').count >= 1
+    assert metrics.histogram('cf_evaluation_seconds', model='MERTON_FFT').count >= 1
+    assert metrics.histogram('fft_size', model='BSM_COS', transform='cos').sum == registry.get('BSM_COS').n_terms
+
+
+def test_prices_unchanged(metrics):
+    model = registry.get('MERTON_FT_NUM')
+    enabled = model.price('call', 100., 110., 0.5, 0.05, 0.2, 1., -0.2, 0.1)
+    instrumentation.disable()
+    assert model.price('call', 100., 110., 0.5, 0.05, 0.2, 1., -0.2, 0.1) == enabled
+
+
+def test_histogram_quantiles():
+    metrics = MetricsRegistry()
+    for value in (1e-5, 2e-5, 3e-5, 4e-3):
+        metrics.observe('pricing_latency_seconds', value, model='BSM')
+    histogram = metrics.histogram('pricing_latency_seconds')
+    assert histogram.count == 4 and histogram.sum == pytest.approx(4.06e-3)
+    assert 1e-5 <= histogram.quantile(0.5) <= 2.5e-5
+    assert histogram.cumulative()[-1] == (float('inf'), 4)
+
+
+def test_prometheus_text_file(tmp_path):
+    path = str(tmp_path / 'options.prom')
+    sink = instrumentation.enable(PrometheusTextFile(path, interval=None))
+    try:
+        registry.get('BSM').price('call', 100., 100., 1., 0.05, 0.2)
+        registry.get('BSM').price('call', 100., 100., 1., 0.05, 0.2)
+    finally:
+        assert instrumentation.disable() is sink
+    with open(path) as f:
+        text = f.read()
+    assert '# TYPE options_pricing_calls_total counter' in text
+    assert 'options_pricing_calls_total{method="price",model="BSM"} 2' in text
+    assert 'options_pricing_latency_seconds_bucket{maturity=">=1y",method="price",model="BSM",moneyness="atm",le="+Inf"} 2' in text  # noqa
+    assert 'options_pricing_latency_seconds_count{maturity=">=1y",method="price",model="BSM",moneyness="atm"} 2' in text  # noqa
+
+
+def test_prometheus_text_file_concurrent_flushes(tmp_path, caplog):
+    path = str(tmp_path / 'options.prom')
+    sink = instrumentation.enable(PrometheusTextFile(path, interval=0))
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            prices = list(pool.map(lambda i: registry.get('BSM').price('call', 100., 100., 1., 0.05, 0.2),
+                                   range(200)))
+    finally:
+        instrumentation.disable()
+    assert len(prices) == 200
+    sink.flush()
+    with open(path) as f:
+        assert 'options_pricing_calls_total{method="price",model="BSM"} 200' in f.read()
+    assert os.listdir(tmp_path) == ['options.prom']
+
+    # write errors of recording calls are logged, pricing goes on
+    instrumentation.enable(PrometheusTextFile(str(tmp_path / 'missing' / 'options.prom'), interval=0))
+    try:
+        assert registry.get('BSM').price('call', 100., 100., 1., 0.05, 0.2) == prices[0]
+        assert 'Writing metrics' in caplog.text
+    finally:
+        # explicit flushes raise
+        with pytest.raises(OSError):
+            instrumentation.disable()
+
+
+def test_model_name_of_private_instances():
+    assert instrumentation.model_name(registry.get('BSM_FFT_ADAPTIVE')) == 'BSM_FFT_ADAPTIVE'
+    assert instrumentation.model_name(BSM_FFT()) == 'BSM_FFT'
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from options.models import _jit, option_model_factory, registry
+
+
+pytest.importorskip('numba')
+
+S = 100.00
+T = 0.5
+r = 0.05
+sigma = 0.2
+lamb = 1.0
+mu = -0.2
+delta = 0.1
+strikes = np.array([80., 100., 120.])
+
+
+@pytest.fixture
+def numpy_backend():
+    enabled = _jit.ENABLED
+    _jit.ENABLED = False
+    yield
+    _jit.ENABLED = enabled
+
+
+def compiled_and_numpy(compute):
+    _jit.ENABLED = True
+    compiled = compute()
+    _jit.ENABLED = False
+    return compiled, compute()
+
+
+@pytest.mark.parametrize('model, params', [
+    ('BSM_FT_NUM', ()),
+    ('MERTON_FT_NUM', (lamb, mu, delta)),
+])
+def test_compiled_integrands_match_numpy(numpy_backend, model, params):
+    pricing_model = option_model_factory(model)
+    compiled, expected = compiled_and_numpy(
+        lambda: [pricing_model.price('call', S, K, T, r, sigma, *params) for K in strikes])
+    assert np.allclose(compiled, expected, rtol=0, atol=1e-10)
+
+
+@pytest.mark.parametrize('model, params', [
+    ('BSM_COS', ()),
+    ('MERTON_FFT', (lamb, mu, delta)),
+])
+def test_compiled_characteristic_functions_match_numpy(numpy_backend, model, params):
+    pricing_model = registry.create(model)
+    pricing_model.cf_cache = None
+    u = np.linspace(0., 100., 257) - 1.5j
+    compiled, expected = compiled_and_numpy(lambda: pricing_model._characteristic_function(u, T, r, sigma, *params))
+    assert np.allclose(compiled, expected, rtol=1e-12, atol=0)
+    compiled, expected = compiled_and_numpy(lambda: pricing_model.price_chain('call', S, strikes, T, r, sigma, *params))
+    assert np.allclose(compiled, expected, rtol=0, atol=1e-10)
@@ -0,0 +1,81 @@
+import asyncio
+import datetime
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from options import MarketDataLoader
+from options.market_data import LocalFileSource, MarketDataStore, shared_session
+
+
+dates = pd.bdate_range('2021-01-01', '2021-12-31', name='Date')
+history = pd.DataFrame({'Close': np.linspace(100., 120., len(dates)), 'Volume': 1e6}, index=dates)
+
+
+class RecordingSource:
+    """Serves the same history for every ticker and records the requested ranges."""
+
+    def __init__(self, delay=0.):
+        self.calls = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, start, end):
+        with self._lock:
+            self.calls.append((ticker, start, end))
+        time.sleep(self.delay)
+        if ticker == 'BROKEN':
+            raise Exception('no data')
+        return history.loc[start:end]
+
+
+def test_store_fetches_only_missing_ranges(tmp_path):
+    source = RecordingSource()
+    loader = MarketDataLoader(store=str(tmp_path), source=source)
+    first = loader.load('AAPL', '2021-03-01', '2021-03-31')
+    assert first.index[0] == pd.Timestamp('2021-03-01') and len(first) == 23
+
+    data = loader.load('AAPL', '2021-02-01', '2021-06-30')
+    assert data.equals(history.loc['2021-02-01':'2021-06-30'])
+    assert source.calls[1:] == [('AAPL', pd.Timestamp('2021-02-01'), pd.Timestamp('2021-02-28')),
+                                ('AAPL', pd.Timestamp('2021-04-01'), pd.Timestamp('2021-06-30'))]
+
+    loader.load('AAPL', '2021-03-06', '2021-03-07')  # weekend inside the stored range
+    assert len(source.calls) == 3
+    stored, covered = MarketDataStore(str(tmp_path)).read('AAPL')
+    assert covered == (pd.Timestamp('2021-02-01'), pd.Timestamp('2021-06-30'))
+    assert stored.equals(data)
+
+
+def test_load_many_is_concurrent(tmp_path):
+    source = RecordingSource(delay=0.05)
+    loader = MarketDataLoader(store=str(tmp_path), source=source, max_workers=20)
+    tickers = [f'T{i}' for i in range(40)] + ['BROKEN', 'T0']
+    start = time.perf_counter()
+    data = loader.load_many(tickers, '2021-01-01', '2021-01-31')
+    assert time.perf_counter() - start < 40 * 0.05 / 2
+    assert len(data) == 41 and data['BROKEN'] is None and 'BROKEN' in loader.errors
+    assert len(data['T39']) == 21
+
+    again = asyncio.run(loader.aload_many(['T0', 'T1'], '2021-01-01', '2021-01-31'))
+    assert again['T1'].equals(data['T1'])
+    assert len(source.calls) == 41
+
+
+def test_local_file_source(tmp_path):
+    history.to_csv(tmp_path / 'SPY.csv')
+    loader = MarketDataLoader(source=LocalFileSource(str(tmp_path)))
+    data = loader.load('SPY', '2021-06-01', '2021-06-30')
+    assert np.allclose(data['Close'], history.loc['2021-06-01':'2021-06-30', 'Close'])
+
+
+def test_shared_session_honours_cache_days(tmp_path):
+    name = str(tmp_path / 'cache')
+    session = shared_session(3, cache_name=name)
+    assert session is shared_session(3, cache_name=name)
+    assert session.settings.expire_after == datetime.timedelta(days=3)
+    assert shared_session(None, cache_name=name) is not session
+    assert not hasattr(shared_session(None, cache_name=name), 'settings')
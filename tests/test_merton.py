@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from options import Option
+from options.models import option_model_factory, MERTON, MERTON_FT_QUAD, QuadratureRule
+
+
+S = 100.00
+T = 0.5
+r = 0.05
+sigma = 0.2
+lamb = 1.0
+mu = -0.2
+delta = 0.1
+strikes = np.linspace(60., 160., 101)
+
+
+def test_merton_series_matches_fourier_pricing():
+    reference = MERTON_FT_QUAD(QuadratureRule.gauss_legendre(1024, 200.))
+    expected = reference.price_chain('call', S, strikes, T, r, sigma, lamb, mu, delta)
+    chain, error = option_model_factory('MERTON').price_chain('call', S, strikes, T, r, sigma, lamb, mu, delta,
+                                                              return_error=True)
+    assert np.allclose(chain, expected, rtol=0, atol=1e-8)
+    assert np.all(error < 1e-11)
+
+
+def test_merton_without_jumps_is_bsm():
+    prices = MERTON().price_batch('put', S, strikes, T, r, sigma, 0., mu, delta)
+    assert np.allclose(prices, option_model_factory('BSM').price('put', S, strikes, T, r, sigma))
+
+
+@pytest.mark.parametrize('tol', [1e-4, 1e-8, 1e-14])
+def test_merton_truncation_error_is_bounded(tol):
+    exact = MERTON(tol=1e-16).price_batch('call', S, strikes, T, r, sigma, 5., mu, delta)
+    truncated, error = MERTON(tol=tol).price_chain('call', S, strikes, T, r, sigma, 5., mu, delta, return_error=True)
+    assert np.all(np.abs(truncated - exact) <= error + 1e-12)
+    assert np.all(error <= tol * S)
+
+
+def test_merton_batch_over_contracts():
+    rng = np.random.default_rng(0)
+    maturities = rng.uniform(0.05, 3., 50)
+    jump_intensities = rng.uniform(0., 5., 50)
+    prices = MERTON().price_batch('call', S, strikes[:50], maturities, r, sigma, jump_intensities, mu, delta)
+    single = [Option(S, K, t, r, sigma).price('call', 'MERTON', l, mu, delta)
+              for K, t, l in zip(strikes[:50], maturities, jump_intensities)]
+    assert np.allclose(prices, single, rtol=0, atol=1e-12)
+
+
+def test_merton_scalar_price_and_expiry():
+    model = MERTON()
+    price = model.price('call', S, 100., T, r, sigma, lamb, mu, delta)
+    assert type(price) is float
+    assert price == pytest.approx(model.price_chain('call', S, np.array([100.]), T, r, sigma, lamb, mu, delta)[0])
+    with np.errstate(all='raise'):
+        assert model.price('call', S, 90., 0., r, sigma, lamb, mu, delta) == 10.
+        assert model.price('put', S, 110., 0., r, sigma, lamb, mu, delta) == pytest.approx(10.)
+        chain = model.price_chain('call', S, strikes, 0., r, sigma, lamb, mu, delta)
+    assert np.array_equal(chain, np.maximum(S - strikes, 0.))
@@ -0,0 +1,80 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from options.models import BSM, MERTON, BSM_MC, MERTON_MC, registry
+
+
+S, T, r, sigma = 100., 1., 0.05, 0.2
+jumps = (1., -0.2, 0.1)
+K = np.array([70., 90., 100., 110., 140.])
+
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_bsm_within_standard_errors(option_type):
+    result = BSM_MC(n_paths=2 ** 15).estimate(option_type, S, K, T, r, sigma)
+    reference = BSM().price_batch(option_type, S, K, T, r, sigma)
+    assert np.all(np.abs(result.price - reference) < 4 * result.std_error)
+    assert result.n_paths == 2 ** 15 and result.paths_per_second > 0
+
+
+def test_merton_cross_checks_fft():
+    prices, std_error = registry.get('MERTON_MC').price_chain('call', S, K, T, r, sigma, *jumps, return_error=True)
+    for reference in (MERTON().price_batch('call', S, K, T, r, sigma, *jumps),
+                      registry.get('MERTON_FFT').price_chain('call', S, K, T, r, sigma, *jumps)):
+        assert np.all(np.abs(prices - reference) < 4 * std_error)
+    assert np.all(std_error < 0.03)
+
+
+def test_variance_reduction():
+    plain = MERTON_MC(n_paths=2 ** 15, antithetic=False, control_variate=False)
+    errors = [plain.estimate('call', S, K, T, r, sigma, *jumps).std_error]
+    for model in (MERTON_MC(n_paths=2 ** 15, control_variate=False), MERTON_MC(n_paths=2 ** 15)):
+        errors.append(model.estimate('call', S, K, T, r, sigma, *jumps).std_error)
+    assert np.all(errors[1] < errors[0]) and np.all(errors[2] < errors[1])
+
+
+def test_reproducible_across_processes():
+    model = MERTON_MC(n_paths=2 ** 14, chunk_size=2 ** 12, seed=42)
+    expected = model.price_chain('call', S, K, T, r, sigma, *jumps)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(model.price_chain, ['call'] * 2, [S] * 2, [K] * 2, [T] * 2, [r] * 2, [sigma] * 2,
+                                *([p] * 2 for p in jumps)))
+    for prices in results:
+        np.testing.assert_array_equal(prices, expected)
+    assert not np.array_equal(MERTON_MC(n_paths=2 ** 14, chunk_size=2 ** 12, seed=7).price_chain(
+        'call', S, K, T, r, sigma, *jumps), expected)
+
+
+def test_estimate_does_not_depend_on_chunk_size():
+    expected = MERTON_MC(n_paths=10000, chunk_size=2 ** 12).estimate('call', S, K, T, r, sigma, *jumps)
+    for chunk_size in (2 ** 14, 1000):
+        result = MERTON_MC(n_paths=10000, chunk_size=chunk_size).estimate('call', S, K, T, r, sigma, *jumps)
+        assert np.allclose(result.price, expected.price, rtol=1e-12, atol=0)
+        assert np.allclose(result.std_error, expected.std_error, rtol=1e-9, atol=0)
+        assert result.n_paths == expected.n_paths == 3 * 2 ** 12
+
+
+def test_batch_groups_contracts_into_chains():
+    model = BSM_MC(n_paths=2 ** 14)
+    prices = model.price_batch('call', [100., 100., 110.], [95., 105., 105.], T, r, sigma)
+    np.testing.assert_array_equal(prices[:2], model.price_chain('call', 100., [95., 105.], T, r, sigma))
+    assert prices[2] == model.price('call', 110., 105., T, r, sigma)
+
+
+def test_path_dependent_payoff():
+    model = MERTON_MC(n_paths=2 ** 14)
+    european = model.estimate_payoff(lambda paths: np.maximum(paths[:, -1] - 100., 0.), S, T, r, sigma, *jumps,
+                                     n_steps=12)
+    reference = MERTON().price('call', S, 100., T, r, sigma, *jumps)
+    assert abs(european.price - reference) < 4 * european.std_error
+    asian = model.estimate_payoff(lambda paths: np.maximum(paths.mean(axis=1) - 100., 0.), S, T, r, sigma, *jumps,
+                                  n_steps=12)
+    assert asian.price < european.price
+    assert asian.n_paths == 2 ** 14
+
+
+def test_odd_chunk_size_with_antithetic_variates():
+    with pytest.raises(ValueError):
+        BSM_MC(chunk_size=1001)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from options.models import option_model_factory
+
+
+S = 100.00
+T = 0.5
+r = 0.05
+sigma = 0.2
+lamb = 1.0
+mu = -0.2
+delta = 0.1
+strikes = np.linspace(60., 160., 101)
+
+
+@pytest.mark.parametrize('model, params', [
+    ('BSM_FFT', ()),
+    ('MERTON_FFT', (lamb, mu, delta)),
+])
+def test_fft_chain_matches_single_strike_pricing(model, params):
+    pricing_model = option_model_factory(model)
+    chain, error = pricing_model.price_chain('call', S, strikes, T, r, sigma, *params, return_error=True)
+    single = np.array([pricing_model.price('call', S, K, T, r, sigma, *params) for K in strikes])
+
+    assert chain.shape == strikes.shape
+    assert np.all(error < 1e-6)
+    assert np.allclose(chain, single, atol=1e-3)
+
+
+def test_fft_chain_is_exact_on_grid_strikes():
+    pricing_model = option_model_factory('BSM_FFT')
+    grid_strikes = S * np.exp(pricing_model.eps * np.array([-15, 0, 27]))
+    chain = pricing_model.price_chain('call', S, grid_strikes, T, r, sigma)
+    single = [pricing_model.price('call', S, K, T, r, sigma) for K in grid_strikes]
+    assert np.allclose(chain, single, rtol=0, atol=1e-10)
+
+
+def test_chain_put_call_parity():
+    pricing_model = option_model_factory('MERTON_FFT')
+    calls = pricing_model.price_chain('call', S, strikes, T, r, sigma, lamb, mu, delta)
+    puts = pricing_model.price_chain('put', S, strikes, T, r, sigma, lamb, mu, delta)
+    assert np.allclose(calls - puts, S - np.exp(-r * T) * strikes)
+
+
+def test_default_chain_prices_every_strike():
+    pricing_model = option_model_factory('BSM')
+    chain, error = pricing_model.price_chain('call', S, strikes, T, r, sigma, return_error=True)
+    assert np.allclose(chain, pricing_model.price('call', S, strikes, T, r, sigma))
+    assert np.all(error == 0)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from options.models import BSM, BSM_FFT, registry
+from options.portfolio import PortfolioPricer
+
+
+MODELS = ('BSM', 'BSM_COS', 'MERTON_FFT', 'MERTON_FT_QUAD')
+
+
+@pytest.mark.parametrize('executor', ['serial', 'thread', 'process'])
+def test_portfolio_prices_in_input_order(executor, make_contracts, expected_prices):
+    book = make_contracts(400, models=MODELS)
+    with PortfolioPricer(max_workers=2, executor=executor) as pricer:
+        prices = pricer.price(book)
+    assert np.allclose(prices, expected_prices(book), atol=1e-3)
+
+
+def test_portfolio_results_do_not_depend_on_workers(make_contracts):
+    book = make_contracts(400, seed=1, models=MODELS)
+    serial = PortfolioPricer(executor='serial').price(book)
+    with PortfolioPricer(max_workers=3, executor='thread', tasks_per_worker=5) as pricer:
+        assert np.array_equal(pricer.price(book), serial)
+        assert np.array_equal(pricer.price(book), serial)
+
+
+@pytest.mark.parametrize('option_type', ['PUT', 'P', 'cal'])
+def test_portfolio_rejects_unknown_option_types(option_type, make_contracts):
+    book = make_contracts(20, models=MODELS)
+    book['option_type'][3] = option_type
+    with pytest.raises(Exception, match='Wrong option type'):
+        PortfolioPricer(executor='serial').price(book)
+
+
+def test_process_workers_price_models_registered_later(make_contracts):
+    book = make_contracts(40, models=MODELS)
+    late = dict(book, model=np.full(40, 'BSM_FFT_LATE'), option_type=np.full(40, 'call'), lamb=np.full(40, np.nan))
+    with PortfolioPricer(max_workers=2, executor='process') as pricer:
+        pricer.price(book)
+        registry.register('BSM_FFT_LATE', BSM_FFT, N=4096)
+        try:
+            expected = BSM().price('call', late['S'], late['K'], late['T'], late['r'], late['sigma'])
+            assert np.allclose(pricer.price(late), expected, atol=1e-3)
+            # replaced registration is picked up by the workers too
+            registry.register('BSM_FFT_LATE', BSM, replace=True)
+            assert np.allclose(pricer.price(late), expected, atol=1e-12)
+        finally:
+            registry.unregister('BSM_FFT_LATE')
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from options import price_batch
+from options.models import option_model_factory
+
+
+S = np.array([90., 100., 110.])
+K = np.array([[80.], [100.], [125.]])
+T = np.array([0.5, 1., 2.])
+r = 0.05
+sigma = 0.2
+lamb = 1.0
+mu = -0.2
+delta = 0.1
+
+
+@pytest.mark.parametrize('model, params', [
+    ('BSM', ()),
+    ('BSM_FFT', ()),
+    ('BSM_FT_NUM', ()),
+    ('MERTON_FFT', (lamb, mu, delta)),
+    ('MERTON_FT_NUM', (lamb, mu, delta)),
+])
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_batch_matches_scalar_pricing(model, params, option_type):
+    pricing_model = option_model_factory(model)
+    prices = pricing_model.price_batch(option_type, S, K, T, r, sigma, *params)
+    expected = np.array([[pricing_model.price(option_type, s, k, t, r, sigma, *params)
+                          for s, t in zip(S, T)] for k in K[:, 0]])
+
+    assert isinstance(prices, np.ndarray)
+    assert prices.shape == (3, 3)
+    assert np.allclose(prices, expected, atol=1e-4)
+
+
+def test_price_batch_function():
+    prices = price_batch('call', 'MERTON_FFT', 100., K[:, 0], 1., r, sigma, lamb, mu, delta)
+    assert prices.shape == (3,)
+
+    with pytest.raises(Exception):
+        price_batch('straddle', 'BSM', 100., K[:, 0], 1., r, sigma)
@@ -0,0 +1,40 @@
+import numpy as np
+
+from options import Option
+from options.models import option_model_factory, QuadratureRule, BSM_FT_QUAD
+
+
+S = 100.00
+T = 1.
+r = 0.05
+sigma = 0.2
+lamb = 1.0
+mu = -0.2
+delta = 0.1
+strikes = np.linspace(50., 200., 151)
+
+
+def test_bsm_quadrature_accuracy():
+    bsm = option_model_factory('BSM')
+    bsm_quad = option_model_factory('BSM_FT_QUAD')
+    for T_ in (0.25, 1., 5.):
+        prices = bsm_quad.price_chain('call', S, strikes, T_, r, sigma)
+        assert np.allclose(prices, bsm.price('call', S, strikes, T_, r, sigma), atol=1e-8)
+
+
+def test_merton_quadrature_matches_adaptive_quad():
+    merton_num = option_model_factory('MERTON_FT_NUM')
+    merton_quad = option_model_factory('MERTON_FT_QUAD')
+    prices = merton_quad.price_chain('put', S, strikes[::10], T, r, sigma, lamb, mu, delta)
+    expected = [merton_num.price('put', S, K, T, r, sigma, lamb, mu, delta) for K in strikes[::10]]
+    assert np.allclose(prices, expected, atol=1e-7)
+
+
+def test_quadrature_rule_is_configurable():
+    option = Option(S, 110., T, r, sigma)
+    bsm_call = option.price('call', 'BSM')
+    assert abs(option.price('call', 'BSM_FT_QUAD') - bsm_call) < 1e-8
+
+    laguerre = BSM_FT_QUAD(QuadratureRule.gauss_laguerre(64, 1.))
+    assert len(laguerre.quadrature_rule) == 64
+    assert abs(laguerre.price('call', S, 110., T, r, sigma) - bsm_call) < 1e-4
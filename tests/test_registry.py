@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from options import Option
+from options.models import option_model_factory, registry, ModelRegistry, BSM, BSM_FFT, MERTON_FT_NUM
+
+
+S = 100.00
+T = 0.5
+r = 0.05
+sigma = 0.2
+strikes = np.linspace(80., 120., 9)
+
+
+def test_factory_returns_shared_instances():
+    assert option_model_factory('MERTON_FFT') is option_model_factory('MERTON_FFT')
+    assert option_model_factory('BSM_COS') is registry.get('BSM_COS')
+    with pytest.raises(Exception):
+        option_model_factory('NotExistingModel')
+
+
+def test_register_tuned_variant():
+    registry.register('BSM_FFT_FINE', BSM_FFT, N=16384, itm_threshold=0.9, damping='branch')
+    try:
+        model = registry.get('BSM_FFT_FINE')
+        assert (model.N, model.itm_plan.N, model.itm_threshold) == (16384, 16384, 0.9)
+        assert option_model_factory('BSM_FFT').N == 4096
+
+        expected = BSM().price('call', S, 105., T, r, sigma)
+        fine = Option(S, 105., T, r, sigma).price('call', 'BSM_FFT_FINE')
+        default = Option(S, 105., T, r, sigma).price('call', 'BSM_FFT')
+        assert abs(fine - expected) < abs(default - expected)
+    finally:
+        registry.unregister('BSM_FFT_FINE')
+    assert 'BSM_FFT_FINE' not in registry
+
+
+def test_register_refuses_to_replace_silently():
+    models = ModelRegistry()
+    models.register('MERTON_FT_NUM', MERTON_FT_NUM)
+    with pytest.raises(Exception):
+        models.register('MERTON_FT_NUM', MERTON_FT_NUM, upper=100.)
+    replaced = models.register('MERTON_FT_NUM', MERTON_FT_NUM, replace=True, upper=100., limit=500)
+    assert models.get('MERTON_FT_NUM') is replaced
+    assert (replaced.upper, replaced.limit) == (100., 500)
+
+
+def test_create_returns_private_instance():
+    model = registry.create('BSM_FFT', itm_alpha=2.)
+    assert model is not registry.get('BSM_FFT')
+    assert model.itm_plan.alpha == 2.
+    assert registry.config('BSM_FFT') == {}
+
+
+def test_shared_instances_price_concurrently():
+    model = option_model_factory('MERTON_FFT')
+    params = [(S, K, T, r, s, 1.0, -0.2, 0.1) for K in strikes for s in (0.15, 0.2, 0.3)]
+    expected = [model.price('call', *p) for p in params]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        prices = list(pool.map(lambda p: model.price('call', *p), params))
+    assert np.array_equal(prices, expected)
@@ -0,0 +1,89 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from options import OptionBook, StreamingPricer
+from options.models import registry
+
+
+K = np.array([90., 100., 110., 95., 105.])
+book = OptionBook(
+    S=[100., 100., 100., 50., 50.], K=K, T=[0.5, 0.5, 1., 0.5, 0.5], r=0.05, sigma=0.2,
+    option_type=['call', 'put', 'call', 'call', 'put'], model=['BSM', 'BSM', 'BSM_FFT', 'MERTON', 'MERTON'],
+    underlying=['SPX', 'SPX', 'SPX', 'AAPL', 'AAPL'],
+    lamb=[np.nan] * 3 + [1.] * 2, mu=[np.nan] * 3 + [-0.2] * 2, delta=[np.nan] * 3 + [0.1] * 2)
+
+
+def expected(index, spot):
+    option_type, model = book['option_type'][book.index == index][0], book['model'][book.index == index][0]
+    jumps = (1., -0.2, 0.1) if model == 'MERTON' else ()
+    T = 1. if index == 2 else 0.5
+    return registry.get(model).price_and_greeks(option_type, spot, K[index], T, 0.05, 0.2, *jumps)
+
+
+def test_tick_reprices_only_its_underlying():
+    pricer = StreamingPricer(book)
+    update = pricer.update('SPX', 101.)
+    assert sorted(update.index) == [0, 1, 2]
+    for i, index in enumerate(update.index):
+        for name, value in expected(index, 101.).items():
+            assert update.values[name][i] == pytest.approx(value, abs=1e-6)
+        assert update.changes['price'][i] == pytest.approx(update.values['price'][i] - expected(index, 100.)['price'])  # noqa
+    assert pricer.update('SPX', 101.) is None
+
+
+def test_stream_yields_updates_over_min_change():
+    pricer = StreamingPricer(book, greeks=False, min_change=0.05)
+    ticks = [(1, 'SPX', 100.), (2, 'AAPL', 50.01), (3, 'SPX', 100.2)]
+    updates = list(pricer.stream(ticks))
+    assert [u.timestamp for u in updates] == [2, 3]
+    assert len(updates[0].index) == 0
+    assert set(updates[1].values) == {'price'}
+    assert np.all(np.abs(updates[1].changes['price']) > 0.05)
+
+
+def test_small_ticks_add_up_to_min_change():
+    pricer = StreamingPricer(book, greeks=False, min_change=0.05)
+    initial = pricer.values['price'][book.index == 0][0]
+    # every tick moves the 90 call by about 0.02, less than min_change
+    updates = list(pricer.stream([(t, 'SPX', 100. + 0.025 * t) for t in range(1, 7)]))
+    emitted = [u for u in updates if 0 in u.index]
+    assert 0 < len(emitted) < len(updates)
+    first = emitted[0]
+    i = list(first.index).index(0)
+    assert first.changes['price'][i] == pytest.approx(first.values['price'][i] - initial)
+    assert first.changes['price'][i] > 0.05
+
+    # consumer applying the changes stays within min_change of the current price
+    price = initial
+    for update in updates:
+        price += update.changes['price'][update.index == 0].sum()
+    assert abs(price - pricer.values['price'][book.index == 0][0]) <= 0.05
+
+
+def test_astream_conflates_ticks():
+    pricer = StreamingPricer(book)
+
+    async def ticks():
+        for i in range(100):
+            yield i, 'SPX', 100. + i / 100
+        yield 100, 'AAPL', 51.
+
+    async def collect():
+        return [update async for update in pricer.astream(ticks())]
+
+    updates = asyncio.run(collect())
+    assert pricer.conflated > 0
+    assert len(updates) < 101
+    assert updates[-1].underlying in ('SPX', 'AAPL')
+    assert pricer.spot == {'SPX': 100.99, 'AAPL': 51.}
+    assert pricer.values['price'][np.flatnonzero(book.index == 3)[0]] == pytest.approx(expected(3, 51.)['price'])
+
+
+def test_single_underlying_ticks():
+    pricer = StreamingPricer({'S': [100.] * 3, 'K': [90., 100., 110.], 'T': [0.5] * 3, 'r': [0.05] * 3, 'sigma': [0.2] * 3})
+    update = next(pricer.stream([(0, 99.)]))
+    assert update.underlying == '' and len(update.index) == 3
+    with pytest.raises(Exception):
+        StreamingPricer(book).update('MSFT', 10.)
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from options import PriceSurface
+from options.models import BSM, MERTON
+
+
+r, sigma = 0.05, 0.25
+jumps = (1., -0.2, 0.1)
+rng = np.random.default_rng(7)
+S = 100.
+K = S * np.exp(rng.uniform(-0.9, 0.9, 2000))
+T = rng.uniform(0.05, 4.9, 2000)
+
+
+@pytest.mark.parametrize('method', ['linear', 'cubic'])
+def test_prices_within_error_bound(method):
+    surface = PriceSurface('BSM', r, sigma, method=method)
+    # long maturity high strike, interpolation error along T dominates between the stencil columns
+    queries = np.append(K, 256.), np.append(T, 4.84)
+    prices, error = surface.price('call', S, *queries, return_error=True)
+    reference = BSM().price_batch('call', S, *queries, r, sigma)
+    assert np.all(np.abs(prices - reference) <= error + 1e-12)
+    assert np.max(error) < (1.2e-2 if method == 'linear' else 2e-4)
+
+
+def test_merton_fft_surface():
+    surface = PriceSurface('MERTON_FFT_ADAPTIVE', r, 0.2, *jumps)
+    prices, error = surface.price('put', S, K, T, return_error=True)
+    reference = MERTON(tol=1e-16).price_batch('put', S, K, T, r, 0.2, *jumps)
+    assert np.all(np.abs(prices - reference) <= error + 1e-12)
+
+
+def test_implied_vol():
+    surface = PriceSurface('BSM', r, sigma)
+    # deep out-of-the-money grid prices of short maturities underflow and have no implied volatility
+    inside = (np.abs(np.log(K / S)) < 0.5) & (T > 0.25)
+    iv, error = surface.implied_vol(S, K[inside], T[inside], return_error=True)
+    assert np.all(np.abs(iv - sigma) <= error + 1e-8)
+    assert iv.shape == (inside.sum(),)
+
+
+def test_grid_nodes_and_broadcasting():
+    surface = PriceSurface('BSM', r, sigma)
+    k, t = surface.log_moneyness[37], surface.maturities[11]
+    assert surface.price('call', 2., 2. * np.exp(k), t) == pytest.approx(
+        2. * BSM().price('call', 1., np.exp(k), t, r, sigma), abs=1e-12)
+    assert surface.price('call', [[90.], [100.]], [95., 100., 105.], 1.).shape == (2, 3)
+
+
+def test_query_outside_grid():
+    surface = PriceSurface('BSM', r, sigma)
+    with pytest.raises(ValueError):
+        surface.price('call', S, S * np.exp(1.5), 1.)
+    with pytest.raises(ValueError):
+        surface.price('call', S, S, 10.)
+
+
+def test_parameter_change_invalidates():
+    surface = PriceSurface('BSM', r, sigma).build()
+    surface.set_parameters(r, sigma)
+    assert surface.is_built
+    surface.set_parameters(r, 0.3)
+    assert not surface.is_built
+    assert surface.price('call', S, 105., 1.) == pytest.approx(BSM().price('call', S, 105., 1., r, 0.3), abs=1e-4)
+    assert surface.is_built
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+    surface = PriceSurface('MERTON', r, 0.2, *jumps, method='linear')
+    surface.save(str(tmp_path))
+    loaded = PriceSurface.load(str(tmp_path))
+    assert loaded.is_built and loaded.method == 'linear' and loaded.parameters == surface.parameters
+    assert isinstance(loaded._arrays['price'], np.memmap)
+    np.testing.assert_array_equal(loaded.price('call', S, K, T), surface.price('call', S, K, T))
+
+    loaded.set_parameters(r, 0.3, *jumps)
+    assert loaded.price('call', S, 105., 1.) == pytest.approx(
+        MERTON().price('call', S, 105., 1., r, 0.3, *jumps), abs=1e-2)
+    # file keeps the saved surface
+    assert PriceSurface.load(str(tmp_path)).parameters == surface.parameters
+
+
+def test_wrong_arguments():
+    with pytest.raises(ValueError):
+        PriceSurface('BSM', r, sigma, method='spline')
+    with pytest.raises(ValueError):
+        PriceSurface('BSM', r, sigma, maturities=[1., 0.5, 2., 3., 4.])
+    with pytest.raises(Exception):
+        PriceSurface('NOT_A_MODEL', r, sigma)